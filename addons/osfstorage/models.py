@@ -1,5 +1,6 @@
 import logging
 
+import waffle
 from django.apps import apps
 from django.db import models, connection
 from django.contrib.contenttypes.models import ContentType
@@ -13,6 +14,7 @@ from framework.auth.core import Auth
 from osf.models.mixins import Loggable
 from osf.models import AbstractNode
 from osf.models.files import File, FileVersion, Folder, TrashedFileNode, BaseFileNode, BaseFileNodeManager
+from osf import features
 from osf.utils import permissions
 from website.files import exceptions
 from website.files import utils as files_utils
@@ -26,6 +28,28 @@ settings = apps.get_app_config('addons_osfstorage')
 logger = logging.getLogger(__name__)
 
 
+UPDATE_DESCENDANT_MATERIALIZED_PATHS = """
+    WITH RECURSIVE descendants_cte(id, gen_path) AS (
+      SELECT
+        T.id,
+        %(path)s || T.name || CASE WHEN T.type = %(folder_type)s THEN '/' ELSE '' END
+      FROM %(table)s AS T
+      WHERE T.parent_id = %(parent_id)s AND T.type IN %(types)s
+      UNION ALL
+      SELECT
+        T.id,
+        R.gen_path || T.name || CASE WHEN T.type = %(folder_type)s THEN '/' ELSE '' END
+      FROM descendants_cte AS R
+        JOIN %(table)s AS T ON T.parent_id = R.id
+      WHERE T.type IN %(types)s
+    )
+    UPDATE %(table)s AS B
+    SET _materialized_path = D.gen_path
+    FROM descendants_cte AS D
+    WHERE B.id = D.id;
+"""
+
+
 class OsfStorageFolderManager(BaseFileNodeManager):
 
     def get_root(self, target):
@@ -39,6 +63,14 @@ class OsfStorageFileNode(BaseFileNode):
 
     @property
     def materialized_path(self):
+        """Stored in `_materialized_path` and maintained by `save`; rows not saved since (see
+        the backfill_osfstorage_materialized_paths command) fall back to walking up the folders.
+        """
+        if self._materialized_path:
+            return self._materialized_path
+        return self._compute_materialized_path()
+
+    def _compute_materialized_path(self):
         sql = """
             WITH RECURSIVE materialized_path_cte(parent_id, GEN_PATH) AS (
               SELECT
@@ -140,7 +172,7 @@ class OsfStorageFileNode(BaseFileNode):
     # overrides BaseFileNode
     @property
     def current_version_number(self):
-        return self.versions.count() or 1
+        return self.get_version_count() or 1
 
     def _check_delete_allowed(self):
         if self.is_preprint_primary:
@@ -220,10 +252,32 @@ class OsfStorageFileNode(BaseFileNode):
             if save:
                 self.save()
 
+    def _build_materialized_path(self):
+        suffix = self.name + ('' if self.is_file else '/')
+        if self.parent_id is None:
+            return suffix
+        return self.parent.materialized_path + suffix
+
+    def _update_descendant_materialized_paths(self):
+        with connection.cursor() as cursor:
+            cursor.execute(UPDATE_DESCENDANT_MATERIALIZED_PATHS, {
+                'table': AsIs(self._meta.db_table),
+                'parent_id': self.pk,
+                'path': self._materialized_path,
+                'folder_type': OsfStorageFolder._typedmodels_type,
+                'types': (OsfStorageFile._typedmodels_type, OsfStorageFolder._typedmodels_type),
+            })
+
     def save(self):
         self._path = ''
-        self._materialized_path = ''
-        return super().save()
+        is_new = self.pk is None
+        old_materialized_path = self._materialized_path
+        self._materialized_path = self._build_materialized_path()
+        ret = super().save()
+        # A moved or renamed folder moves everything below it
+        if not (is_new or self.is_file or self.parent_id is None) and self._materialized_path != old_materialized_path:
+            self._update_descendant_materialized_paths()
+        return ret
 
 
 class OsfStorageFile(OsfStorageFileNode, File):
@@ -310,13 +364,12 @@ class OsfStorageFile(OsfStorageFileNode, File):
             ret['fullPath'] = self.materialized_path
 
         version = self.get_version(version)
-        earliest_version = self.versions.order_by('created').first()
         ret.update({
-            'version': self.versions.count(),
+            'version': self.get_version_count(),
             'md5': version.metadata.get('md5') if version else None,
             'sha256': version.metadata.get('sha256') if version else None,
             'modified': version.created.isoformat() if version else None,
-            'created': earliest_version.created.isoformat() if version else None,
+            'created': self.get_first_version_created().isoformat() if version else None,
         })
         return ret
 
@@ -350,9 +403,7 @@ class OsfStorageFile(OsfStorageFileNode, File):
 
     def get_version(self, version=None, required=False):
         if version is None:
-            if self.versions.exists():
-                return self.versions.first()
-            return None
+            return self.get_latest_version()
 
         try:
             return self.versions.get(identifier=version)
@@ -443,8 +494,19 @@ class OsfStorageFolder(OsfStorageFileNode, Folder):
 
     objects = OsfStorageFolderManager()
 
+    def subtree(self):
+        """This folder and every active file and folder below it, by stored materialized path."""
+        return BaseFileNode.active.filter(
+            target_content_type_id=self.target_content_type_id,
+            target_object_id=self.target_object_id,
+            provider=self._provider,
+            _materialized_path__startswith=self.materialized_path,
+        )
+
     @property
     def is_checked_out(self):
+        if waffle.switch_is_active(features.OSFSTORAGE_STORED_MATERIALIZED_PATHS):
+            return self.subtree().filter(checkout__isnull=False).exists()
         sql = """
             WITH RECURSIVE is_checked_out_cte(id, parent_id, checkout_id) AS (
               SELECT
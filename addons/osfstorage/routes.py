@@ -82,6 +82,15 @@ api_routes = {
             json_renderer,
         ),
 
+        Rule(
+            [
+                '/<guid>/osfstorage/<fid>/children/page/',
+            ],
+            'get',
+            views.osfstorage_get_children_page,
+            json_renderer,
+        ),
+
         Rule(
             [
                 '/<guid>/osfstorage/hooks/metadata/',
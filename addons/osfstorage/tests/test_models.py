@@ -6,6 +6,9 @@ import pytz
 from django.utils import timezone
 from importlib import import_module
 from django.conf import settings as django_conf_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from waffle.testutils import override_switch
 
 from framework.auth import Auth
 from addons.osfstorage.models import OsfStorageFile, OsfStorageFileNode, OsfStorageFolder
@@ -21,7 +24,7 @@ from addons.osfstorage.listeners import delete_files_task
 
 import datetime
 
-from osf import models
+from osf import features, models
 from addons.osfstorage import utils
 from addons.osfstorage import settings
 from website.files.exceptions import FileNodeCheckedOutError, FileNodeIsPrimaryFile
@@ -302,6 +305,90 @@ class TestOsfstorageFileNode(StorageTestCase):
         child = self.node_settings.get_root().append_folder('Cloud').append_file('Carp')
         assert '/Cloud/Carp' == child.materialized_path
 
+    def test_materialized_path_stored(self):
+        child = self.node_settings.get_root().append_folder('Cloud').append_file('Carp')
+        assert OsfStorageFile.objects.get(id=child.id)._materialized_path == '/Cloud/Carp'
+        assert child._materialized_path == child._compute_materialized_path()
+
+    def test_materialized_path_moved_folder(self):
+        root = self.node_settings.get_root()
+        to_move = root.append_folder('Carp')
+        child_folder = to_move.append_folder('A dee')
+        child = child_folder.append_file('um')
+        move_to = root.append_folder('Cloud')
+
+        to_move.move_under(move_to, name='Koi')
+        child_folder.reload()
+        child.reload()
+
+        assert to_move.materialized_path == '/Cloud/Koi/'
+        assert child_folder.materialized_path == '/Cloud/Koi/A dee/'
+        assert child.materialized_path == '/Cloud/Koi/A dee/um'
+        assert child.materialized_path == child._compute_materialized_path()
+
+    def test_materialized_path_backfill(self):
+        from osf.management.commands.backfill_osfstorage_materialized_paths import backfill_osfstorage_materialized_paths
+        folder = self.node_settings.get_root().append_folder('Cloud')
+        child = folder.append_file('Carp')
+        BaseFileNode.objects.filter(id__in=[folder.id, child.id]).update(_materialized_path='')
+        child = OsfStorageFile.objects.get(id=child.id)
+        assert child.materialized_path == '/Cloud/Carp'  # computed
+
+        backfill_osfstorage_materialized_paths()
+        child.reload()
+        assert child._materialized_path == '/Cloud/Carp'
+        assert OsfStorageFolder.objects.get(id=folder.id)._materialized_path == '/Cloud/'
+
+    def _create_versions(self, file, count):
+        return [
+            file.create_version(self.user, {
+                'service': 'cloud',
+                settings.WATERBUTLER_RESOURCE: 'osf',
+                'object': f'0{i}d80e',
+            })
+            for i in range(count)
+        ]
+
+    def test_version_fields_recorded(self):
+        child = self.node_settings.get_root().append_file('Carp')
+        assert child.get_version_count() == 0
+        assert child.get_latest_version() is None
+        first, second = self._create_versions(child, 2)
+
+        stored = OsfStorageFile.objects.get(id=child.id)
+        assert stored.version_count == child.version_count == 2
+        assert stored.latest_version == child.latest_version == second
+        assert stored.first_version_created == child.first_version_created == first.created
+        with CaptureQueriesContext(connection) as queries:
+            assert child.get_version() == second
+            assert child.current_version_number == 2
+        assert not queries.captured_queries
+
+    def test_version_fields_copied(self):
+        to_copy = self.node_settings.get_root().append_file('Carp')
+        self._create_versions(to_copy, 2)
+        copied = to_copy.copy_under(self.node_settings.get_root().append_folder('Cloud'))
+        copied = OsfStorageFile.objects.get(id=copied.id)
+        assert copied.version_count == 2
+        assert copied.latest_version == to_copy.latest_version
+        assert copied.first_version_created == to_copy.first_version_created
+
+    def test_version_fields_backfill(self):
+        from osf.management.commands.backfill_file_version_fields import backfill_file_version_fields
+        child = self.node_settings.get_root().append_file('Carp')
+        first, second = self._create_versions(child, 2)
+        BaseFileNode.objects.filter(id=child.id).update(version_count=None, latest_version=None, first_version_created=None)
+        child = OsfStorageFile.objects.get(id=child.id)
+        assert child.get_version() == second  # from the versions
+        assert child.get_version_count() == 2
+
+        assert backfill_file_version_fields() == 1
+        child.reload()
+        assert child.version_count == 2
+        assert child.latest_version == second
+        assert child.first_version_created == first.created
+        assert backfill_file_version_fields() == 0
+
     def test_copy(self):
         to_copy = self.node_settings.get_root().append_file('Carp')
         copy_to = self.node_settings.get_root().append_folder('Cloud')
@@ -911,6 +998,16 @@ class TestOsfStorageCheckout(StorageTestCase):
         with pytest.raises(FileNodeCheckedOutError):
             folder.delete()
 
+    def test_delete_folder_with_checked_out_file_stored_paths(self):
+        folder = self.root_node.append_folder('folder')
+        self.file.move_under(folder.append_folder('subfolder'))
+        self.file.check_in_or_out(self.user, self.user, save=True)
+        with override_switch(features.OSFSTORAGE_STORED_MATERIALIZED_PATHS, active=True):
+            assert folder.is_checked_out
+            assert not self.root_node.append_folder('other').is_checked_out
+            with pytest.raises(FileNodeCheckedOutError):
+                folder.delete()
+
     def test_move_checked_out_file(self):
         self.file.check_in_or_out(self.user, self.user, save=True)
         self.file.reload()
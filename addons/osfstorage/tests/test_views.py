@@ -177,6 +177,44 @@ class TestGetMetadataHook(HookTestCase):
         assert res_date_modified == expected_date_modified
         assert res_date_created == expected_date_created
 
+    def test_children_page(self):
+        root = self.node_settings.get_root()
+        folder = root.append_folder('b')
+        record = create_record_with_version('c', self.node_settings)
+        root.append_file('a')
+        res = self.send_hook(
+            'osfstorage_get_children',
+            {'fid': root._id, 'user_id': self.user._id},
+            {},
+            self.node
+        )
+        all_children = sorted(res.json, key=lambda child: child['name'])
+
+        pages = []
+        view_kwargs = {'fid': root._id, 'user_id': self.user._id, 'page_size': 2}
+        while True:
+            res = self.send_hook('osfstorage_get_children_page', dict(view_kwargs), {}, self.node)
+            pages.append(res.json['data'])
+            if not res.json['next']:
+                break
+            view_kwargs['cursor'] = res.json['next']
+
+        assert [len(page) for page in pages] == [2, 1]
+        assert [child['name'] for page in pages for child in page] == ['a', 'b', 'c']
+        assert [child for page in pages for child in page] == all_children
+        assert pages[0][1] == {'id': folder._id, 'path': f'/{folder._id}/', 'name': 'b', 'kind': 'folder'}
+        assert pages[1][0]['id'] == record._id
+
+    def test_children_page_bad_cursor(self):
+        res = self.send_hook(
+            'osfstorage_get_children_page',
+            {'fid': self.node_settings.get_root()._id, 'user_id': self.user._id, 'cursor': 'nope'},
+            {},
+            self.node,
+            expect_errors=True,
+        )
+        assert res.status_code == 400
+
     def test_osf_storage_root(self):
         auth = Auth(self.project.creator)
         result = osf_storage_root(self.node_settings.config, self.node_settings, auth)
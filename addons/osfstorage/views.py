@@ -1,4 +1,6 @@
 from rest_framework import status as http_status
+import base64
+import json
 import logging
 
 from django.core.exceptions import ValidationError
@@ -123,7 +125,7 @@ def osfstorage_get_revisions(file_node, payload, target, **kwargs):
 
     counter_prefix = f'download:{file_node.target._id}:{file_node._id}:'
 
-    version_count = file_node.versions.count()
+    version_count = file_node.get_version_count()
     counts = dict(PageCounter.objects.filter(resource=file_node.target.guids.first().id, file=file_node, action='download').values_list('_id', 'total'))
     qs = FileVersion.objects.filter(basefilenode__id=file_node.id).prefetch_related('creator__guids').order_by('-created')
 
@@ -183,117 +185,186 @@ def osfstorage_get_metadata(file_node, **kwargs):
     return file_node.serialize(version=version, include_full=True)
 
 
-@must_be_signed
-@decorators.autoload_filenode(must_be='folder')
-def osfstorage_get_children(file_node, **kwargs):
+# Read the documentation on FileVersion's fields before reading this SQL
+CHILD_JSON_SQL = """
+    CASE
+    WHEN F.type = 'osf.osfstoragefile' THEN
+        json_build_object(
+            'id', F._id
+            , 'path', '/' || F._id
+            , 'name', F.name
+            , 'kind', 'file'
+            , 'size', LATEST_VERSION.size
+            , 'downloads',  COALESCE(DOWNLOAD_COUNT, 0)
+            , 'version', COALESCE(F.version_count, (SELECT COUNT(*) FROM osf_basefileversionsthrough WHERE osf_basefileversionsthrough.basefilenode_id = F.id))
+            , 'contentType', LATEST_VERSION.content_type
+            , 'modified', LATEST_VERSION.created
+            , 'created', COALESCE(F.first_version_created, EARLIEST_VERSION.created)
+            , 'checkout', CHECKOUT_GUID
+            , 'md5', LATEST_VERSION.metadata ->> 'md5'
+            , 'sha256', LATEST_VERSION.metadata ->> 'sha256'
+            , 'latestVersionSeen', SEEN_LATEST_VERSION.case
+        )
+    ELSE
+        json_build_object(
+            'id', F._id
+            , 'path', '/' || F._id || '/'
+            , 'name', F.name
+            , 'kind', 'folder'
+        )
+    END
+"""
+
+CHILDREN_FROM_SQL = """
+    FROM osf_basefilenode AS F
+    LEFT JOIN LATERAL (
+        -- Stored on the file, except for files whose version fields have not been recorded yet
+        SELECT osf_fileversion.* FROM osf_fileversion
+        WHERE osf_fileversion.id = F.latest_version_id
+        UNION ALL
+        (
+          SELECT osf_fileversion.* FROM osf_fileversion
+          JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
+          WHERE F.latest_version_id IS NULL
+          AND osf_basefileversionsthrough.basefilenode_id = F.id
+          ORDER BY created DESC
+          LIMIT 1
+        )
+    ) LATEST_VERSION ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT osf_fileversion.created FROM osf_fileversion
+        JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
+        WHERE F.first_version_created IS NULL
+        AND osf_basefileversionsthrough.basefilenode_id = F.id
+        ORDER BY created ASC
+        LIMIT 1
+    ) EARLIEST_VERSION ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT _id from osf_guid
+        WHERE object_id = F.checkout_id
+        AND content_type_id = %s
+        LIMIT 1
+    ) CHECKOUT_GUID ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT P.total AS DOWNLOAD_COUNT FROM osf_pagecounter AS P
+        WHERE P.resource_id = %s
+        AND P.file_id = F.id
+        AND P.action = 'download'
+        AND P.version ISNULL
+        LIMIT 1
+    ) DOWNLOAD_COUNT ON TRUE
+    LEFT JOIN LATERAL (
+      SELECT EXISTS(
+        SELECT (1) FROM osf_fileversionusermetadata
+          INNER JOIN osf_fileversion ON osf_fileversionusermetadata.file_version_id = osf_fileversion.id
+          INNER JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
+          WHERE osf_fileversionusermetadata.user_id = %s
+          AND osf_basefileversionsthrough.basefilenode_id = F.id
+        LIMIT 1
+      )
+    ) SEEN_FILE ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT CASE WHEN SEEN_FILE.exists
+        THEN
+            CASE WHEN EXISTS(
+              SELECT (1) FROM osf_fileversionusermetadata
+              WHERE osf_fileversionusermetadata.file_version_id = LATEST_VERSION.id
+              AND osf_fileversionusermetadata.user_id = %s
+              LIMIT 1
+            )
+            THEN
+              json_build_object('user', %s, 'seen', TRUE)
+            ELSE
+              json_build_object('user', %s, 'seen', FALSE)
+            END
+        ELSE
+          NULL
+        END
+    ) SEEN_LATEST_VERSION ON TRUE
+    WHERE parent_id = %s
+    AND (NOT F.type IN ('osf.trashedfilenode', 'osf.trashedfile', 'osf.trashedfolder'))
+"""
+
+CHILDREN_PAGE_SIZE = 1000
+MAX_CHILDREN_PAGE_SIZE = 10000
+
+
+def _get_children_params(file_node, user_id):
     from django.contrib.contenttypes.models import ContentType
     from osf.models.preprint import Preprint
-    user_id = request.args.get('user_id')
     user_content_type_id = ContentType.objects.get_for_model(OSFUser).id
     user_pk = OSFUser.objects.filter(guids___id=user_id, guids___id__isnull=False).values_list('pk', flat=True).first()
-    guid_id = file_node.target.get_guid().id if isinstance(file_node.target, Preprint) else file_node.target.guids.first().id,
+    guid_id = file_node.target.get_guid().id if isinstance(file_node.target, Preprint) else file_node.target.guids.first().id
+    return [
+        user_content_type_id,
+        guid_id,
+        user_pk,
+        user_pk,
+        user_id,
+        user_id,
+        file_node.id
+    ]
 
+
+def _encode_children_cursor(name, node_id):
+    return base64.urlsafe_b64encode(json.dumps([name, node_id]).encode()).decode()
+
+
+def _decode_children_cursor(cursor):
+    try:
+        name, node_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        assert isinstance(name, str) and isinstance(node_id, int)
+    except Exception:
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid cursor.'})
+    return name, node_id
+
+
+@must_be_signed
+@decorators.autoload_filenode(must_be='folder')
+def osfstorage_get_children(file_node, **kwargs):
+    params = _get_children_params(file_node, request.args.get('user_id'))
     with connection.cursor() as cursor:
-        # Read the documentation on FileVersion's fields before reading this code
-        cursor.execute("""
-            SELECT json_agg(CASE
-                WHEN F.type = 'osf.osfstoragefile' THEN
-                    json_build_object(
-                        'id', F._id
-                        , 'path', '/' || F._id
-                        , 'name', F.name
-                        , 'kind', 'file'
-                        , 'size', LATEST_VERSION.size
-                        , 'downloads',  COALESCE(DOWNLOAD_COUNT, 0)
-                        , 'version', (SELECT COUNT(*) FROM osf_basefileversionsthrough WHERE osf_basefileversionsthrough.basefilenode_id = F.id)
-                        , 'contentType', LATEST_VERSION.content_type
-                        , 'modified', LATEST_VERSION.created
-                        , 'created', EARLIEST_VERSION.created
-                        , 'checkout', CHECKOUT_GUID
-                        , 'md5', LATEST_VERSION.metadata ->> 'md5'
-                        , 'sha256', LATEST_VERSION.metadata ->> 'sha256'
-                        , 'latestVersionSeen', SEEN_LATEST_VERSION.case
-                    )
-                ELSE
-                    json_build_object(
-                        'id', F._id
-                        , 'path', '/' || F._id || '/'
-                        , 'name', F.name
-                        , 'kind', 'folder'
-                    )
-                END
-            )
-            FROM osf_basefilenode AS F
-            LEFT JOIN LATERAL (
-                SELECT * FROM osf_fileversion
-                JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
-                WHERE osf_basefileversionsthrough.basefilenode_id = F.id
-                ORDER BY created DESC
-                LIMIT 1
-            ) LATEST_VERSION ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT * FROM osf_fileversion
-                JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
-                WHERE osf_basefileversionsthrough.basefilenode_id = F.id
-                ORDER BY created ASC
-                LIMIT 1
-            ) EARLIEST_VERSION ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT _id from osf_guid
-                WHERE object_id = F.checkout_id
-                AND content_type_id = %s
-                LIMIT 1
-            ) CHECKOUT_GUID ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT P.total AS DOWNLOAD_COUNT FROM osf_pagecounter AS P
-                WHERE P.resource_id = %s
-                AND P.file_id = F.id
-                AND P.action = 'download'
-                AND P.version ISNULL
-                LIMIT 1
-            ) DOWNLOAD_COUNT ON TRUE
-            LEFT JOIN LATERAL (
-              SELECT EXISTS(
-                SELECT (1) FROM osf_fileversionusermetadata
-                  INNER JOIN osf_fileversion ON osf_fileversionusermetadata.file_version_id = osf_fileversion.id
-                  INNER JOIN osf_basefileversionsthrough ON osf_fileversion.id = osf_basefileversionsthrough.fileversion_id
-                  WHERE osf_fileversionusermetadata.user_id = %s
-                  AND osf_basefileversionsthrough.basefilenode_id = F.id
-                LIMIT 1
-              )
-            ) SEEN_FILE ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT CASE WHEN SEEN_FILE.exists
-                THEN
-                    CASE WHEN EXISTS(
-                      SELECT (1) FROM osf_fileversionusermetadata
-                      WHERE osf_fileversionusermetadata.file_version_id = LATEST_VERSION.fileversion_id
-                      AND osf_fileversionusermetadata.user_id = %s
-                      LIMIT 1
-                    )
-                    THEN
-                      json_build_object('user', %s, 'seen', TRUE)
-                    ELSE
-                      json_build_object('user', %s, 'seen', FALSE)
-                    END
-                ELSE
-                  NULL
-                END
-            ) SEEN_LATEST_VERSION ON TRUE
-            WHERE parent_id = %s
-            AND (NOT F.type IN ('osf.trashedfilenode', 'osf.trashedfile', 'osf.trashedfolder'))
-        """, [
-            user_content_type_id,
-            guid_id,
-            user_pk,
-            user_pk,
-            user_id,
-            user_id,
-            file_node.id
-        ])
+        cursor.execute(f'SELECT json_agg({CHILD_JSON_SQL}) {CHILDREN_FROM_SQL}', params)
         return cursor.fetchone()[0] or []
 
 
+@must_be_signed
+@decorators.autoload_filenode(must_be='folder')
+def osfstorage_get_children_page(file_node, **kwargs):
+    """One page of a folder's children, ordered by (name, id).
+
+    Pass the returned `next` back as `cursor` for the following page; it is null after the
+    last page. Each page is a bounded keyset scan, so folders of any size can be listed
+    without building (or holding) one response for every child.
+    """
+    try:
+        page_size = min(int(request.args.get('page_size', CHILDREN_PAGE_SIZE)), MAX_CHILDREN_PAGE_SIZE)
+    except ValueError:
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid page_size.'})
+    if page_size < 1:
+        raise HTTPError(http_status.HTTP_400_BAD_REQUEST, data={'message_long': 'Invalid page_size.'})
+    params = _get_children_params(file_node, request.args.get('user_id'))
+    sql = f'SELECT {CHILD_JSON_SQL}, F.name, F.id {CHILDREN_FROM_SQL}'
+    cursor_arg = request.args.get('cursor')
+    if cursor_arg:
+        sql += ' AND (F.name, F.id) > (%s, %s)'
+        params.extend(_decode_children_cursor(cursor_arg))
+    sql += ' ORDER BY F.name, F.id LIMIT %s'
+    # Fetch one extra row to tell whether there is a next page
+    params.append(page_size + 1)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_children_cursor(rows[-1][1], rows[-1][2])
+    return {
+        'data': [row[0] for row in rows],
+        'next': next_cursor,
+    }
+
+
 @must_be_signed
 @decorators.autoload_filenode(must_be='folder')
 def osfstorage_create_child(file_node, payload, **kwargs):
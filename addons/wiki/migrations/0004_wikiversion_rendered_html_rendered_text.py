@@ -0,0 +1,23 @@
+# Generated by Django 4.2.15 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('addons_wiki', '0003_alter_nodesettings_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wikiversion',
+            name='rendered_html',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wikiversion',
+            name='rendered_text',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
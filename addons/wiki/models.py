@@ -121,6 +121,9 @@ class WikiVersion(ObjectIDMixin, BaseModel):
     wiki_page = models.ForeignKey('WikiPage', null=True, blank=True, on_delete=models.CASCADE, related_name='versions')
     content = models.TextField(default='', blank=True)
     identifier = models.IntegerField(default=1)
+    # Renders of `content` stored on save (versions don't change once saved); the html is as rendered for `wiki_page.node`
+    rendered_html = models.TextField(null=True, blank=True)
+    rendered_text = models.TextField(null=True, blank=True)
 
     @property
     def is_current(self):
@@ -128,6 +131,11 @@ class WikiVersion(ObjectIDMixin, BaseModel):
 
     def html(self, node):
         """The cleaned HTML of the page"""
+        if self.rendered_html is not None and node.id == self.wiki_page.node_id:
+            return self.rendered_html
+        return self.render_html(node)
+
+    def render_html(self, node):
         html_output = build_html_output(self.content, node=node)
         try:
             return sanitize_html(
@@ -143,9 +151,19 @@ class WikiVersion(ObjectIDMixin, BaseModel):
 
     def raw_text(self, node):
         """ The raw text of the page, suitable for using in a test search"""
+        if self.rendered_text is not None:
+            return self.rendered_text
+        return self.render_text()
 
+    def render_text(self):
         return sanitize(self.content, tags=[], strip=True)
 
+    def store_renders(self):
+        """Render the page's html and text onto the version, to be served until it is re-rendered"""
+        node = self.wiki_page.node
+        self.rendered_html = self.render_html(node) if node else None
+        self.rendered_text = self.render_text()
+
     @property
     def rendered_before_update(self):
         return self.created < WIKI_CHANGE_DATE
@@ -172,6 +190,9 @@ class WikiVersion(ObjectIDMixin, BaseModel):
         return self.content
 
     def save(self, *args, **kwargs):
+        if self.pk is None or self.rendered_text is None:
+            # Clones are rendered again, for their own node
+            self.store_renders()
         rv = super().save(*args, **kwargs)
         if self.wiki_page.node:
             self.wiki_page.node.update_search()
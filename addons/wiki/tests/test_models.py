@@ -1,10 +1,13 @@
 import pytest
 import pytz
 import datetime
+from unittest import mock
+
 from addons.wiki.exceptions import NameMaximumLengthError
 
 from addons.wiki.models import WikiPage, WikiVersion
 from addons.wiki.tests.factories import WikiFactory, WikiVersionFactory
+from osf.management.commands.backfill_wiki_rendered_content import backfill_wiki_rendered_content
 from osf_tests.factories import NodeFactory, UserFactory, ProjectFactory
 from tests.base import OsfTestCase, fake
 
@@ -48,6 +51,57 @@ class TestWikiPageModel:
         page.save()
         assert ver1.is_current is False
 
+    def test_renders_stored_on_save(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        version = page.update(user=user, content='hello [[bar]]')
+        version = WikiVersion.objects.get(id=version.id)
+        assert f'/{node._id}/wiki/bar/' in version.rendered_html
+        assert version.rendered_text == 'hello [[bar]]'
+        with mock.patch('addons.wiki.models.build_html_output') as mock_build:
+            assert version.html(node) == version.rendered_html
+            assert version.raw_text(node) == version.rendered_text
+        assert not mock_build.called
+
+        other_node = NodeFactory()
+        assert f'/{other_node._id}/wiki/bar/' in version.html(other_node)
+
+    def test_cloned_version_rendered_for_its_node(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        version = page.update(user=user, content='[[bar]]')
+        fork = NodeFactory()
+        fork_page = WikiPage(page_name='foo', node=fork)
+        fork_page.save()
+        clone = version.clone_version(fork_page, user)
+        clone = WikiVersion.objects.get(id=clone.id)
+        assert f'/{fork._id}/wiki/bar/' in clone.rendered_html
+        assert f'/{node._id}/wiki/bar/' not in clone.rendered_html
+
+    def test_backfill_rendered_content(self):
+        user = UserFactory()
+        node = NodeFactory()
+        page = WikiPage(page_name='foo', node=node)
+        page.save()
+        version = page.update(user=user, content='<b>hello</b> [[bar]]')
+        expected_html = WikiVersion.objects.get(id=version.id).rendered_html
+        WikiVersion.objects.filter(id=version.id).update(rendered_html=None, rendered_text=None)
+
+        backfill_wiki_rendered_content(dry_run=True)
+        version = WikiVersion.objects.get(id=version.id)
+        assert version.rendered_html is None
+        assert version.html(node) == expected_html
+
+        assert backfill_wiki_rendered_content() == 1
+        version = WikiVersion.objects.get(id=version.id)
+        assert version.rendered_html == expected_html
+        assert version.rendered_text == 'hello [[bar]]'
+        assert backfill_wiki_rendered_content() == 0
+
 
 class TestWikiPage(OsfTestCase):
 
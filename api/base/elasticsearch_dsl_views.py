@@ -1,6 +1,7 @@
 from __future__ import annotations
 import abc
 import datetime
+import itertools
 import typing
 
 import elasticsearch_dsl as edsl
@@ -18,6 +19,7 @@ from api.metrics.renderers import (
     MetricsReportsTsvRenderer,
     MetricsReportsJsonRenderer,
 )
+from api.metrics.utils import iter_search_pages
 from api.base.pagination import ElasticsearchQuerySizeMaximumPagination, JSONAPIPagination
 from api.base.renderers import JSONAPIRenderer
 
@@ -80,6 +82,35 @@ class ElasticsearchListView(FilterMixin, JSONAPIBaseView, generics.ListAPIView,
 
         return response
 
+    STREAMING_RENDERER_CLASSES = {
+        MetricsReportsCsvRenderer,
+        MetricsReportsTsvRenderer,
+    }
+
+    # override rest_framework.mixins.ListModelMixin
+    def list(self, request, *args, **kwargs):
+        """Stream csv and tsv downloads a page of results at a time, however many there are
+
+        (up to `page[size]` results, if given -- a request for a specific `page` is paginated as usual)
+        """
+        if (
+            isinstance(request.accepted_renderer, tuple(self.STREAMING_RENDERER_CLASSES))
+            and JSONAPIPagination.page_query_param not in request.query_params
+        ):
+            _search = self.get_queryset()
+            if not isinstance(_search, list):  # (an empty list when there's nothing to search)
+                _streaming_response = request.accepted_renderer.stream(itertools.islice(
+                    (
+                        _serialized['attributes']
+                        for _page in iter_search_pages(_search)
+                        for _serialized in self.get_serializer(_page, many=True).data
+                    ),
+                    self.__get_stream_limit(request),
+                ))
+                if _streaming_response is not None:
+                    return _streaming_response
+        return super().list(request, *args, **kwargs)
+
     ###
     # beware! inheritance shenanigans below
 
@@ -131,6 +162,13 @@ class ElasticsearchListView(FilterMixin, JSONAPIBaseView, generics.ListAPIView,
     ###
     # private methods
 
+    def __get_stream_limit(self, request) -> int | None:
+        try:
+            _limit = int(request.query_params[JSONAPIPagination.page_size_query_param])
+        except (KeyError, ValueError):
+            return None
+        return _limit if _limit > 0 else None
+
     def __add_sort(self, search: edsl.Search) -> edsl.Search:
         _elastic_sort = self.__get_elastic_sort()
         return (search if _elastic_sort is None else search.sort(_elastic_sort))
@@ -21,6 +21,10 @@ from framework.celery_tasks.handlers import (
     celery_after_request,
     celery_teardown_request,
 )
+from osf.utils.guid_cache import (
+    guid_cache_before_request,
+    guid_cache_teardown_request,
+)
 from .api_globals import api_globals
 from api.base import settings as api_settings
 from api.base.authentication.drf import drf_get_session_from_cookie
@@ -85,6 +89,23 @@ class PostcommitTaskMiddleware(MiddlewareMixin):
         return response
 
 
+class GuidCacheMiddleware(MiddlewareMixin):
+    """
+    Give each request its own identity map of loaded guids.
+    """
+
+    def process_request(self, request):
+        guid_cache_before_request()
+
+    def process_exception(self, request, exception):
+        guid_cache_teardown_request()
+        return None
+
+    def process_response(self, request, response):
+        guid_cache_teardown_request()
+        return response
+
+
 # Adapted from http://www.djangosnippets.org/snippets/186/
 # Original author: udfalkso
 # Modified by: Shwagroo Team and Gun.io
@@ -1,14 +1,20 @@
+import base64
+import datetime
+import json
 from collections import OrderedDict
 from django.urls import reverse
 from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
-from django.db.models import QuerySet
+from django.db import connection
+from django.db.models import Q, QuerySet
 
 from rest_framework import pagination
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.utils.urls import (
     replace_query_param, remove_query_param,
 )
+from api.base.exceptions import InvalidQueryStringError
 from api.base.serializers import is_anonymized
 from api.base.settings import MAX_PAGE_SIZE, MAX_SIZE_OF_ES_QUERY
 from api.base.utils import absolute_reverse
@@ -23,10 +29,16 @@ class JSONAPIPagination(pagination.PageNumberPagination):
 
     Properly handles pagination of embedded objects.
 
+    Views that define `cursor_ordering`, a tuple of model fields ending in a unique field
+    (e.g. ('-modified', '-id')), may also be paginated by keyset with `page[cursor]=`.
+    Cursor pages skip the COUNT(*) and OFFSET scan of page-number pagination.
+
     """
 
     page_size_query_param = 'page[size]'
     max_page_size = MAX_PAGE_SIZE
+    cursor_query_param = 'page[cursor]'
+    cursor = None
 
     def page_number_query(self, url, page_number):
         """
@@ -67,7 +79,150 @@ class JSONAPIPagination(pagination.PageNumberPagination):
         page_number = self.page.next_page_number()
         return self.page_number_query(url, page_number)
 
+    def cursor_query(self, url, cursor):
+        """
+        Builds uri and adds cursor param, dropping any page number.
+        """
+        url = remove_query_param(self.request.build_absolute_uri(url), '_')
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, position, reverse=False):
+        values = [
+            value.isoformat() if isinstance(value, datetime.datetime) else value
+            for value in position
+        ]
+        payload = json.dumps({'p': values, 'r': reverse}).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor, model, ordering):
+        """
+        Returns the (position, reverse) encoded by `cursor`. An empty cursor starts at the first page.
+        """
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = payload['p']
+            assert len(values) == len(ordering)
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+        except Exception:
+            raise InvalidQueryStringError(detail='Invalid page cursor.', parameter=self.cursor_query_param)
+        return position, bool(payload.get('r'))
+
+    def get_keyset_filter(self, ordering, position):
+        """
+        Returns a Q selecting rows strictly after `position` in `ordering`, i.e. for ('-modified', '-id'):
+        modified < m OR (modified = m AND id < i)
+        """
+        query = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{name}__{lookup}': position[index]})
+            for prior_field, prior_value in zip(ordering[:index], position[:index]):
+                clause &= Q(**{prior_field.lstrip('-'): prior_value})
+            query |= clause
+        return query
+
+    def get_estimated_count(self, queryset):
+        """
+        Returns the planner's row estimate for an unfiltered queryset, or None. Counting a filtered
+        queryset exactly would reintroduce the scan cursor pagination exists to avoid.
+        """
+        if queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if not row or row[0] < 0:
+            return None
+        return row[0]
+
+    def paginate_queryset_by_cursor(self, queryset, request, view):
+        """
+        Keyset pagination over `view.cursor_ordering`. Returns the page of results and records
+        the cursors for the neighbouring pages.
+        """
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            raise InvalidQueryStringError(
+                detail='Custom sorting is not supported with cursor pagination.',
+                parameter=api_settings.ORDERING_PARAM,
+            )
+        ordering = list(view.cursor_ordering)
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param), queryset.model, ordering,
+        )
+        if reverse:
+            # Walk backwards from the cursor, then restore the requested order
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+        total = self.get_estimated_count(queryset)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, position))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        def position_of(obj):
+            return [getattr(obj, field.lstrip('-')) for field in view.cursor_ordering]
+
+        self.cursor = {
+            'current': request.query_params.get(self.cursor_query_param),
+            'next': self.encode_cursor(position_of(results[-1])) if results and has_next else None,
+            'previous': self.encode_cursor(position_of(results[0]), reverse=True) if results and has_previous else None,
+            'per_page': page_size,
+            'total': total,
+        }
+        self.request = request
+        return results
+
+    def get_cursor_links(self, url):
+        return OrderedDict([
+            ('self', self.cursor_query(url, self.cursor['current'] or '')),
+            ('first', self.cursor_query(url, '')),
+            ('last', None),
+            ('prev', self.cursor['previous'] and self.cursor_query(url, self.cursor['previous'])),
+            ('next', self.cursor['next'] and self.cursor_query(url, self.cursor['next'])),
+        ])
+
+    def get_cursor_meta(self):
+        meta = OrderedDict([('per_page', self.cursor['per_page'])])
+        if self.cursor['total'] is not None:
+            meta['total'] = self.cursor['total']
+            meta['total_is_estimate'] = True
+        return meta
+
+    def get_cursor_response_dict_deprecated(self, data, url):
+        links = self.get_cursor_links(url)
+        links.pop('self')
+        links['meta'] = self.get_cursor_meta()
+        return OrderedDict([
+            ('data', data),
+            ('links', links),
+        ])
+
+    def get_cursor_response_dict(self, data, url):
+        return OrderedDict([
+            ('data', data),
+            ('meta', self.get_cursor_meta()),
+            ('links', self.get_cursor_links(url)),
+        ])
+
     def get_response_dict_deprecated(self, data, url):
+        if self.cursor is not None:
+            return self.get_cursor_response_dict_deprecated(data, url)
         return OrderedDict([
             ('data', data),
             (
@@ -87,6 +242,8 @@ class JSONAPIPagination(pagination.PageNumberPagination):
         ])
 
     def get_response_dict(self, data, url):
+        if self.cursor is not None:
+            return self.get_cursor_response_dict(data, url)
         return OrderedDict([
             ('data', data),
             (
@@ -163,6 +320,13 @@ class JSONAPIPagination(pagination.PageNumberPagination):
             self.request = request
             return list(self.page)
 
+        elif (
+            self.cursor_query_param in request.query_params and
+            getattr(view, 'cursor_ordering', None) and
+            isinstance(queryset, QuerySet)
+        ):
+            return self.paginate_queryset_by_cursor(queryset, request, view)
+
         else:
             return super().paginate_queryset(queryset, request, view=None)
 
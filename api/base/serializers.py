@@ -1334,6 +1334,14 @@ class JSONAPIListSerializer(ser.ListSerializer):
                 self.child.to_esi_representation(item, envelope=None) for item in data
             ]
         else:
+            embeds = self.context.get('embed', {})
+            if embeds:
+                # Let embedded list views fetch results for the whole page at once
+                data = list(data)
+                for embed_partial in embeds.values():
+                    prefetch = getattr(embed_partial, 'prefetch', None)
+                    if prefetch:
+                        prefetch(data)
             ret = [
                 self.child.to_representation(item, envelope=envelope) for item in data
             ]
@@ -220,6 +220,7 @@ MIDDLEWARE = (
     'api.base.middleware.DjangoGlobalMiddleware',
     'api.base.middleware.CeleryTaskMiddleware',
     'api.base.middleware.PostcommitTaskMiddleware',
+    'api.base.middleware.GuidCacheMiddleware',
     # A profiling middleware. ONLY FOR DEV USE
     # Uncomment and add "prof" to url params to recieve a profile for that url
     # 'api.base.middleware.ProfileMiddleware',
@@ -327,6 +328,17 @@ ELASTICSEARCH_METRICS_DATE_FORMAT = '%Y'
 WAFFLE_CACHE_NAME = 'waffle_cache'
 STORAGE_USAGE_CACHE_NAME = 'storage_usage'
 STORAGE_USAGE_MAX_ENTRIES = 10000000
+# Name of the shared cache for guid resolution (see osf.utils.guid_cache), e.g. 'redis'; None to disable
+GUID_CACHE_NAME = None
+GUID_CACHE_TIMEOUT = 60 * 60
+# Name of the django-redis cache to buffer counted usage in (see osf.metrics.counted_usage_buffer),
+# e.g. 'redis'; None to save each usage as it is recorded
+COUNTED_USAGE_BUFFER_NAME = None
+# Seconds to collect buffered usage before saving it in bulk
+COUNTED_USAGE_FLUSH_WINDOW = 5
+COUNTED_USAGE_FLUSH_BATCH_SIZE = 500
+# Seconds to reuse an item's visibility, type, provider and parents in its usage
+COUNTED_USAGE_GUID_INFO_TIMEOUT = 60
 
 
 CACHES = {
@@ -52,10 +52,63 @@ class JSONAPIBaseView(generics.GenericAPIView):
         self.view_fqn = ':'.join([self.view_category, self.view_name])
         super().__init__(**kwargs)
 
+    # Name of the attribute on rows returned by `get_embed_batch_queryset` that holds the primary
+    # key of the parent item the row was embedded for. Views that leave this as None are always
+    # resolved one item at a time.
+    embed_batch_parent_field = None
+
+    def get_embed_batch_queryset(self, parents):
+        """Return a single queryset of this view's results for every item in `parents`, used when
+        this view is embedded in a list response. Each row must expose `embed_batch_parent_field`.
+
+        Rows stand in for `get_queryset()`, so they must match the view's `get_default_queryset()`:
+        embedded views skip query param filters (see `ListFilterMixin.get_queryset_from_request`),
+        and bulk requests, which `get_queryset` narrows further, are never batched.
+        """
+        return None
+
+    def get_embed_batch_results(self, rows):
+        """Return the prefetched `rows` for the parent this embedded view was resolved for. Views
+        should perform the permission checks `get_queryset` would normally do here.
+        """
+        return rows
+
+    def _get_embed_prefetch(self, request):
+        """Return the per-request map shared by every embed partial. `serializers` caches serializer
+        instances, `rows` holds batched querysets split per parent and `results` the final embeds.
+        """
+        if not hasattr(request._request, '_embed_prefetch'):
+            request._request._embed_prefetch = {
+                'serializers': {},
+                'rows': {},
+                'results': {},
+            }
+        return request._request._embed_prefetch
+
+    def _build_embedded_view(self, v, view_args, view_kwargs, request):
+        view_kwargs.update({
+            'request': request,
+            'is_embedded': True,
+        })
+
+        # Setup a view ourselves to avoid all the junk DRF throws in
+        # v is a function that hides everything v.cls is the actual view class
+        view = v.cls()
+        view.args = view_args
+        view.kwargs = view_kwargs
+        view.request = request
+        view.request.parser_context['kwargs'] = view_kwargs
+        view.format_kwarg = view.get_format_suffix(**view_kwargs)
+        return view
+
     def _get_embed_partial(self, field_name, field):
         """Create a partial function to fetch the values of an embedded field. A basic
         example is to include a Node's children in a single response.
 
+        The partial exposes a `prefetch` attribute which list serializers call with every
+        item on the page before serializing them, so embedded list views that implement
+        `get_embed_batch_queryset` are fetched with one query for the whole page.
+
         :param str field_name: Name of field of the view's serializer_class to load
         results for
         :return function object -> dict:
@@ -63,6 +116,39 @@ class JSONAPIBaseView(generics.GenericAPIView):
         if getattr(field, 'field', None):
             field = field.field
 
+        def prefetch(items):
+            if is_bulk_request(self.request):
+                return
+            request = EmbeddedRequest(self.request)
+            prefetch_map = self._get_embed_prefetch(request)
+
+            resolved = defaultdict(list)
+            for item in items:
+                try:
+                    v, view_args, view_kwargs = field.resolve(item, field_name, self.request)
+                except Exception:
+                    # Unresolvable items fall back to the per-item path, which reports the error
+                    continue
+                if v and issubclass(v.cls, ListModelMixin) and v.cls.embed_batch_parent_field:
+                    resolved[v].append((item, view_args, view_kwargs))
+
+            for v, entries in resolved.items():
+                batch = prefetch_map['rows'].setdefault((v.cls, field_name), {})
+                parents = [item for item, _, _ in entries if item.pk not in batch]
+                if len(parents) < 2:
+                    continue
+
+                _, view_args, view_kwargs = entries[0]
+                view = self._build_embedded_view(v, view_args, view_kwargs, request)
+                queryset = view.get_embed_batch_queryset(parents)
+                if queryset is None:
+                    continue
+
+                grouped = {parent.pk: [] for parent in parents}
+                for row in view.filter_queryset(queryset):
+                    grouped[getattr(row, v.cls.embed_batch_parent_field)].append(row)
+                batch.update(grouped)
+
         def partial(item):
             # resolve must be implemented on the field
             v, view_args, view_kwargs = field.resolve(item, field_name, self.request)
@@ -70,26 +156,12 @@ class JSONAPIBaseView(generics.GenericAPIView):
                 return None
 
             request = EmbeddedRequest(self.request)
-
-            if not hasattr(request._request, '_embed_cache'):
-                request._request._embed_cache = {}
-            cache = request._request._embed_cache
+            prefetch_map = self._get_embed_prefetch(request)
 
             request.parents.setdefault(type(item), {})[item._id] = item
 
-            view_kwargs.update({
-                'request': request,
-                'is_embedded': True,
-            })
-
-            # Setup a view ourselves to avoid all the junk DRF throws in
-            # v is a function that hides everything v.cls is the actual view class
-            view = v.cls()
-            view.args = view_args
-            view.kwargs = view_kwargs
-            view.request = request
-            view.request.parser_context['kwargs'] = view_kwargs
-            view.format_kwarg = view.get_format_suffix(**view_kwargs)
+            view = self._build_embedded_view(v, view_args, view_kwargs, request)
+            batch = prefetch_map['rows'].get((v.cls, field_name), {})
 
             if not isinstance(view, ListModelMixin):
                 try:
@@ -100,15 +172,16 @@ class JSONAPIBaseView(generics.GenericAPIView):
                     return ret
 
             _cache_key = (v.cls, field_name, view.get_serializer_class(), (type(item), item.id))
-            if _cache_key in cache:
+            if _cache_key in prefetch_map['results']:
                 # We already have the result for this embed, return it
-                return cache[_cache_key]
+                return prefetch_map['results'][_cache_key]
 
             # Cache serializers. to_representation of a serializer should NOT augment it's fields so resetting the context
             # should be sufficient for reuse
-            if not view.get_serializer_class() in cache:
-                cache[view.get_serializer_class()] = view.get_serializer_class()(many=isinstance(view, ListModelMixin), context=view.get_serializer_context())
-            ser = cache[view.get_serializer_class()]
+            serializers = prefetch_map['serializers']
+            if not view.get_serializer_class() in serializers:
+                serializers[view.get_serializer_class()] = view.get_serializer_class()(many=isinstance(view, ListModelMixin), context=view.get_serializer_context())
+            ser = serializers[view.get_serializer_class()]
 
             try:
                 ser._context = view.get_serializer_context()
@@ -116,7 +189,10 @@ class JSONAPIBaseView(generics.GenericAPIView):
                 if not isinstance(view, ListModelMixin):
                     ret = ser.to_representation(item)
                 else:
-                    queryset = view.filter_queryset(view.get_queryset())
+                    if item.pk in batch:
+                        queryset = view.get_embed_batch_results(batch[item.pk])
+                    else:
+                        queryset = view.filter_queryset(view.get_queryset())
                     page = view.paginate_queryset(getattr(queryset, '_results_cache', None) or queryset)
 
                     ret = ser.to_representation(page or queryset)
@@ -131,10 +207,11 @@ class JSONAPIBaseView(generics.GenericAPIView):
                     ret = view.handle_exception(e).data
 
             # Cache our final result
-            cache[_cache_key] = ret
+            prefetch_map['results'][_cache_key] = ret
 
             return ret
 
+        partial.prefetch = prefetch
         return partial
 
     def get_serializer_context(self):
@@ -517,11 +594,23 @@ class BaseContributorList(JSONAPIBaseView, generics.ListAPIView, ListFilterMixin
 
     ordering = ('-user__modified',)
 
+    embed_batch_parent_field = 'node_id'
+
     def get_default_queryset(self):
         node = self.get_node()
 
         return node.contributor_set.all().prefetch_related('user__guids')
 
+    # overrides JSONAPIBaseView
+    def get_embed_batch_queryset(self, parents):
+        return Contributor.objects.filter(node__in=parents).prefetch_related('user__guids')
+
+    # overrides JSONAPIBaseView
+    def get_embed_batch_results(self, rows):
+        # May raise a permission denied, as get_default_queryset would
+        self.get_resource()
+        return rows
+
     def get_queryset(self):
         queryset = self.get_queryset_from_request()
         # If bulk request, queryset only contains contributors in request
@@ -650,9 +739,7 @@ class WaterButlerMixin:
         node = self.get_node(check_object_permissions=False)
         content_type = ContentType.objects.get_for_model(node)
 
-        objs_to_create = defaultdict(list)
-        file_objs = []
-
+        listed = []
         for item in files_list:
             attrs = item['attributes']
             base_class = BaseFileNode.resolve_class(
@@ -660,30 +747,32 @@ class WaterButlerMixin:
                 BaseFileNode.FOLDER if attrs['kind'] == 'folder'
                 else BaseFileNode.FILE,
             )
-
             # mirrors BaseFileNode get_or_create
-            _path = '/' + attrs['path'].lstrip('/')
-            query = {
-                'target_object_id': node.id,
-                'target_content_type': content_type,
-                '_path': _path,
-            }
-
-            # Dataverse provides us two sets of files with the same path, so we disambiguate the paths, this
-            # preserves legacy behavior by distingishing them by version (Draft/Published).
-            if attrs['provider'] == 'dataverse':
-                query.update({'_history__0__extra__datasetVersion': attrs['extra']['datasetVersion']})
-
-            qs = base_class.objects.filter(**query)
-            if qs.count() > 0:
-                file_obj = qs.first()
-                file_objs.append(file_obj)
-                file_obj.update(None, attrs, user=self.request.user, save=False)
-            else:
+            listed.append((base_class, '/' + attrs['path'].lstrip('/'), attrs))
+
+        # Every existing file node for the listed paths, in one query
+        existing_by_path = defaultdict(list)
+        existing_qs = BaseFileNode.objects.filter(
+            target_object_id=node.id,
+            target_content_type=content_type,
+            _path__in={_path for _, _path, _ in listed},
+            type__in={_type for base_class, _, _ in listed for _type in base_class._typedmodels_subtypes},
+        ).order_by('id')
+        for file_obj in existing_qs:
+            existing_by_path[file_obj._path].append(file_obj)
+
+        objs_to_update = {}
+        objs_to_create = defaultdict(list)
+        for base_class, _path, attrs in listed:
+            file_obj = self._find_listed_file_node(existing_by_path[_path], base_class, attrs)
+            if file_obj is None:
                 file_obj = base_class(target=node, _path=_path, provider=base_class._provider)
-                file_obj.update(None, attrs, user=self.request.user, save=False)
                 objs_to_create[base_class].append(file_obj)
+            else:
+                objs_to_update[file_obj.id] = file_obj
+            file_obj.update(None, attrs, user=self.request.user, save=False)
 
+        file_objs = list(objs_to_update.values())
         bulk_update(file_objs)
 
         for base_class in objs_to_create:
@@ -693,6 +782,24 @@ class WaterButlerMixin:
         # stuff list into QuerySet
         return BaseFileNode.objects.filter(id__in=[item.id for item in file_objs])
 
+    @staticmethod
+    def _find_listed_file_node(candidates, base_class, attrs):
+        """The first of `candidates` (existing file nodes on the listed path) that `attrs` describes, if any"""
+        for file_obj in candidates:
+            if file_obj.type not in base_class._typedmodels_subtypes:
+                continue
+            # Dataverse provides us two sets of files with the same path, so we disambiguate the paths, this
+            # preserves legacy behavior by distingishing them by version (Draft/Published).
+            if attrs['provider'] == 'dataverse':
+                try:
+                    dataset_version = file_obj._history[0]['extra']['datasetVersion']
+                except (IndexError, KeyError, TypeError):
+                    continue
+                if dataset_version != attrs['extra']['datasetVersion']:
+                    continue
+            return file_obj
+        return None
+
     def get_file_node_from_wb_resp(self, item):
         """Takes file data from wb response, touches/updates metadata for it, and returns file object"""
         attrs = item['attributes']
@@ -118,9 +118,9 @@ def update_storage_usage_cache(target_id, target_guid, per_page=_DEFAULT_FILEVER
     if not settings.ENABLE_STORAGE_USAGE_CACHE:
         return
     from osf.models import Guid
-    storage_usage_total = compute_storage_usage_total(Guid.load(target_guid).referent, per_page=per_page)
-    key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target_guid)
-    storage_usage_cache.set(key, storage_usage_total, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+    target = Guid.load(target_guid).referent
+    storage_usage_total = compute_storage_usage_total(target, per_page=per_page)
+    set_storage_usage_total(target, storage_usage_total)
 
 
 def compute_storage_usage_total(target_obj, per_page=_DEFAULT_FILEVERSION_PAGE_SIZE):
@@ -164,12 +164,74 @@ def get_storage_usage_total(target_obj):
         return compute_storage_usage_total(target_obj)
     _cache_key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target_obj._id)
     _storage_usage_total = storage_usage_cache.get(_cache_key)
+    if _storage_usage_total is None:
+        _storage_usage_total = get_persisted_storage_usage_total(target_obj)
     if _storage_usage_total is None:
         _storage_usage_total = compute_storage_usage_total(target_obj)
+        set_storage_usage_total(target_obj, _storage_usage_total)
+    else:
         storage_usage_cache.set(_cache_key, _storage_usage_total, settings.STORAGE_USAGE_CACHE_TIMEOUT)
     return _storage_usage_total
 
 
+def get_persisted_storage_usage_total(target):
+    """Read the running total maintained from WaterButler deltas, or None if it was never computed"""
+    AbstractNode = apps.get_model('osf.abstractnode')
+    NodeStorageUsage = apps.get_model('osf.nodestorageusage')
+    if not isinstance(target, AbstractNode):
+        return None
+    return NodeStorageUsage.get_total(target)
+
+
+def set_storage_usage_total(target, storage_usage_total, reconciled=True):
+    """Store a freshly computed total in both the persisted running total and the cache"""
+    AbstractNode = apps.get_model('osf.abstractnode')
+    NodeStorageUsage = apps.get_model('osf.nodestorageusage')
+    if isinstance(target, AbstractNode):
+        NodeStorageUsage.set_total(target, storage_usage_total, reconciled=reconciled)
+    key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target._id)
+    storage_usage_cache.set(key, storage_usage_total, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+
+
+def adjust_storage_usage_total(target, delta):
+    """Apply a byte delta from a WaterButler callback to the target's running total.
+
+    If no running total has been persisted yet it is seeded from the cached value; with
+    neither available a full recompute is queued instead.
+    """
+    NodeStorageUsage = apps.get_model('osf.nodestorageusage')
+    storage_usage_total = NodeStorageUsage.apply_delta(target, delta)
+    if storage_usage_total is None:
+        key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target._id)
+        cached_total = storage_usage_cache.get(key)
+        if cached_total is None:
+            return update_storage_usage(target)
+        storage_usage_total = NodeStorageUsage.set_total(target, max(cached_total + delta, 0), reconciled=False)
+    key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target._id)
+    storage_usage_cache.set(key, storage_usage_total, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+
+
+@app.task(max_retries=5, default_retry_delay=60)
+def reconcile_storage_usage(node_ids, per_page=_DEFAULT_FILEVERSION_PAGE_SIZE, dry_run=False):
+    """Recompute the totals of `node_ids` from file versions and repair any drift in the running totals.
+
+    :return: dict of node id -> (persisted total, recomputed total) for nodes that had drifted
+    """
+    NodeStorageUsage = apps.get_model('osf.nodestorageusage')
+    drifted = {}
+    for record in NodeStorageUsage.objects.filter(node_id__in=node_ids).select_related('node'):
+        storage_usage_total = compute_storage_usage_total(record.node, per_page=per_page)
+        if storage_usage_total != record.total:
+            drifted[record.node_id] = (record.total, storage_usage_total)
+            logger.warning(
+                f'Storage usage for node {record.node._id} drifted: '
+                f'running total {record.total}, recomputed {storage_usage_total}',
+            )
+        if not dry_run:
+            set_storage_usage_total(record.node, storage_usage_total)
+    return drifted
+
+
 def update_storage_usage(target):
     Preprint = apps.get_model('osf.preprint')
     DraftRegistration = apps.get_model('osf.draftregistration')
@@ -206,7 +268,6 @@ def update_storage_usage_with_size(payload):
     if target_node.storage_limit_status is settings.StorageLimits.NOT_CALCULATED:
         return update_storage_usage(target_node)
 
-    current_usage = target_node.storage_usage
     target_file = BaseFileNode.load(target_file_id)
 
     if target_file and action in ['copy', 'delete', 'move']:
@@ -214,10 +275,10 @@ def update_storage_usage_with_size(payload):
         target_file_size = target_file.versions.aggregate(Sum('size'))['size__sum'] or target_file_size
 
     if action in ['create', 'update', 'copy'] and provider == 'osfstorage':
-        current_usage += target_file_size
+        delta = target_file_size
 
     elif action == 'delete' and provider == 'osfstorage':
-        current_usage = max(current_usage - target_file_size, 0)
+        delta = -target_file_size
 
     elif action in 'move':
         source_node = AbstractNode.load(payload['source']['nid'])  # Getting the 'from' node
@@ -229,18 +290,13 @@ def update_storage_usage_with_size(payload):
             if source_node.storage_limit_status is settings.StorageLimits.NOT_CALCULATED:
                 return update_storage_usage(source_node)
 
-            source_node_usage = source_node.storage_usage
-            source_node_usage = max(source_node_usage - target_file_size, 0)
-
-            key = cache_settings.STORAGE_USAGE_KEY.format(target_id=source_node._id)
-            storage_usage_cache.set(key, source_node_usage, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+            adjust_storage_usage_total(source_node, -target_file_size)
 
-        current_usage += target_file_size
+        delta = target_file_size
 
         if provider != 'osfstorage':
             return  # We don't want to update the destination node if the provider isn't osfstorage
     else:
         return
 
-    key = cache_settings.STORAGE_USAGE_KEY.format(target_id=target_node._id)
-    storage_usage_cache.set(key, current_usage, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+    adjust_storage_usage_total(target_node, delta)
@@ -1,5 +1,8 @@
+import functools
 import os
 import re
+import threading
+import typing
 from rest_framework import status as http_status
 
 from citeproc import CitationStylesStyle, CitationStylesBibliography
@@ -12,6 +15,14 @@ from framework.auth import utils
 from osf.models.citation import CitationStyle
 from website.settings import CITATION_STYLES_PATH, BASE_PATH, CUSTOM_CITATIONS
 
+STYLE_CACHE_SIZE = 64
+
+
+class ParsedStyle(typing.NamedTuple):
+    csl_style: CitationStylesStyle
+    # citeproc keeps rendering state on the parsed style, so only one render at a time
+    lock: threading.Lock
+
 
 def clean_up_common_errors(cit):
     cit = re.sub(r'\.+', '.', cit)
@@ -42,14 +53,9 @@ def process_name(node, user):
     }
 
 
-def render_citation(node, style='apa'):
-    """Given a node, return a citation"""
-    reformat_styles = ['apa', 'chicago-author-date', 'modern-language-association']
-    csl = node.csl
-    data = [csl]
-
-    bib_source = CiteProcJSON(data)
-
+@functools.lru_cache(maxsize=STYLE_CACHE_SIZE)
+def get_style(style):
+    """Given a style id, return it parsed (from disk, once per process), with dependent styles resolved to their parent"""
     custom = CUSTOM_CITATIONS.get(style, False)
     path = os.path.join(BASE_PATH, 'static', custom) if custom else os.path.join(CITATION_STYLES_PATH, style)
 
@@ -64,14 +70,38 @@ def render_citation(node, style='apa'):
         else:
             raise ValueError(f'Unable to find a dependent or independent parent style related to {style}.csl')
 
-    bibliography = CitationStylesBibliography(bib_style, bib_source, formatter.plain)
+    return ParsedStyle(bib_style, threading.Lock())
 
-    citation = Citation([CitationItem(node._id)])
 
-    bibliography.register(citation)
+def render_citation(node, style='apa'):
+    """Given a node, return a citation"""
+    return render_citations([node], style=style)[0]
+
+
+def render_citations(nodes, style='apa'):
+    """Given many nodes, return their citations in one style, in the same order"""
+    nodes = list(nodes)
+    csls = [node.csl for node in nodes]
+    bib_source = CiteProcJSON(list({node._id: csl for node, csl in zip(nodes, csls)}.values()))
+    parsed_style = get_style(style)
 
-    bib = bibliography.bibliography()
-    cit = str(bib[0] if len(bib) else '')
+    raw_citations = []
+    with parsed_style.lock:
+        for node in nodes:
+            # Each node is its own bibliography, so none are numbered, sorted or abbreviated against the others
+            bibliography = CitationStylesBibliography(parsed_style.csl_style, bib_source, formatter.plain)
+            bibliography.register(Citation([CitationItem(node._id)]))
+            bib = bibliography.bibliography()
+            raw_citations.append(str(bib[0] if len(bib) else ''))
+
+    return [
+        reformat_citation(node, csl, cit, style)
+        for node, csl, cit in zip(nodes, csls, raw_citations)
+    ]
+
+
+def reformat_citation(node, csl, cit, style):
+    reformat_styles = ['apa', 'chicago-author-date', 'modern-language-association']
 
     title = csl['title'] if csl else node.csl['title']
     title = title.rstrip('.')
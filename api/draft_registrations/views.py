@@ -171,11 +171,17 @@ class DraftContributorsList(NodeContributorsList, DraftRegistrationMixin):
     view_name = 'draft-registration-contributors'
     serializer_class = DraftRegistrationContributorsSerializer
 
+    embed_batch_parent_field = 'draft_registration_id'
+
     def get_default_queryset(self):
         # Overrides NodeContributorsList
         draft = self.get_draft()
         return draft.draftregistrationcontributor_set.all().prefetch_related('user__guids')
 
+    # Overrides NodeContributorsList
+    def get_embed_batch_queryset(self, parents):
+        return DraftRegistrationContributor.objects.filter(draft_registration__in=parents).prefetch_related('user__guids')
+
     # overrides NodeContributorsList
     def get_serializer_class(self):
         if self.request.method in ('PUT', 'PATCH', 'DELETE'):
@@ -285,15 +285,16 @@ class BaseFileSerializer(JSONAPISerializer):
         type_ = 'files'
 
     def get_size(self, obj):
-        if obj.versions.exists():
-            self.size = obj.versions.first().size
+        latest_version = obj.get_latest_version()
+        if latest_version:
+            self.size = latest_version.size
             return self.size
         return None
 
     def get_date_created(self, obj):
         creat_dt = None
-        if obj.provider == 'osfstorage' and obj.versions.exists():
-            creat_dt = obj.versions.last().created
+        if obj.provider == 'osfstorage':
+            creat_dt = obj.get_first_version_created()
         elif obj.provider != 'osfstorage' and obj.history:
             # Non-osfstorage files don't store a created date, so instead get the modified date of the
             # earliest entry in the file history.
@@ -306,8 +307,9 @@ class BaseFileSerializer(JSONAPISerializer):
 
     def get_extra(self, obj):
         metadata = {}
-        if obj.provider == 'osfstorage' and obj.versions.exists():
-            metadata = obj.versions.first().metadata
+        latest_version = obj.get_latest_version() if obj.provider == 'osfstorage' else None
+        if latest_version:
+            metadata = latest_version.metadata
         elif obj.provider != 'osfstorage' and obj.history:
             metadata = obj.history[-1].get('extra', {})
 
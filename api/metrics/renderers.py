@@ -1,7 +1,7 @@
 import csv
-import io
+import itertools
 import json
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 
 from rest_framework import renderers
 
@@ -42,25 +42,54 @@ def get_csv_row(keys_list, report_attrs):
     ]
 
 
+class _Echo:
+    # file-like object for a `csv.writer` that hands back each written line instead of keeping it
+    def write(self, value):
+        return value
+
+
+def iter_csv_lines(serialized_reports, csv_dialect):
+    """yield the lines of a csv file with a row for each serialized report
+
+    column names are taken from the first report; raises Http404 if there are no reports
+    """
+    serialized_reports = iter(serialized_reports)
+    try:
+        first_row = next(serialized_reports)
+    except StopIteration:
+        raise Http404('<h1>none found</h1>')
+    csv_fieldnames = list(get_nested_keys(first_row))
+    csv_writer = csv.writer(_Echo(), dialect=csv_dialect)
+    yield csv_writer.writerow(csv_fieldnames)
+    for serialized_report in itertools.chain([first_row], serialized_reports):
+        yield csv_writer.writerow(
+            get_csv_row(csv_fieldnames, serialized_report),
+        )
+
+
 class MetricsReportsRenderer(renderers.BaseRenderer):
     def render(self, json_response, accepted_media_type=None, renderer_context=None):
         serialized_reports = (
             jsonapi_resource['attributes']
             for jsonapi_resource in json_response['data']
         )
+        return ''.join(iter_csv_lines(serialized_reports, self.CSV_DIALECT))
+
+    def stream(self, serialized_reports):
+        """a response streaming the given reports' attributes as they are iterated over
+
+        for exports too big to render at once -- returns None if there are no reports
+        (leaving the usual response to report that)
+        """
+        csv_lines = iter_csv_lines(serialized_reports, self.CSV_DIALECT)
         try:
-            first_row = next(serialized_reports)
-        except StopIteration:
-            raise Http404('<h1>none found</h1>')
-        csv_fieldnames = list(get_nested_keys(first_row))
-        csv_filecontent = io.StringIO(newline='')
-        csv_writer = csv.writer(csv_filecontent, dialect=self.CSV_DIALECT)
-        csv_writer.writerow(csv_fieldnames)
-        for serialized_report in (first_row, *serialized_reports):
-            csv_writer.writerow(
-                get_csv_row(csv_fieldnames, serialized_report),
-            )
-        return csv_filecontent.getvalue()
+            first_line = next(csv_lines)
+        except Http404:
+            return None
+        return StreamingHttpResponse(
+            itertools.chain([first_line], csv_lines),
+            content_type=f'{self.media_type}; charset={self.charset}',
+        )
 
 
 class MetricsReportsCsvRenderer(MetricsReportsRenderer):
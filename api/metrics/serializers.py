@@ -5,6 +5,7 @@ from rest_framework import serializers as ser
 
 from api.base.serializers import BaseAPISerializer
 from api.base.utils import absolute_reverse
+from osf.metrics import counted_usage_buffer
 from osf.metrics.counted_usage import CountedAuthUsage, PageviewInfo
 from website import settings as website_settings
 
@@ -63,18 +64,24 @@ class CountedAuthUsageSerializer(ser.Serializer):
         return data
 
     def create(self, validated_data):
-        pageview_info = None
-        if pageview_info_data := validated_data.get('pageview_info'):
-            pageview_info = PageviewInfo(**pageview_info_data)
-        return CountedAuthUsage.record(
+        usage_kwargs = dict(
             platform_iri=website_settings.DOMAIN,
             provider_id=validated_data.get('provider_id'),
             item_guid=validated_data.get('item_guid'),
             session_id=validated_data['session_id'],  # must be provided by the view
             user_is_authenticated=validated_data['user_is_authenticated'],  # must be provided by the view
             action_labels=validated_data.get('action_labels'),
-            pageview_info=pageview_info,
         )
+        if counted_usage_buffer.is_enabled():
+            # saved later, in bulk with other usage
+            return counted_usage_buffer.buffer_counted_usage(
+                pageview_info=validated_data.get('pageview_info'),
+                **usage_kwargs,
+            )
+        pageview_info = None
+        if pageview_info_data := validated_data.get('pageview_info'):
+            pageview_info = PageviewInfo(**pageview_info_data)
+        return CountedAuthUsage.record(pageview_info=pageview_info, **usage_kwargs)
 
 
 class ReportNameSerializer(ser.BaseSerializer):
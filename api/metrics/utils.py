@@ -14,6 +14,8 @@ YEARMONTH_FORMAT = '%Y-%m'
 DEFAULT_DAYS_BACK = 5
 DEFAULT_MONTHS_BACK = 5 * 30  # days
 
+SEARCH_PAGE_SIZE = 1000
+
 
 def parse_datetimes(query_params):
     now = timezone.now()
@@ -114,3 +116,22 @@ def parse_date_range(query_params, is_monthly=False):
         start_date, end_date = parse_dates(query_params, is_monthly=is_monthly)
         report_date_range = {'gte': str(start_date), 'lte': str(end_date)}
     return report_date_range
+
+
+def iter_search_pages(search, page_size=None):
+    """Iterate over all results of an elasticsearch_dsl Search, one page (response) at a time.
+
+    Pages with `search_after` on the search's sort (with `_id` to break ties), so however many
+    results match, only one page is held at a time and the index's max_result_window is no limit.
+    Any slicing on `search` is ignored.
+    """
+    page_size = page_size or SEARCH_PAGE_SIZE
+    search = search.sort(*search.to_dict().get('sort', ()), '_id')[:page_size]
+    search_after = None
+    while True:
+        page = (search if search_after is None else search.extra(search_after=search_after)).execute()
+        if len(page):
+            yield page
+        if len(page) < page_size:
+            break
+        search_after = list(page[-1].meta.sort)
@@ -41,6 +41,7 @@ from api.metrics.serializers import (
     CountedAuthUsageSerializer,
 )
 from api.metrics.utils import (
+    iter_search_pages,
     parse_datetimes,
     parse_date_range,
 )
@@ -350,18 +351,12 @@ class RecentReportList(JSONAPIBaseView):
             report_class.search()
             .filter('range', **{range_field_name: range_filter})
             .sort(range_field_name)
-            [:self.MAX_COUNT]
         )
         if days_back:
             search_recent.filter('range', report_date={'gte': f'now/d-{days_back}d'})
 
         report_date_range = parse_date_range(request.GET)
-        search_response = search_recent.execute()
-        serializer = serializer_class(
-            search_response,
-            many=True,
-            context={'report_name': report_name},
-        )
+        serializer_context = {'report_name': report_name}
         accepted_format = request.accepted_renderer.format
         response_headers = {}
         if accepted_format in ('tsv', 'csv'):
@@ -373,6 +368,22 @@ class RecentReportList(JSONAPIBaseView):
                 f'from_{from_date}.{accepted_format}'
             )
             response_headers['Content-Disposition'] = f'attachment; filename={filename}'
+            # stream every report in the range, a page at a time, instead of up to MAX_COUNT at once
+            streaming_response = request.accepted_renderer.stream(
+                serialized_report['attributes']
+                for search_page in iter_search_pages(search_recent)
+                for serialized_report in serializer_class(search_page, many=True, context=serializer_context).data
+            )
+            if streaming_response is not None:
+                for header_name, header_value in response_headers.items():
+                    streaming_response[header_name] = header_value
+                return streaming_response
+        search_response = search_recent[:self.MAX_COUNT].execute()
+        serializer = serializer_class(
+            search_response,
+            many=True,
+            context=serializer_context,
+        )
         return Response(
             {'data': serializer.data},
             headers=response_headers,
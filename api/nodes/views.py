@@ -262,6 +262,7 @@ class NodeList(JSONAPIBaseView, bulk_views.BulkUpdateJSONAPIView, bulk_views.Bul
     view_name = 'node-list'
 
     ordering = ('-modified',)  # default ordering
+    cursor_ordering = ('-modified', '-id')
 
     # overrides NodesFilterMixin
     def get_default_queryset(self):
@@ -622,6 +623,11 @@ class NodeBibliographicContributorsList(BaseContributorList, NodeMixin):
         contributors = super().get_default_queryset()
         return contributors.filter(visible=True)
 
+    # overrides BaseContributorList
+    def get_embed_batch_queryset(self, parents):
+        contributors = super().get_embed_batch_queryset(parents)
+        return contributors.filter(visible=True)
+
 
 class NodeDraftRegistrationsList(JSONAPIBaseView, generics.ListCreateAPIView, NodeMixin):
     """
@@ -1175,8 +1181,7 @@ class NodeFilesList(JSONAPIBaseView, generics.ListAPIView, WaterButlerMixin, Lis
         # Addon provided files/folders don't have versions so for there date modified we check the history. The history
         # is updated every time we query the file metadata via Waterbutler.
         if provider == 'osfstorage':
-            return folder_object.children.prefetch_related(
-                'versions',
+            return folder_object.children.select_related('latest_version').prefetch_related(
                 'tags',
                 'guids',
             )
@@ -1599,6 +1604,7 @@ class NodeLogList(JSONAPIBaseView, generics.ListAPIView, NodeMixin, ListFilterMi
     log_lookup_url_kwarg = 'node_id'
 
     ordering = ('-date',)
+    cursor_ordering = ('-date', '-id')
 
     permission_classes = (
         drf_permissions.IsAuthenticatedOrReadOnly,
@@ -476,6 +476,9 @@ class PreprintContributorsList(PreprintOldVersionsImmutableMixin, NodeContributo
     view_name = 'preprint-contributors'
     serializer_class = PreprintContributorsSerializer
 
+    # PreprintContributors are not keyed on node_id, so embeds are resolved per preprint
+    embed_batch_parent_field = None
+
     def get_default_queryset(self):
         preprint = self.get_preprint()
         return preprint.preprintcontributor_set.all().prefetch_related('user__guids')
@@ -138,6 +138,7 @@ class RegistrationList(JSONAPIBaseView, generics.ListCreateAPIView, bulk_views.B
     view_name = 'registration-list'
 
     ordering = ('-modified',)
+    cursor_ordering = ('-modified', '-id')
     model_class = Registration
 
     parser_classes = (JSONAPIMultipleRelationshipsParser, JSONAPIMultipleRelationshipsParserForRegularJSON)
@@ -18,9 +18,11 @@ from framework.celery_tasks.handlers import enqueue_task
 from framework.encryption import ensure_bytes
 from framework.sentry import log_exception
 from osf import models as osf_db
+from osf.metadata import gather
 from osf.metadata.osf_gathering import (
     OsfmapPartition,
     pls_get_magic_metadata_basket,
+    pls_get_magic_metadata_baskets,
 )
 from osf.metadata.serializers import get_metadata_serializer
 from website import settings
@@ -117,12 +119,94 @@ def task__update_share(self, guid: str, is_backfill=False, osfmap_partition_name
                 )
 
 
-def pls_send_trove_record(osf_item, *, is_backfill: bool, osfmap_partition: OsfmapPartition):
+@celery_app.task(
+    bind=True,
+    acks_late=True,
+)
+def task__update_share_batch(self, guids: list[str], is_backfill=False, osfmap_partition_name='MAIN'):
+    """
+    Send SHARE/trove current metadata records for many osf-guid-identified objects,
+    gathering their metadata together (see `pls_get_magic_metadata_baskets`)
+
+    Any item that fails is handed off to `task__update_share`, which retries it alone.
+    """
+    _osfmap_partition = OsfmapPartition[osfmap_partition_name]
+    _osfids = (
+        apps.get_model('osf.Guid').objects
+        .filter(_id__in=guids)
+        .prefetch_related('referent')
+    )
+    _guid_by_resource = {}
+    for _osfid in _osfids:
+        if _osfid.referent is not None:
+            _guid_by_resource[_osfid.referent] = _osfid._id
+    _unknown_guids = set(guids).difference(_guid_by_resource.values())
+    if _unknown_guids:
+        logger.warning(f'task__update_share_batch skipping unknown osfguids: {_unknown_guids}')
+    _to_send = []
+    _succeeded_guids = []
+    for _resource, _guid in _guid_by_resource.items():
+        if _should_delete_indexcard(_resource):
+            _handle_batch_response(_guid, is_backfill, _osfmap_partition, lambda: pls_delete_trove_record(
+                _resource,
+                osfmap_partition=_osfmap_partition,
+            ))
+        else:
+            _to_send.append(_resource)
+    # baskets for items of one type share gathered metadata (and prefetched rows)
+    _gather_cache = gather.GatherCache()
+    _resources_by_type = {}
+    for _resource in _to_send:
+        _resources_by_type.setdefault(type(_resource), []).append(_resource)
+    for _resources in _resources_by_type.values():
+        _baskets = pls_get_magic_metadata_baskets(_resources, gather_cache=_gather_cache)
+        for _resource, _basket in zip(_resources, _baskets):
+            _guid = _guid_by_resource[_resource]
+            _ok = _handle_batch_response(_guid, is_backfill, _osfmap_partition, lambda: pls_send_trove_record(
+                _resource,
+                is_backfill=is_backfill,
+                osfmap_partition=_osfmap_partition,
+                basket=_basket,
+            ))
+            if _ok:
+                _succeeded_guids.append(_guid)
+    # enqueue followup batch for supplementary metadata
+    _next_partition = _next_osfmap_partition(_osfmap_partition)
+    if _next_partition is not None and _succeeded_guids:
+        task__update_share_batch.delay(
+            _succeeded_guids,
+            is_backfill=is_backfill,
+            osfmap_partition_name=_next_partition.name,
+        )
+
+
+def _handle_batch_response(guid, is_backfill, osfmap_partition, send) -> bool:
+    try:
+        _response = send()
+        _response.raise_for_status()
+    except Exception as e:
+        log_exception(e)
+        _response = getattr(e, 'response', None)
+        if _response is None or HTTPStatus(_response.status_code).is_server_error:
+            task__update_share.delay(
+                guid,
+                is_backfill=is_backfill,
+                osfmap_partition_name=osfmap_partition.name,
+            )
+        return False
+    return True
+
+
+def pls_send_trove_record(osf_item, *, is_backfill: bool, osfmap_partition: OsfmapPartition, gather_cache=None, basket=None):
     try:
         _iri = osf_item.get_semantic_iri()
     except (AttributeError, ValueError):
         raise ValueError(f'could not get iri for {osf_item}')
-    _basket = pls_get_magic_metadata_basket(osf_item)
+    _basket = (
+        basket
+        if basket is not None
+        else pls_get_magic_metadata_basket(osf_item, gather_cache=gather_cache)
+    )
     _serializer = get_metadata_serializer(
         format_key='turtle',
         basket=_basket,
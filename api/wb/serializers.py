@@ -37,14 +37,17 @@ class WaterbutlerMetadataSerializer(ser.Serializer):
         return obj.get_download_count()
 
     def get_sha256(self, obj):
-        return obj.versions.first().metadata.get('sha256', None) if obj.versions.exists() else None
+        latest_version = obj.get_latest_version()
+        return latest_version.metadata.get('sha256', None) if latest_version else None
 
     def get_md5(self, obj):
-        return obj.versions.first().metadata.get('md5', None) if obj.versions.exists() else None
+        latest_version = obj.get_latest_version()
+        return latest_version.metadata.get('md5', None) if latest_version else None
 
     def get_size(self, obj):
-        if obj.versions.exists():
-            self.size = obj.versions.first().size
+        latest_version = obj.get_latest_version()
+        if latest_version:
+            self.size = latest_version.size
             return self.size
         return None
 
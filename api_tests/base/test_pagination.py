@@ -51,3 +51,57 @@ class TestJSONAPIPagination(ApiTestCase):
         assert 'meta' not in links
         assert 'total' in meta
         assert 'per_page' in meta
+
+
+class TestJSONAPICursorPagination(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.url = f'/{settings.API_BASE}nodes/?version=2.1&page[size]=4&page[cursor]='
+        self.user = factories.AuthUserFactory()
+        self.projects = [factories.ProjectFactory(creator=self.user) for _ in range(10)]
+
+    def walk(self, url):
+        ids = []
+        while url:
+            res = self.app.get(url, auth=self.user.auth)
+            assert res.status_code == 200
+            ids.extend(node['id'] for node in res.json['data'])
+            url = res.json['links']['next']
+        return ids, res
+
+    def test_cursor_walks_every_node_once(self):
+        ids, _ = self.walk(self.url)
+        expected = [
+            project._id for project in
+            sorted(self.projects, key=lambda project: (project.modified, project.id), reverse=True)
+        ]
+        assert ids == expected
+
+    def test_cursor_links_and_meta(self):
+        res = self.app.get(self.url, auth=self.user.auth)
+        links = res.json['links']
+        meta = res.json['meta']
+        assert 'self' in links
+        assert 'first' in links
+        assert links['last'] is None
+        assert links['prev'] is None
+        assert 'page%5Bcursor%5D=' in links['next']
+        assert meta['per_page'] == 4
+
+    def test_cursor_prev_returns_previous_page(self):
+        first_page = self.app.get(self.url, auth=self.user.auth)
+        second_page = self.app.get(first_page.json['links']['next'], auth=self.user.auth)
+        assert second_page.json['links']['prev']
+        res = self.app.get(second_page.json['links']['prev'], auth=self.user.auth)
+        assert [node['id'] for node in res.json['data']] == [node['id'] for node in first_page.json['data']]
+
+    def test_invalid_cursor(self):
+        res = self.app.get(f'{self.url}garbage', auth=self.user.auth, expect_errors=True)
+        assert res.status_code == 400
+        assert res.json['errors'][0]['source']['parameter'] == 'page[cursor]'
+
+    def test_cursor_rejects_custom_sort(self):
+        res = self.app.get(f'{self.url}&sort=title', auth=self.user.auth, expect_errors=True)
+        assert res.status_code == 400
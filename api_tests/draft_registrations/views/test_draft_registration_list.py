@@ -107,6 +107,28 @@ class TestDraftRegistrationListTopLevelEndpoint:
         assert data[0]['id'] == draft_registration._id
         assert data[0]['attributes']['registration_metadata'] == {}
 
+    def test_draft_list_embeds_contributors(
+            self, app, user, user_write_contrib, project, schema, draft_registration, url_draft_registrations
+    ):
+        other_draft = DraftRegistrationFactory(
+            initiator=user,
+            registration_schema=schema,
+            branched_from=project
+        )
+        res = app.get(f'{url_draft_registrations}?embed=contributors', auth=user.auth)
+        assert res.status_code == 200
+
+        embedded = {
+            draft['id']: {
+                contrib['id'] for contrib in draft['embeds']['contributors']['data']
+            } for draft in res.json['data']
+        }
+        # contributors fetched for the whole page are split back out per draft
+        assert embedded[draft_registration._id] == {
+            f'{draft_registration._id}-{contrib._id}' for contrib in draft_registration.contributors
+        }
+        assert embedded[other_draft._id] == {f'{other_draft._id}-{user._id}'}
+
     def test_logged_in_non_contributor_has_empty_list(
             self, app, user_non_contrib, url_draft_registrations
     ):
@@ -175,6 +175,49 @@ class TestNodeFileList:
         }
         assert dataset_versions == {'latest', 'latest-published'}
 
+    @responses.activate
+    def test_listing_reuses_existing_filenodes(self, app, user, node, dataverse, dataverse_draft_filenode, dataverse_published_filenode):
+        prepare_mock_wb_response(
+            path='/',
+            node=node,
+            provider='dataverse',
+            files=[
+                {
+                    'name': 'testpath',
+                    'path': '/testpath',
+                    'materialized': '/testpath',
+                    'extra': {'datasetVersion': 'latest'},
+                },
+                {
+                    'name': 'testpath',
+                    'path': '/testpath',
+                    'materialized': '/testpath',
+                    'extra': {'datasetVersion': 'latest-published'},
+                },
+                {
+                    'name': 'otherpath',
+                    'path': '/otherpath',
+                    'materialized': '/otherpath',
+                    'extra': {'datasetVersion': 'latest'},
+                },
+            ]
+        )
+        for _ in range(2):
+            res = app.get(
+                f'/{API_BASE}nodes/{node._id}/files/dataverse/',
+                auth=node.creator.auth
+            )
+            assert len(res.json['data']) == 3
+
+        filenodes = DataverseFile.objects.filter(target_object_id=node.id)
+        assert filenodes.count() == 3
+        assert set(filenodes.filter(_path='/testpath').values_list('id', flat=True)) == {
+            dataverse_draft_filenode.id,
+            dataverse_published_filenode.id,
+        }
+        dataverse_draft_filenode.refresh_from_db()
+        assert dataverse_draft_filenode.name == 'testpath'
+
 
 @pytest.mark.django_db
 class TestFileFiltering:
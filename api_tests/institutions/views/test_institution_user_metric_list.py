@@ -3,11 +3,13 @@ import csv
 import json
 from io import StringIO
 from random import random
+from unittest import mock
 from urllib.parse import urlencode
 
 import pytest
 from waffle.testutils import override_flag
 
+from api.metrics.utils import iter_search_pages
 from api.base.settings.defaults import API_BASE, DEFAULT_ES_NULL_VALUE, REPORT_FILENAME_FORMAT
 import osf.features
 from osf_tests.factories import (
@@ -574,6 +576,26 @@ class TestNewInstitutionUserMetricList:
                 # Sort both expected and actual rows (ignoring the header) before comparison
                 assert sorted(response_rows[1:]) == sorted(expected_data)
 
+    @mock.patch('api.metrics.utils.SEARCH_PAGE_SIZE', 2)
+    def test_csv_streamed_by_page(self, app, url, institutional_admin, institution):
+        _user_names = [f'Nick Foles #{i}' for i in range(5)]
+        for i, _user_name in enumerate(_user_names):
+            _report_factory('2024-08', institution, user_id=f'u_foles_{i}', user_name=_user_name)
+
+        with mock.patch('api.base.elasticsearch_dsl_views.iter_search_pages', wraps=iter_search_pages) as mock_iter:
+            resp = app.get(f'{url}?format=csv', auth=institutional_admin.auth)
+        assert resp.status_code == 200
+        assert mock_iter.called
+        with StringIO(resp.text) as file:
+            response_rows = list(csv.reader(file))
+        assert response_rows[0][-1] == 'user_name'
+        assert sorted(_row[-1] for _row in response_rows[1:]) == _user_names
+
+        # page[size] limits how many are streamed
+        resp = app.get(f'{url}?format=csv&page[size]=3', auth=institutional_admin.auth)
+        assert resp.status_code == 200
+        assert len(resp.text.splitlines()) == 4  # 1 header + 3 records
+
     def test_get_report_format_table_json(self, app, url, institutional_admin, institution):
         _report_factory(
             '2024-08',
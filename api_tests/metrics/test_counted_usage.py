@@ -1,8 +1,16 @@
 from datetime import datetime, timezone
+import json
 
 import pytest
 from unittest import mock
 
+from django.core.cache import cache
+from django.test import override_settings
+from elasticsearch.exceptions import ConnectionError as ElasticConnectionError
+
+from osf.metrics import counted_usage_buffer
+from osf.metrics.counted_usage import CountedAuthUsage
+from osf.models import Guid
 from osf_tests.factories import (
     AuthUserFactory,
     PreprintFactory,
@@ -351,3 +359,122 @@ class TestGuidFields:
                 'surrounding_guids': None,
             },
         )
+
+
+@pytest.mark.django_db
+class TestBufferedUsage:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def mock_redis(self):
+        with override_settings(COUNTED_USAGE_BUFFER_NAME='redis'):
+            with mock.patch('osf.metrics.counted_usage_buffer._get_redis') as mock_get_redis:
+                yield mock_get_redis.return_value
+
+    @pytest.fixture
+    def mock_bulk(self):
+        with mock.patch.object(CountedAuthUsage, '_get_connection') as mock_get_connection:
+            mock_get_connection.return_value.bulk.return_value = {'errors': False, 'items': []}
+            yield mock_get_connection.return_value.bulk
+
+    @mock.patch('osf.metrics.counted_usage_buffer.enqueue_task')
+    def test_post_is_buffered(self, mock_enqueue, app, mock_save, mock_redis):
+        payload = counted_usage_payload(
+            item_guid='zyxwv',
+            action_labels=['view', 'web'],
+            pageview_info={'page_url': 'http://example.foo/blahblah/blee'},
+        )
+        for _ in range(2):
+            resp = app.post_json_api(COUNTED_USAGE_URL, payload)
+            assert resp.status_code == 201
+        assert not mock_save.called
+        assert mock_redis.rpush.call_count == 2
+        assert mock_enqueue.call_count == 1
+        buffered = json.loads(mock_redis.rpush.call_args[0][1])
+        assert buffered['item_guid'] == 'zyxwv'
+        assert buffered['pageview_info'] == {'page_url': 'http://example.foo/blahblah/blee'}
+
+    def test_flush(self, mock_redis, mock_bulk):
+        preprint = PreprintFactory()
+        raw_usages = [
+            json.dumps({
+                'platform_iri': 'http://example.foo/',
+                'item_guid': preprint._id,
+                'session_id': session_id,
+                'user_is_authenticated': False,
+                'action_labels': ['view', 'web'],
+                'pageview_info': {'page_url': f'http://example.foo/{preprint._id}/'},
+                'timestamp': '1981-01-01T00:01:31Z',
+            })
+            for session_id in ('a', 'b')
+        ]
+        pipe = mock_redis.pipeline.return_value.__enter__.return_value
+        pipe.execute.side_effect = [(raw_usages, True), ([], True)]
+        with mock.patch('osf.models.Guid.load_many', wraps=Guid.load_many) as mock_load_many:
+            counted_usage_buffer.flush_counted_usage()
+        assert mock_load_many.call_count == 1
+        assert mock_bulk.call_count == 1
+        actions = mock_bulk.call_args[1]['body']
+        assert len(actions) == 4
+        assert actions[0]['index']['_index'] == CountedAuthUsage.get_index_name(datetime(1981, 1, 1, tzinfo=timezone.utc))
+        assert actions[0]['index']['_id'] != actions[2]['index']['_id']
+        for doc in (actions[1], actions[3]):
+            assert doc['item_type'] == 'preprint'
+            assert doc['provider_id'] == preprint.provider._id
+            assert doc['pageview_info']['page_path'] == f'/{preprint._id}'
+
+    def _raw_usages(self, item_guid, *timestamps):
+        return [
+            json.dumps({
+                'platform_iri': 'http://example.foo/',
+                'item_guid': item_guid,
+                'session_id': str(session_id),
+                'user_is_authenticated': False,
+                'action_labels': ['view'],
+                'timestamp': timestamp,
+            })
+            for session_id, timestamp in enumerate(timestamps)
+        ]
+
+    def test_failed_flush_dead_letters_bad_usage(self, mock_redis, mock_bulk):
+        preprint = PreprintFactory()
+        raw_usages = self._raw_usages(preprint._id, '1981-01-01T00:01:31Z', 'not a time', '1981-01-01T00:01:31Z')
+        pipe = mock_redis.pipeline.return_value.__enter__.return_value
+        pipe.execute.side_effect = [(raw_usages, True), ([], True)]
+        counted_usage_buffer.flush_counted_usage()
+        # the good usages are saved together, the bad one is set aside
+        assert mock_bulk.call_count == 1
+        actions = mock_bulk.call_args[1]['body']
+        assert len(actions) == 4
+        assert actions[0]['index']['_id'] != actions[2]['index']['_id']
+        mock_redis.rpush.assert_called_once_with(counted_usage_buffer.DEAD_LETTER_KEY, raw_usages[1])
+        assert not mock_redis.lpush.called
+
+    def test_rejected_documents_are_dead_lettered(self, mock_redis, mock_bulk):
+        preprint = PreprintFactory()
+        raw_usages = self._raw_usages(preprint._id, '1981-01-01T00:01:31Z', '1981-01-01T00:02:31Z')
+        mock_bulk.return_value = {'errors': True, 'items': [
+            {'index': {'status': 201}},
+            {'index': {'status': 400, 'error': {'type': 'mapper_parsing_exception'}}},
+        ]}
+        pipe = mock_redis.pipeline.return_value.__enter__.return_value
+        pipe.execute.side_effect = [(raw_usages, True), ([], True)]
+        counted_usage_buffer.flush_counted_usage()
+        mock_redis.rpush.assert_called_once_with(counted_usage_buffer.DEAD_LETTER_KEY, raw_usages[1])
+        assert not mock_redis.lpush.called
+
+    def test_unreachable_elasticsearch_keeps_usages(self, mock_redis, mock_bulk):
+        preprint = PreprintFactory()
+        raw_usages = self._raw_usages(preprint._id, '1981-01-01T00:01:31Z', '1981-01-01T00:02:31Z')
+        mock_bulk.side_effect = ElasticConnectionError('N/A', 'down', None)
+        pipe = mock_redis.pipeline.return_value.__enter__.return_value
+        pipe.execute.side_effect = [(raw_usages, True), (raw_usages, True)]
+        counted_usage_buffer.flush_counted_usage()
+        # the batch goes back to the front of the buffer and the flush stops there
+        assert pipe.execute.call_count == 1
+        mock_redis.lpush.assert_called_once_with(counted_usage_buffer.BUFFER_KEY, *reversed(raw_usages))
+        assert not mock_redis.rpush.called
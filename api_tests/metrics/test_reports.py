@@ -83,6 +83,31 @@ class TestMetricsReports:
         assert resp.headers['Content-Type'] == 'text/csv; charset=utf-8'
         assert resp.unicode_body == CSV_REPORTS
 
+    @mock.patch('api.metrics.utils.SEARCH_PAGE_SIZE', 1)
+    def test_recent_reports_streamed_by_page(self, app, mock_domain, mock_search):
+        mock_search.side_effect = [
+            {'hits': {'hits': [
+                {'_id': 'hi-by', '_source': {'report_date': '1234-12-12', 'hello': 'goodbye'}, 'sort': ['1234-12-12', 'hi-by']},
+            ]}},
+            {'hits': {'hits': [
+                {'_id': 'doof', '_source': {'report_date': '1234-12-11', 'hello': 'upwa'}, 'sort': ['1234-12-11', 'doof']},
+            ]}},
+            {'hits': {'hits': []}},
+        ]
+        resp = app.get('/_/metrics/reports/user_summary/recent/?format=csv')
+        assert resp.status_code == 200
+        assert resp.headers['Content-Type'] == 'text/csv; charset=utf-8'
+        assert resp.unicode_body == CSV_REPORTS
+        assert mock_search.call_count == 3
+        _, second_search_kwargs = mock_search.call_args_list[1]
+        assert second_search_kwargs['body']['search_after'] == ['1234-12-12', 'hi-by']
+        assert second_search_kwargs['body']['size'] == 1
+
+    def test_recent_reports_none_found(self, app, mock_domain, mock_search):
+        mock_search.return_value = {'hits': {'hits': []}}
+        resp = app.get('/_/metrics/reports/user_summary/recent/?format=csv', expect_errors=True)
+        assert resp.status_code == 404
+
 
 TSV_REPORTS = '''report_date	hello
 1234-12-12	goodbye
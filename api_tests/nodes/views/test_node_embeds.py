@@ -155,3 +155,36 @@ class TestNodeEmbeds:
         res = app.get(url, auth=write_contrib_one.auth)
         assert res.status_code == 200
         assert res.json['data']['embeds']['contributors']['meta']['total_bibliographic'] == 3
+
+    def test_node_list_embeds_contributors_batched(
+            self, app, user, write_contrib_one, root_node, child_one, child_two):
+        url = '/{}nodes/{}/children/?version=2.1&embed=contributors'.format(
+            API_BASE, root_node._id)
+        res = app.get(url, auth=user.auth)
+        assert res.status_code == 200
+
+        embedded = {
+            node['id']: {
+                contrib['id'] for contrib in node['embeds']['contributors']['data']
+            } for node in res.json['data']
+        }
+        # contributors fetched for the whole page are split back out per node
+        assert embedded[child_one._id] == {
+            f'{child_one._id}-{contrib._id}' for contrib in child_one.contributors
+        }
+        assert embedded[child_two._id] == {f'{child_two._id}-{user._id}'}
+        for node in res.json['data']:
+            assert node['embeds']['contributors']['meta']['total'] == len(embedded[node['id']])
+
+    def test_node_list_embeds_contributors_only_visible_children(
+            self, app, write_contrib_one, root_node, child_one, child_two):
+        url = f'/{API_BASE}nodes/{root_node._id}/children/?embed=contributors'
+        res = app.get(url, auth=write_contrib_one.auth)
+        assert res.status_code == 200
+        ids = [node['id'] for node in res.json['data']]
+        assert child_one._id in ids
+        assert child_two._id not in ids
+        node = next(node for node in res.json['data'] if node['id'] == child_one._id)
+        assert {contrib['id'] for contrib in node['embeds']['contributors']['data']} == {
+            f'{child_one._id}-{contrib._id}' for contrib in child_one.contributors
+        }
@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict
+
+import gevent
+from celery import group
+from gevent.pool import Pool
+
+from framework import sentry
+from website import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+
+
+def task_name(task):
+    """Best-effort readable name for a queued partial or celery signature"""
+    if isinstance(getattr(task, 'task', None), str):
+        return task.task
+    func = getattr(task, 'func', task)
+    return f'{getattr(func, "__module__", "")}.{getattr(func, "__qualname__", repr(func))}'
+
+
+class PostcommitStats:
+    """Thread-safe per-task counters: calls, errors, timeouts, tasks not started and wall time in seconds"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {'count': 0, 'errors': 0, 'timeouts': 0, 'not_started': 0, 'total_time': 0.0, 'max_time': 0.0})
+
+    def record(self, name, elapsed=None, error=False, timeout=False, not_started=False):
+        with self._lock:
+            stat = self._stats[name]
+            if not_started:
+                stat['not_started'] += 1
+                return
+            if timeout:
+                # The task keeps running and is counted again when it finishes
+                stat['timeouts'] += 1
+                return
+            stat['count'] += 1
+            stat['errors'] += int(error)
+            if elapsed is not None:
+                stat['total_time'] += elapsed
+                stat['max_time'] = max(stat['max_time'], elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(stat) for name, stat in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class PostcommitReport:
+    """Outcome of running one request's postcommit queue"""
+
+    def __init__(self):
+        self.completed = []
+        self.failed = []
+        self.timed_out = []
+        self.not_started = []
+        self.published = 0
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not (self.failed or self.timed_out or self.not_started)
+
+
+class PostcommitExecutor:
+    """Runs postcommit work for every request in the process.
+
+    Functions are spawned on a bounded greenlet pool, so concurrent requests share `size`
+    database connections instead of each opening their own pool. Gevent pools belong to a
+    single hub, so there is one pool per hub (i.e. per OS thread); under a monkey-patched
+    gevent server that is a single pool for the whole process. A request waits at most
+    `deadline` seconds, including the time spent waiting for a free slot; tasks still
+    running are reported, not killed, and tasks that never got a slot are reported as
+    not started. Celery signatures are published to the broker together as one group.
+    """
+
+    def __init__(self, size, deadline):
+        self.size = size
+        self.deadline = deadline
+        self.stats = PostcommitStats()
+        self._pools = weakref.WeakKeyDictionary()
+        self._pools_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        """The pool for the calling thread's hub, created on first use"""
+        hub = gevent.get_hub()
+        with self._pools_lock:
+            pool = self._pools.get(hub)
+            if pool is None:
+                pool = self._pools[hub] = Pool(self.size)
+            return pool
+
+    def _timed(self, name, func):
+        def run():
+            start = time.monotonic()
+            try:
+                func()
+            except Exception as e:
+                self.stats.record(name, time.monotonic() - start, error=True)
+                logger.exception(f'Postcommit task {name} failed')
+                sentry.log_exception(e, skip_session=True)
+                return e
+            self.stats.record(name, time.monotonic() - start)
+            return None
+        return run
+
+    def run(self, funcs, report=None, raise_errors=False):
+        """Spawn `funcs` on the pool and wait for them until the deadline.
+
+        :param funcs: iterable of zero-argument callables
+        :param raise_errors: re-raise the first task exception once every task is
+            done or out of time, e.g. under test or in debug mode
+        :return PostcommitReport:
+        """
+        report = report or PostcommitReport()
+        start = time.monotonic()
+        pool = self.pool
+        greenlets = {}
+        for func in funcs:
+            name = task_name(func)
+            remaining = self.deadline - (time.monotonic() - start)
+            if report.not_started or not pool.wait_available(timeout=max(remaining, 0)):
+                report.not_started.append(name)
+                self.stats.record(name, not_started=True)
+                continue
+            greenlets[pool.spawn(self._timed(name, func))] = name
+        remaining = self.deadline - (time.monotonic() - start)
+        gevent.joinall(list(greenlets), timeout=max(remaining, 0))
+
+        errors = []
+        for greenlet, name in greenlets.items():
+            if not greenlet.ready():
+                report.timed_out.append(name)
+                self.stats.record(name, timeout=True)
+            elif greenlet.value is None:
+                report.completed.append(name)
+            else:
+                report.failed.append(name)
+                errors.append(greenlet.value)
+
+        report.elapsed = time.monotonic() - start
+        if report.timed_out:
+            logger.warning(
+                f'Postcommit deadline of {self.deadline}s exceeded after {report.elapsed:.2f}s; '
+                f'still running: {", ".join(report.timed_out)}'
+            )
+        if report.not_started:
+            logger.error(
+                f'Postcommit pool full for {self.deadline}s; '
+                f'not started: {", ".join(report.not_started)}'
+            )
+        if raise_errors and errors:
+            raise errors[0]
+        return report
+
+    def publish(self, signatures, report=None, raise_errors=False):
+        """Publish celery `signatures` to the broker as a single group"""
+        report = report or PostcommitReport()
+        signatures = list(signatures)
+        if not signatures:
+            return report
+        start = time.monotonic()
+        try:
+            group(signatures).apply_async()
+        except Exception as e:
+            for signature in signatures:
+                self.stats.record(task_name(signature), error=True)
+                report.failed.append(task_name(signature))
+            logger.exception('Failed to publish postcommit celery tasks')
+            sentry.log_exception(e, skip_session=True)
+            if raise_errors:
+                raise
+            return report
+        elapsed = time.monotonic() - start
+        for signature in signatures:
+            self.stats.record(task_name(signature), elapsed / len(signatures))
+        report.published += len(signatures)
+        return report
+
+
+def get_executor():
+    """Return the process-wide executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = PostcommitExecutor(
+                    size=settings.POSTCOMMIT_POOL_SIZE,
+                    deadline=settings.POSTCOMMIT_DEADLINE,
+                )
+    return _executor
+
+
+def get_postcommit_stats():
+    return get_executor().stats.snapshot()
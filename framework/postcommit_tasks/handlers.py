@@ -9,9 +9,9 @@ import os
 
 from celery.canvas import Signature
 from celery.local import PromiseProxy
-from gevent.pool import Pool
 from flask import current_app, has_app_context
 
+from framework.postcommit_tasks.executor import get_executor, PostcommitReport
 from website import settings
 
 _local = threading.local()
@@ -37,18 +37,20 @@ def postcommit_after_request(response, base_status_error_code=500):
         _local.postcommit_celery_queue = OrderedDict()
         return response
     try:
+        executor = get_executor()
+        report = PostcommitReport()
+        # Surface task errors in the response under test and in debug mode
+        raise_errors = settings.DEBUG_MODE or (has_app_context() and current_app.config.get('TESTING', False))
         if postcommit_queue():
-            number_of_threads = 30  # one db connection per greenlet, let's share
-            pool = Pool(number_of_threads)
-            for func in postcommit_queue().values():
-                pool.spawn(func)
-            pool.join(timeout=5.0, raise_error=True)  # 5 second timeout and reraise exceptions
+            executor.run(postcommit_queue().values(), report=report, raise_errors=raise_errors)
 
         if postcommit_celery_queue():
             if settings.USE_CELERY:
-                for task_dict in postcommit_celery_queue().values():
-                    task = Signature.from_dict(task_dict)
-                    task.apply_async()
+                executor.publish(
+                    (Signature.from_dict(task_dict) for task_dict in postcommit_celery_queue().values()),
+                    report=report,
+                    raise_errors=raise_errors,
+                )
             else:
                 for task in postcommit_celery_queue().values():
                     task()
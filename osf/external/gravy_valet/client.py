@@ -0,0 +1,195 @@
+"""The HTTP layer under `request_helpers`: how signed requests actually reach GravyValet.
+
+* one pooled `requests.Session` per process, so connections to GravyValet are kept alive
+  and reused rather than opened for every request. The session is shared by every user,
+  so it never stores cookies;
+* successful GET responses are cached in django's cache for `GRAVYVALET_CACHE_TIMEOUT`
+  seconds (0 turns caching off), keyed on the url (which names the addon type) and the
+  requesting user, requested resource and permissions the request was signed with. Any
+  other request on a resource moves that resource on to fresh cache keys;
+* `send_many` sends a batch of requests (e.g. one per addon type) concurrently;
+* per-endpoint request counts, errors, cache hits and latency are kept in `stats`.
+
+Requests are signed by the caller (signing may touch the database); only sending them
+happens on the shared threads.
+"""
+import hashlib
+import http.cookiejar
+import logging
+import re
+import threading
+import time
+import typing
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from website import settings
+from . import auth_helpers
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_session = None
+_executor = None
+
+# Signed headers that decide what GravyValet responds with
+_CACHE_SCOPE_HEADERS = (
+    auth_helpers.USER_HEADER,
+    auth_helpers.RESOURCE_HEADER,
+    auth_helpers.PERMISSIONS_HEADER,
+)
+_ID_SEGMENT = re.compile(r'/(?!v\d+(?=/|$))[^/]*\d[^/]*(?=/|$)')  # any segment with a digit, except the api version
+
+
+class GVRequest(typing.NamedTuple):
+    method: str
+    url: str
+    headers: dict
+    params: dict | None = None
+    json_data: dict | None = None
+
+
+class GVRequestStats:
+    """Thread-safe per-endpoint counters: requests, errors, cache hits and wall time in seconds"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {'count': 0, 'errors': 0, 'cache_hits': 0, 'total_time': 0.0, 'max_time': 0.0})
+
+    def record(self, endpoint, elapsed=None, error=False, cache_hit=False):
+        with self._lock:
+            stat = self._stats[endpoint]
+            if cache_hit:
+                stat['cache_hits'] += 1
+                return
+            stat['count'] += 1
+            stat['errors'] += int(error)
+            if elapsed is not None:
+                stat['total_time'] += elapsed
+                stat['max_time'] = max(stat['max_time'], elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(stat) for endpoint, stat in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+stats = GVRequestStats()
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                # Never carry one response's cookies over to another user's request
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_maxsize=settings.GRAVYVALET_POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.GRAVYVALET_FANOUT_WORKERS,
+                    thread_name_prefix='gravyvalet',
+                )
+    return _executor
+
+
+def endpoint_name(method, url):
+    """e.g. 'GET /v1/configured-storage-addons/{pk}' -- ids are folded so stats group by endpoint"""
+    return f'{method} {_ID_SEGMENT.sub("/{pk}", urlparse(url).path)}'
+
+
+def send(gv_request: GVRequest) -> requests.Response | None:
+    """Send a signed request, returning the response (or None if GravyValet can't be reached)"""
+    endpoint = endpoint_name(gv_request.method, gv_request.url)
+    cache_key = _cache_key(gv_request)
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            stats.record(endpoint, cache_hit=True)
+            return _rebuild_response(cached)
+    start = time.monotonic()
+    try:
+        response = get_session().request(
+            method=gv_request.method,
+            url=gv_request.url,
+            headers=gv_request.headers,
+            params=gv_request.params,
+            json=gv_request.json_data,
+        )
+    except RequestException as e:
+        stats.record(endpoint, time.monotonic() - start, error=True)
+        logger.error(f'Cannot reach GravyValet: {e}')
+        return None
+    elapsed = time.monotonic() - start
+    stats.record(endpoint, elapsed, error=not response.ok)
+    logger.debug(f'{endpoint}: {response.status_code} in {elapsed * 1000:.0f}ms')
+    if not response.ok:
+        # log error to Sentry
+        logger.error(f'GV request failed with status code {response.status_code}: {response.content}')
+    elif cache_key is not None:
+        cache.set(cache_key, _freeze_response(response), settings.GRAVYVALET_CACHE_TIMEOUT)
+    if gv_request.method != 'GET':
+        forget_resource(gv_request.headers.get(auth_helpers.RESOURCE_HEADER))
+    return response
+
+
+def send_many(gv_requests: typing.Iterable[GVRequest]) -> list[requests.Response | None]:
+    """Send requests concurrently, returning their responses in the same order"""
+    gv_requests = list(gv_requests)
+    if len(gv_requests) < 2:
+        return [send(gv_request) for gv_request in gv_requests]
+    return list(_get_executor().map(send, gv_requests))
+
+
+def forget_resource(resource_iri):
+    """Stop serving cached responses about a resource (e.g. after one of its addons changed)"""
+    if resource_iri and settings.GRAVYVALET_CACHE_TIMEOUT:
+        # A new generation (never reused) moves the resource on to fresh keys; old entries expire
+        cache.set(_generation_key(resource_iri), time.time_ns(), settings.GRAVYVALET_CACHE_TIMEOUT * 2)
+
+
+def _generation_key(resource_iri):
+    return f'osf.gravy_valet:generation:{resource_iri}'
+
+
+def _cache_key(gv_request):
+    if gv_request.method != 'GET' or not settings.GRAVYVALET_CACHE_TIMEOUT:
+        return None
+    resource_iri = gv_request.headers.get(auth_helpers.RESOURCE_HEADER)
+    generation = cache.get(_generation_key(resource_iri), 0) if resource_iri else 0
+    request_url = requests.Request('GET', gv_request.url, params=gv_request.params).prepare().url
+    scope = [gv_request.headers.get(header) or '' for header in _CACHE_SCOPE_HEADERS]
+    digest = hashlib.sha256('\n'.join([request_url, *scope, str(generation)]).encode()).hexdigest()
+    return f'osf.gravy_valet:response:{digest}'
+
+
+def _freeze_response(response):
+    return (response.status_code, response.content, dict(response.headers), response.url)
+
+
+def _rebuild_response(frozen):
+    response = requests.Response()
+    response.status_code, response._content, headers, response.url = frozen
+    response.headers.update(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
@@ -4,11 +4,9 @@ import logging
 import typing
 from urllib.parse import urlencode, urljoin, urlparse, urlunparse
 
-import requests
-from requests.exceptions import RequestException
-
 from website import settings
 from . import auth_helpers
+from . import client as gv_client
 
 logger = logging.getLogger(__name__)
 
@@ -99,24 +97,20 @@ def iterate_accounts_for_user(requesting_user, addon_type=None):  # -> typing.It
     )
     if not user_result:
         return None
-    if not addon_type or addon_type == AddonType.STORAGE:
-        yield from iterate_gv_results(
-            endpoint_url=user_result.get_related_link('authorized_storage_accounts'),
-            requesting_user=requesting_user,
-            params={'include': f'{ACCOUNT_EXTERNAL_STORAGE_SERVICE_PATH}'}
-        )
-    if not addon_type or addon_type == AddonType.CITATION:
-        yield from iterate_gv_results(
-            endpoint_url=user_result.get_related_link('authorized_citation_accounts'),
-            requesting_user=requesting_user,
-            params={'include': f'{ACCOUNT_EXTERNAL_CITATION_SERVICE_PATH}'}
-        )
-    if not addon_type or addon_type == AddonType.COMPUTING:
-        yield from iterate_gv_results(
-            endpoint_url=user_result.get_related_link('authorized_computing_accounts'),
-            requesting_user=requesting_user,
-            params={'include': f'{ACCOUNT_EXTERNAL_COMPUTING_SERVICE_PATH}'}
-        )
+    related_links = {
+        AddonType.STORAGE: ('authorized_storage_accounts', ACCOUNT_EXTERNAL_STORAGE_SERVICE_PATH),
+        AddonType.CITATION: ('authorized_citation_accounts', ACCOUNT_EXTERNAL_CITATION_SERVICE_PATH),
+        AddonType.COMPUTING: ('authorized_computing_accounts', ACCOUNT_EXTERNAL_COMPUTING_SERVICE_PATH),
+    }
+    yield from iterate_many_gv_results([
+        {
+            'endpoint_url': user_result.get_related_link(relationship_name),
+            'requesting_user': requesting_user,
+            'params': {'include': include_path},
+        }
+        for _addon_type, (relationship_name, include_path) in related_links.items()
+        if not addon_type or addon_type == _addon_type
+    ])
 
 
 def iterate_addons_for_resource(requested_resource, requesting_user, addon_type=None, auth=None):  # -> typing.Iterator[JSONAPIResultEntry]
@@ -130,30 +124,22 @@ def iterate_addons_for_resource(requested_resource, requesting_user, addon_type=
     )
     if not resource_result:
         return None
-    if not addon_type or addon_type == AddonType.STORAGE:
-        yield from iterate_gv_results(
-            endpoint_url=resource_result.get_related_link('configured_storage_addons'),
-            requesting_user=requesting_user,
-            requested_resource=requested_resource,
-            params={'include': f'{ADDON_EXTERNAL_STORAGE_SERVICE_PATH},{ACCOUNT_OWNER_PATH}'},
-            auth=auth,
-        )
-    if not addon_type or addon_type == AddonType.CITATION:
-        yield from iterate_gv_results(
-            endpoint_url=resource_result.get_related_link('configured_citation_addons'),
-            requesting_user=requesting_user,
-            requested_resource=requested_resource,
-            params={'include': f'{ADDON_EXTERNAL_CITATIONS_SERVICE_PATH},{ACCOUNT_OWNER_PATH}'},
-            auth=auth,
-        )
-    if not addon_type or addon_type == AddonType.COMPUTING:
-        yield from iterate_gv_results(
-            endpoint_url=resource_result.get_related_link('configured_computing_addons'),
-            requesting_user=requesting_user,
-            requested_resource=requested_resource,
-            params={'include': f'{ADDON_EXTERNAL_COMPUTING_SERVICE_PATH},{ACCOUNT_OWNER_PATH}'},
-            auth=auth,
-        )
+    related_links = {
+        AddonType.STORAGE: ('configured_storage_addons', ADDON_EXTERNAL_STORAGE_SERVICE_PATH),
+        AddonType.CITATION: ('configured_citation_addons', ADDON_EXTERNAL_CITATIONS_SERVICE_PATH),
+        AddonType.COMPUTING: ('configured_computing_addons', ADDON_EXTERNAL_COMPUTING_SERVICE_PATH),
+    }
+    yield from iterate_many_gv_results([
+        {
+            'endpoint_url': resource_result.get_related_link(relationship_name),
+            'requesting_user': requesting_user,
+            'requested_resource': requested_resource,
+            'params': {'include': f'{include_path},{ACCOUNT_OWNER_PATH}'},
+            'auth': auth,
+        }
+        for _addon_type, (relationship_name, include_path) in related_links.items()
+        if not addon_type or addon_type == _addon_type
+    ])
 
 
 def get_waterbutler_config(gv_addon_pk, requested_resource, requesting_user, addon_type):  # -> JSONAPIResultEntry
@@ -236,6 +222,23 @@ def iterate_gv_results(
         params=params,
         auth=auth
     )
+    yield from _iterate_response_results(response)
+
+
+def iterate_many_gv_results(requests_kwargs: typing.Iterable[dict]):  # -> typing.Iterator[JSONAPIResultEntry]
+    '''Like `iterate_gv_results` for each of several requests (given as its kwargs), sent concurrently.
+
+    Results are yielded in the order the requests were given.
+    '''
+    responses = gv_client.send_many([
+        _prepare_gv_request(**request_kwargs)
+        for request_kwargs in requests_kwargs
+    ])
+    for response in responses:
+        yield from _iterate_response_results(response)
+
+
+def _iterate_response_results(response):  # -> typing.Iterator[JSONAPIResultEntry]
     if not response:
         return
 
@@ -257,6 +260,27 @@ def _make_gv_request(
     auth=None,
 ):
     '''Generates HMAC-Signed auth headers and makes a request to GravyValet, returning the result.'''
+    return gv_client.send(_prepare_gv_request(
+        endpoint_url=endpoint_url,
+        requesting_user=requesting_user,
+        requested_resource=requested_resource,
+        request_method=request_method,
+        params=params,
+        json_data=json_data,
+        auth=auth,
+    ))
+
+
+def _prepare_gv_request(
+    endpoint_url: str,
+    requesting_user,
+    requested_resource=None,
+    request_method='GET',
+    params: dict = None,
+    json_data: dict = None,
+    auth=None,
+) -> gv_client.GVRequest:
+    '''Signs a request to GravyValet, to be sent by `gv_client`.'''
     full_url = urlunparse(urlparse(endpoint_url)._replace(query=urlencode(params or {})))
     auth_headers = auth_helpers.make_gravy_valet_hmac_headers(
         request_url=full_url,
@@ -268,16 +292,13 @@ def _make_gv_request(
         ) | {'content-type': 'application/vnd.api+json'}
     )
     assert not (request_method == 'GET' and json_data is not None)
-    try:
-        response = requests.request(url=endpoint_url, headers=auth_headers, params=params, method=request_method, json=json_data)
-    except RequestException as e:
-        logger.error(f"Cannot reach GravyValet: {e}")
-        return None
-    if not response.ok:
-        # log error to Sentry
-        logger.error(f"GV request failed with status code {response.status_code}: {response.content}")
-        pass
-    return response
+    return gv_client.GVRequest(
+        method=request_method,
+        url=endpoint_url,
+        headers=auth_headers,
+        params=params,
+        json_data=json_data,
+    )
 
 
 def get_gv_citation_url_list_for_project(auth, project, request=None, pid=None) -> dict:
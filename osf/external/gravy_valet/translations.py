@@ -44,13 +44,16 @@ def get_external_services(requesting_user):
     global _services
     if _services:
         return _services
-    _services = []
-    for addon_type in gv_requests.AddonType:
-        srv = [EphemeralAddonConfig(service) for service in gv_requests.iterate_gv_results(
-            endpoint_url=gv_requests.ACCOUNT_EXTERNAL_SERVICE_ENDPOINT.format(addon_type=addon_type),
-            requesting_user=requesting_user,
-        )]
-        _services += srv
+    _services = [
+        EphemeralAddonConfig(service)
+        for service in gv_requests.iterate_many_gv_results([
+            {
+                'endpoint_url': gv_requests.ACCOUNT_EXTERNAL_SERVICE_ENDPOINT.format(addon_type=addon_type),
+                'requesting_user': requesting_user,
+            }
+            for addon_type in gv_requests.AddonType
+        ])
+    ]
     return _services
 
 @dataclasses.dataclass
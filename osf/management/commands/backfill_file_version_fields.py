@@ -0,0 +1,78 @@
+"""Record the latest version, first version's created and version count on files saved before they were maintained.
+
+A batch of file ids is one statement. Safe to rerun (rows whose stored values are already
+right are left alone); until a file's fields are recorded, reads fall back to its versions.
+"""
+import datetime
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from osf.models import BaseFileNode
+from osf.models.files import RECORD_VERSION_FIELDS_SQL
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10000
+
+
+def backfill_file_version_fields(batch_size=BATCH_SIZE, start_id=0, dry_run=False):
+    file_ids = BaseFileNode.objects.order_by('id').values_list('id', flat=True)
+    after_id = start_id
+    updated = 0
+    while True:
+        batch = list(file_ids.filter(id__gt=after_id)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(RECORD_VERSION_FIELDS_SQL, {
+                'after_id': after_id,
+                'through_id': batch[-1],
+            })
+            updated += cursor.rowcount
+            if dry_run:
+                transaction.set_rollback(True)
+        after_id = batch[-1]
+        logger.info(f'{"[DRY RUN] " if dry_run else ""}Recorded version fields on {updated} files, through file id {after_id}')
+    return updated
+
+
+class Command(BaseCommand):
+    help = '''Records the latest version, first version's created and version count on files
+    that predate them being maintained. Resume an interrupted run with --start_id.'''
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--dry_run',
+            action='store_true',
+            dest='dry_run',
+            help='Run queries but roll back each batch',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=BATCH_SIZE,
+            help='How many file ids to update at a time',
+        )
+        parser.add_argument(
+            '--start_id',
+            type=int,
+            default=0,
+            help='Only update files whose id is greater than this',
+        )
+
+    def handle(self, *args, **options):
+        script_start_time = datetime.datetime.now()
+        logger.info(f'Script started time: {script_start_time}')
+
+        backfill_file_version_fields(
+            batch_size=options['batch_size'],
+            start_id=options['start_id'],
+            dry_run=options['dry_run'],
+        )
+
+        script_finish_time = datetime.datetime.now()
+        logger.info(f'Script finished time: {script_finish_time}')
+        logger.info(f'Run time {script_finish_time - script_start_time}')
@@ -0,0 +1,101 @@
+"""Store materialized paths for osfstorage files and folders saved before they were maintained.
+
+Walks down from each osfstorage root folder, so a batch of roots is one statement. Safe to
+rerun (rows whose stored path is already right are left alone); once it has finished, turn on
+the `osfstorage_stored_materialized_paths` switch.
+"""
+import datetime
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from addons.osfstorage.models import OsfStorageFile, OsfStorageFolder
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+BACKFILL_MATERIALIZED_PATHS = """
+    WITH RECURSIVE paths_cte(id, gen_path) AS (
+      SELECT
+        T.id,
+        '/' :: TEXT
+      FROM osf_basefilenode AS T
+      WHERE T.type = %(folder_type)s AND T.is_root AND T.id > %(after_id)s AND T.id <= %(through_id)s
+      UNION ALL
+      SELECT
+        T.id,
+        R.gen_path || T.name || CASE WHEN T.type = %(folder_type)s THEN '/' ELSE '' END
+      FROM paths_cte AS R
+        JOIN osf_basefilenode AS T ON T.parent_id = R.id
+      WHERE T.type IN %(types)s
+    )
+    UPDATE osf_basefilenode AS B
+    SET _materialized_path = P.gen_path
+    FROM paths_cte AS P
+    WHERE B.id = P.id AND B._materialized_path IS DISTINCT FROM P.gen_path;
+"""
+
+
+def backfill_osfstorage_materialized_paths(batch_size=BATCH_SIZE, start_id=0, dry_run=False):
+    root_ids = OsfStorageFolder.objects.filter(is_root=True).order_by('id').values_list('id', flat=True)
+    after_id = start_id
+    updated = 0
+    while True:
+        batch = list(root_ids.filter(id__gt=after_id)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(BACKFILL_MATERIALIZED_PATHS, {
+                'folder_type': OsfStorageFolder._typedmodels_type,
+                'types': (OsfStorageFile._typedmodels_type, OsfStorageFolder._typedmodels_type),
+                'after_id': after_id,
+                'through_id': batch[-1],
+            })
+            updated += cursor.rowcount
+            if dry_run:
+                transaction.set_rollback(True)
+        after_id = batch[-1]
+        logger.info(f'{"[DRY RUN] " if dry_run else ""}Stored {updated} materialized paths, through root folder id {after_id}')
+    return updated
+
+
+class Command(BaseCommand):
+    help = '''Stores materialized paths for osfstorage files and folders that predate them being
+    maintained on save. Resume an interrupted run with --start_id.'''
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--dry_run',
+            action='store_true',
+            dest='dry_run',
+            help='Run queries but roll back each batch',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=BATCH_SIZE,
+            help='How many root folders (with everything below them) to update at a time',
+        )
+        parser.add_argument(
+            '--start_id',
+            type=int,
+            default=0,
+            help='Only update trees whose root folder id is greater than this',
+        )
+
+    def handle(self, *args, **options):
+        script_start_time = datetime.datetime.now()
+        logger.info(f'Script started time: {script_start_time}')
+
+        backfill_osfstorage_materialized_paths(
+            batch_size=options['batch_size'],
+            start_id=options['start_id'],
+            dry_run=options['dry_run'],
+        )
+
+        script_finish_time = datetime.datetime.now()
+        logger.info(f'Script finished time: {script_finish_time}')
+        logger.info(f'Run time {script_finish_time - script_start_time}')
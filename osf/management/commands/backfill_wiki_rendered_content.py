@@ -0,0 +1,86 @@
+"""Store rendered html and text on wiki versions saved before renders were stored.
+
+Until a version is rendered, reads render it on the fly. Pass --rerender to render every
+version again, e.g. after changing `WIKI_WHITELIST` or the markdown extensions.
+"""
+import datetime
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from addons.wiki.models import WikiVersion
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def backfill_wiki_rendered_content(batch_size=BATCH_SIZE, start_id=0, rerender=False, dry_run=False):
+    versions = WikiVersion.objects.select_related('wiki_page__node').order_by('id')
+    if not rerender:
+        versions = versions.filter(rendered_text__isnull=True)
+    after_id = start_id
+    rendered = 0
+    while True:
+        batch = list(versions.filter(id__gt=after_id)[:batch_size])
+        if not batch:
+            break
+        for version in batch:
+            version.store_renders()
+        with transaction.atomic():
+            # Not `save`, which would reindex the node and spam check the version
+            WikiVersion.objects.bulk_update(batch, ['rendered_html', 'rendered_text'])
+            rendered += len(batch)
+            if dry_run:
+                transaction.set_rollback(True)
+        after_id = batch[-1].id
+        logger.info(f'{"[DRY RUN] " if dry_run else ""}Rendered {rendered} wiki versions, through wiki version id {after_id}')
+    return rendered
+
+
+class Command(BaseCommand):
+    help = '''Stores rendered html and text on wiki versions that predate renders being stored
+    on save. Resume an interrupted run with --start_id.'''
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--dry_run',
+            action='store_true',
+            dest='dry_run',
+            help='Run queries but roll back each batch',
+        )
+        parser.add_argument(
+            '--rerender',
+            action='store_true',
+            dest='rerender',
+            help='Render every wiki version again, not only those never rendered',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=BATCH_SIZE,
+            help='How many wiki versions to render at a time',
+        )
+        parser.add_argument(
+            '--start_id',
+            type=int,
+            default=0,
+            help='Only render wiki versions whose id is greater than this',
+        )
+
+    def handle(self, *args, **options):
+        script_start_time = datetime.datetime.now()
+        logger.info(f'Script started time: {script_start_time}')
+
+        backfill_wiki_rendered_content(
+            batch_size=options['batch_size'],
+            start_id=options['start_id'],
+            rerender=options['rerender'],
+            dry_run=options['dry_run'],
+        )
+
+        script_finish_time = datetime.datetime.now()
+        logger.info(f'Script finished time: {script_finish_time}')
+        logger.info(f'Run time {script_finish_time - script_start_time}')
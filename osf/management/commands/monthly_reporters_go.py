@@ -1,8 +1,17 @@
+"""Run the monthly reporters for a month, in parallel and resumably.
+
+Each reporter's report kwargs are handed out in chunks of `REPORT_CHUNK_SIZE`, one
+`monthly_reporter_do_chunk` task per chunk, so chunks run in parallel and retry on their
+own. A `MonthlyReporterCheckpoint` per reporter and month records how far scheduling got
+(running again resumes after the last chunk handed out) and how many chunks have finished;
+chunks that ran out of retries are kept there for `--retry_failed`.
+"""
 import datetime
 import logging
+import time
 
 from django.core.management.base import BaseCommand
-from django.db import OperationalError as DjangoOperationalError
+from django.db import OperationalError as DjangoOperationalError, transaction
 from elasticsearch.exceptions import ConnectionError as ElasticConnectionError
 from psycopg2 import OperationalError as PostgresOperationalError
 
@@ -10,6 +19,7 @@ from framework.celery_tasks import app as celery_app
 import framework.sentry
 from osf.metrics.reporters import AllMonthlyReporters
 from osf.metrics.utils import YearMonth
+from osf.models import MonthlyReporterCheckpoint
 
 
 logger = logging.getLogger(__name__)
@@ -22,7 +32,12 @@ _CONTINUE_AFTER_ERRORS = (
 )
 
 @celery_app.task(name='management.commands.monthly_reporters_go')
-def monthly_reporters_go(yearmonth: str = '', reporter_key: str = ''):
+def monthly_reporters_go(
+    yearmonth: str = '',
+    reporter_key: str = '',
+    restart: bool = False,
+    retry_failed: bool = False,
+):
     _yearmonth = (
         YearMonth.from_str(yearmonth)
         if yearmonth
@@ -33,11 +48,19 @@ def monthly_reporters_go(yearmonth: str = '', reporter_key: str = ''):
         if reporter_key
         else _enum_names(AllMonthlyReporters)
     )
+    if restart:
+        MonthlyReporterCheckpoint.objects.filter(
+            reporter_key__in=_reporter_keys,
+            report_yearmonth=str(_yearmonth),
+        ).delete()
     for _reporter_key in _reporter_keys:
-        schedule_monthly_reporter.apply_async(kwargs={
-            'yearmonth': str(_yearmonth),
-            'reporter_key': _reporter_key,
-        })
+        if retry_failed:
+            _schedule_failed_chunks(str(_yearmonth), _reporter_key)
+        else:
+            schedule_monthly_reporter.apply_async(kwargs={
+                'yearmonth': str(_yearmonth),
+                'reporter_key': _reporter_key,
+            })
 
 
 @celery_app.task(name='management.commands.schedule_monthly_reporter')
@@ -46,20 +69,32 @@ def schedule_monthly_reporter(
     reporter_key: str,
     continue_after: dict | None = None,
 ):
+    _checkpoint, _ = MonthlyReporterCheckpoint.objects.get_or_create(
+        reporter_key=reporter_key,
+        report_yearmonth=yearmonth,
+    )
+    if continue_after is None:
+        if _checkpoint.scheduling_done:
+            logger.info(f'{_checkpoint.progress_message()} (already scheduled; restart to run again)')
+            return
+        continue_after = _checkpoint.continue_after  # resume an interrupted run
     _reporter = _get_reporter(reporter_key, yearmonth)
+    _chunk = []
     _last_kwargs = None
     try:
         for _kwargs in _reporter.iter_report_kwargs(continue_after=continue_after):
-            monthly_reporter_do.apply_async(kwargs={
-                'yearmonth': yearmonth,
-                'reporter_key': reporter_key,
-                'report_kwargs': _kwargs,
-            })
-            _last_kwargs = _kwargs
+            _chunk.append(_kwargs)
+            if len(_chunk) >= _reporter.REPORT_CHUNK_SIZE:
+                _schedule_chunk(yearmonth, reporter_key, _chunk)
+                _last_kwargs = _chunk[-1]
+                _chunk = []
+        if _chunk:
+            _schedule_chunk(yearmonth, reporter_key, _chunk)
+        MonthlyReporterCheckpoint.objects.filter(pk=_checkpoint.pk).update(scheduling_done=True)
     except _CONTINUE_AFTER_ERRORS as _error:
         # let the celery task succeed but log the error
         framework.sentry.log_exception(_error)
-        # schedule another task to continue scheduling
+        # schedule another task to continue scheduling (from the start of the unscheduled chunk)
         if _last_kwargs is not None:
             schedule_monthly_reporter.apply_async(kwargs={
                 'yearmonth': yearmonth,
@@ -68,25 +103,52 @@ def schedule_monthly_reporter(
             })
 
 
+@celery_app.task(
+    bind=True,
+    name='management.commands.monthly_reporter_do_chunk',
+    autoretry_for=_CONTINUE_AFTER_ERRORS,
+    max_retries=5,
+    retry_backoff=True,
+)
+def monthly_reporter_do_chunk(self, reporter_key: str, yearmonth: str, report_kwargs_list: list[dict]):
+    _started = time.monotonic()
+    _reporter = _get_reporter(reporter_key, yearmonth)
+    _saved_count = 0
+    try:
+        for _report in _reporter.report_many(report_kwargs_list):
+            if _report is not None:
+                _save_report(_reporter, _report)
+                _saved_count += 1
+    except Exception as _error:
+        if self.request.retries >= self.max_retries or not isinstance(_error, _CONTINUE_AFTER_ERRORS):
+            MonthlyReporterCheckpoint.record_failed(reporter_key, yearmonth, report_kwargs_list)
+        raise
+    _seconds = time.monotonic() - _started
+    MonthlyReporterCheckpoint.record_done(reporter_key, yearmonth, _saved_count, _seconds)
+    logger.info(
+        f'{reporter_key} {yearmonth}: saved {_saved_count} reports'
+        f' from {len(report_kwargs_list)} report kwargs in {_seconds:.1f}s'
+    )
+    _checkpoint = MonthlyReporterCheckpoint.objects.filter(
+        reporter_key=reporter_key,
+        report_yearmonth=yearmonth,
+    ).first()
+    if _checkpoint is not None:
+        logger.info(_checkpoint.progress_message())
+
+
 @celery_app.task(
     name='management.commands.monthly_reporter_do',
-    autoretry_for=(
-        DjangoOperationalError,
-        ElasticConnectionError,
-        PostgresOperationalError,
-    ),
+    autoretry_for=_CONTINUE_AFTER_ERRORS,
     max_retries=5,
     retry_backoff=True,
 )
 def monthly_reporter_do(reporter_key: str, yearmonth: str, report_kwargs: dict):
+    # one report per task; kept for tasks queued before chunking
     _reporter = _get_reporter(reporter_key, yearmonth)
     _report = _reporter.report(**report_kwargs)
     if _report is not None:
-        _report.report_yearmonth = _reporter.yearmonth
-        _report.save()
-        _followup_task = _reporter.followup_task(_report)
-        if _followup_task is not None:
-            _followup_task.apply_async()
+        _save_report(_reporter, _report)
 
 
 class Command(BaseCommand):
@@ -103,11 +165,23 @@ class Command(BaseCommand):
             default='',
             help='name of the reporter to run (default all)',
         )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='forget any earlier run for this month and schedule every report again',
+        )
+        parser.add_argument(
+            '--retry_failed',
+            action='store_true',
+            help='schedule again only the chunks of an earlier run that ran out of retries',
+        )
 
     def handle(self, *args, **kwargs):
         monthly_reporters_go(
             yearmonth=kwargs['yearmonth'],
             reporter_key=kwargs['reporter'].upper(),
+            restart=kwargs['restart'],
+            retry_failed=kwargs['retry_failed'],
         )
         self.stdout.write(self.style.SUCCESS(
             f'scheduling tasks for monthly reporter "{kwargs['reporter']}"...'
@@ -116,6 +190,44 @@ class Command(BaseCommand):
         ))
 
 
+def _schedule_chunk(yearmonth: str, reporter_key: str, report_kwargs_list: list[dict]):
+    monthly_reporter_do_chunk.apply_async(kwargs={
+        'yearmonth': yearmonth,
+        'reporter_key': reporter_key,
+        'report_kwargs_list': report_kwargs_list,
+    })
+    MonthlyReporterCheckpoint.record_scheduled(reporter_key, yearmonth, report_kwargs_list[-1])
+
+
+def _schedule_failed_chunks(yearmonth: str, reporter_key: str):
+    with transaction.atomic():
+        _checkpoint = (
+            MonthlyReporterCheckpoint.objects
+            .select_for_update()
+            .filter(reporter_key=reporter_key, report_yearmonth=yearmonth)
+            .first()
+        )
+        if _checkpoint is None or not _checkpoint.failed_chunks:
+            return
+        _failed_chunks = _checkpoint.failed_chunks
+        _checkpoint.failed_chunks = []
+        _checkpoint.save(update_fields=['failed_chunks', 'modified'])
+    for _report_kwargs_list in _failed_chunks:
+        monthly_reporter_do_chunk.apply_async(kwargs={
+            'yearmonth': yearmonth,
+            'reporter_key': reporter_key,
+            'report_kwargs_list': _report_kwargs_list,
+        })
+
+
+def _save_report(reporter, report):
+    report.report_yearmonth = reporter.yearmonth
+    report.save()
+    _followup_task = reporter.followup_task(report)
+    if _followup_task is not None:
+        _followup_task.apply_async()
+
+
 def _get_reporter(reporter_key: str, yearmonth: str):
     _reporter_class = AllMonthlyReporters[reporter_key].value
     return _reporter_class(YearMonth.from_str(yearmonth))
@@ -0,0 +1,54 @@
+import datetime
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from api.caching.tasks import reconcile_storage_usage
+from framework.celery_tasks import app as celery_app
+from osf.models import NodeStorageUsage
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+@celery_app.task(name='management.commands.reconcile_storage_usage')
+def reconcile_storage_usage_totals(dry_run=False, batch_size=BATCH_SIZE):
+    """Verify the running storage totals changed since they were last reconciled, plus any never reconciled, against a full recompute"""
+    node_ids = list(
+        NodeStorageUsage.objects.filter(
+            Q(reconciled__isnull=True) | Q(reconciled__lt=F('modified')),
+        ).values_list('node_id', flat=True)
+    )
+    logger.info(f'Reconciling storage usage for {len(node_ids)} nodes')
+    drifted = {}
+    for start in range(0, len(node_ids), batch_size):
+        drifted.update(reconcile_storage_usage(node_ids[start:start + batch_size], dry_run=dry_run))
+    logger.info(f'{len(drifted)} storage usage totals had drifted{" (dry run, not repaired)" if dry_run else ""}')
+    return drifted
+
+
+class Command(BaseCommand):
+    help = '''Verifies and repairs the persisted running storage usage totals changed since they were last reconciled'''
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry_run',
+            action='store_true',
+            dest='dry_run',
+            help='Report drift without repairing it',
+        )
+
+    def handle(self, *args, **options):
+        script_start_time = datetime.datetime.now()
+        logger.info(f'Script started time: {script_start_time}')
+
+        if options['dry_run']:
+            logger.info('DRY RUN')
+
+        reconcile_storage_usage_totals(dry_run=options['dry_run'])
+
+        script_finish_time = datetime.datetime.now()
+        logger.info(f'Script finished time: {script_finish_time}')
+        logger.info(f'Run time {script_finish_time - script_start_time}')
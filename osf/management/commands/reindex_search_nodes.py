@@ -0,0 +1,59 @@
+"""Resend node, component and registration documents to the search index in bulk."""
+import datetime
+import logging
+
+from django.core.management.base import BaseCommand
+
+from osf.models import AbstractNode
+from website.search.elastic_search import bulk_reindex_nodes
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+CHUNK_SIZE = 500
+
+
+def reindex_search_nodes(index=None, start_id=None, end_id=None, batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE):
+    """Reindex nodes with ids in [start_id, end_id]. The last id sent is logged so a failed run can be resumed."""
+    node_ids = AbstractNode.objects.order_by('id')
+    if start_id is not None:
+        node_ids = node_ids.filter(id__gte=start_id)
+    if end_id is not None:
+        node_ids = node_ids.filter(id__lte=end_id)
+    node_ids = list(node_ids.values_list('id', flat=True))
+    if not node_ids:
+        logger.info('No nodes to reindex')
+        return None
+    logger.info(f'Reindexing {len(node_ids)} nodes, ids {node_ids[0]} through {node_ids[-1]}')
+    stats = bulk_reindex_nodes(node_ids, index=index, batch_size=batch_size, chunk_size=chunk_size)
+    logger.info(f'Reindexed through node id {node_ids[-1]}')
+    return stats
+
+
+class Command(BaseCommand):
+    help = '''Rebuilds search documents for nodes, prefetching related rows in batches and
+    streaming them to elasticsearch without refreshing the index'''
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--index', type=str, default=None, help='Index to update; defaults to ELASTIC_INDEX')
+        parser.add_argument('--start-id', type=int, dest='start_id', default=None, help='First node id to reindex')
+        parser.add_argument('--end-id', type=int, dest='end_id', default=None, help='Last node id to reindex')
+        parser.add_argument('--batch-size', type=int, dest='batch_size', default=BATCH_SIZE, help='Nodes prefetched per batch')
+        parser.add_argument('--chunk-size', type=int, dest='chunk_size', default=CHUNK_SIZE, help='Documents per bulk request')
+
+    def handle(self, *args, **options):
+        script_start_time = datetime.datetime.now()
+        logger.info(f'Script started time: {script_start_time}')
+
+        reindex_search_nodes(
+            index=options['index'],
+            start_id=options['start_id'],
+            end_id=options['end_id'],
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+        )
+
+        script_finish_time = datetime.datetime.now()
+        logger.info(f'Script finished time: {script_finish_time}')
+        logger.info(f'Run time {script_finish_time - script_start_time}')
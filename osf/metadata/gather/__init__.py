@@ -1,6 +1,7 @@
 from .basket import Basket
+from .cache import GatherCache
 from .focus import Focus
-from .gatherer import gatherer as er
+from .gatherer import gatherer as er, prefetcher
 
 
-__all__ = ('Basket', 'Focus', 'er')
+__all__ = ('Basket', 'Focus', 'GatherCache', 'er', 'prefetcher')
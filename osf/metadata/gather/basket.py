@@ -6,8 +6,14 @@ import typing
 import rdflib
 
 from osf.metadata import rdfutils
+from .cache import GatherCache
 from .focus import Focus
-from .gatherer import get_gatherers, Gatherer
+from .gatherer import (
+    Gatherer,
+    get_focustype_gatherers,
+    get_gatherers,
+    get_prefetchers,
+)
 
 
 class Basket:
@@ -15,13 +21,22 @@ class Basket:
     gathered_metadata: rdflib.Graph  # heap of metadata already gathered.
     _gathertasks_done: set           # memory of gatherings already done.
     _known_focus_dict: dict
+    gather_cache: GatherCache        # gathered triples, maybe shared with other baskets.
 
-    def __init__(self, focus: Focus):
+    def __init__(self, focus: Focus, *, gather_cache: GatherCache | None = None):
         assert isinstance(focus, Focus)
         self.focus = focus
+        self._owns_gather_cache = (gather_cache is None)
+        self.gather_cache = (
+            GatherCache()
+            if self._owns_gather_cache
+            else gather_cache
+        )
         self.reset()  # start with an empty basket
 
     def reset(self):
+        if self._owns_gather_cache:
+            self.gather_cache.clear()
         self._gathertasks_done = set()
         self._known_focus_dict = {self.focus.iri: {self.focus}}
         self.gathered_metadata = rdfutils.contextualized_graph()
@@ -49,6 +64,39 @@ class Basket:
         '''
         self._do_gather(self.focus, predicate_map, include_defaults=include_defaults)
 
+    @classmethod
+    def pls_gather_many(cls, foci, predicate_map=None, *, include_defaults=True, gather_cache=None) -> list['Basket']:
+        '''gather metadata about many foci at once, returning a basket for each
+
+        @foci: iterable of Focus, all of the same rdftype
+        @predicate_map: same as for `pls_gather`, or None to gather nothing yet
+                        (but still prefetch for anything that may be gathered later)
+        @gather_cache: optional GatherCache shared by the returned baskets (default: a new one)
+
+        runs each relevant gatherer's prefetchers (see gather.prefetcher) once for
+        all the foci, so per-focus gathering finds related rows already loaded
+        '''
+        foci = list(foci)
+        if not foci:
+            return []
+        _rdftypes = {_focus.rdftype for _focus in foci}
+        assert len(_rdftypes) == 1, f'expected foci of one rdftype (got {_rdftypes})'
+        (_rdftype,) = _rdftypes
+        _gatherers = (
+            get_focustype_gatherers(_rdftype)
+            if predicate_map is None
+            else get_gatherers(_rdftype, predicate_map, include_focustype_defaults=include_defaults)
+        )
+        for _prefetch in get_prefetchers(_gatherers):
+            _prefetch(foci)
+        if gather_cache is None:
+            gather_cache = GatherCache()
+        _baskets = [cls(_focus, gather_cache=gather_cache) for _focus in foci]
+        if predicate_map is not None:
+            for _basket in _baskets:
+                _basket.pls_gather(predicate_map, include_defaults=include_defaults)
+        return _baskets
+
     def __getitem__(self, slice_or_arg) -> typing.Iterable[rdflib.term.Node]:
         '''convenience for getting values from the basket
 
@@ -130,7 +178,7 @@ class Basket:
         '''
         if (gatherer, focus) not in self._gathertasks_done:
             self._gathertasks_done.add((gatherer, focus))  # eager
-            yield from gatherer(focus)
+            yield from self.gather_cache.get_or_gather(gatherer, focus)
 
     def _add_focus_reference(self, focus: Focus):
         (
@@ -0,0 +1,83 @@
+'''a gather.GatherCache remembers what gatherers gathered, so baskets can share it.
+
+within one GatherCache, each (gatherer, focus) pair is gathered at most once per
+focus version -- give the same cache to many baskets (e.g. a batch of items that
+share creators and institutions) and shared foci are gathered only once.
+
+gatherers registered with `cacheable=True` promise their triples depend only on
+the focus itself, so their results are also kept in django's cache (keyed by
+focus iri, focustype, gatherer, and focus version) for reuse across requests.
+since the focus version is its `modified` timestamp, saving the focus moves on
+to a fresh cache key -- stale entries are never read, just left to expire.
+'''
+import logging
+import typing
+
+from django.core.cache import cache as django_cache
+
+from .focus import Focus
+from .gatherer import Gatherer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 60  # seconds to keep cacheable gatherer results in django's cache
+
+
+class GatherCache:
+    def __init__(self, *, timeout=DEFAULT_TIMEOUT):
+        self._timeout = timeout
+        self._gathered = {}  # (gatherer, focus) -> (focus version, list of triples)
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_gather(self, gatherer: Gatherer, focus: Focus) -> list[tuple]:
+        _version = focus.cache_version()
+        _key = (gatherer, focus)
+        _cached = self._gathered.get(_key)
+        if _cached is not None and _cached[0] == _version:
+            self.hits += 1
+            return _cached[1]
+        _triples = self._get_shared(gatherer, focus, _version)
+        if _triples is None:
+            self.misses += 1
+            _triples = list(gatherer(focus))
+            self._set_shared(gatherer, focus, _version, _triples)
+        else:
+            self.hits += 1
+        self._gathered[_key] = (_version, _triples)
+        return _triples
+
+    def clear(self):
+        self._gathered.clear()
+
+    ###
+    # private:
+
+    def _shared_key(self, gatherer, focus, version) -> typing.Optional[str]:
+        if not getattr(gatherer, 'cacheable', False) or version is None:
+            return None
+        return ':'.join((
+            'osf.metadata.gather',
+            gatherer.__module__,
+            gatherer.__qualname__,
+            str(focus.rdftype),
+            str(focus.iri),
+            str(version),
+        ))
+
+    def _get_shared(self, gatherer, focus, version):
+        _shared_key = self._shared_key(gatherer, focus, version)
+        if _shared_key is None:
+            return None
+        return django_cache.get(_shared_key)
+
+    def _set_shared(self, gatherer, focus, version, triples):
+        _shared_key = self._shared_key(gatherer, focus, version)
+        if _shared_key is None:
+            return
+        if any(isinstance(_obj, Focus) for (_, _, _obj) in triples):
+            # a Focus may carry a database model; keep those out of the shared cache
+            logger.warning(f'not caching {gatherer.__qualname__} results for {focus} (gathered a Focus)')
+            return
+        django_cache.set(_shared_key, triples, timeout=self._timeout)
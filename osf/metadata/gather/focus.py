@@ -33,5 +33,13 @@ class Focus:
     def __str__(self):
         return repr(self)
 
+    def cache_version(self):
+        '''a value that changes whenever metadata about this focus may have changed
+
+        gathered metadata is only shared between baskets (see gather.GatherCache) while
+        the version stays the same; None means "unversioned", never cached across requests
+        '''
+        return None
+
     def reference_triples(self) -> typing.Iterable[tuple[Node, Node, Node]]:
         yield self.iri, rdfutils.RDF.type, self.rdftype
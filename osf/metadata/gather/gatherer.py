@@ -23,10 +23,21 @@ GathererRegistry = dict[             # outer dict maps
 ]
 __gatherer_registry: GathererRegistry = {}
 
+# a "prefetcher" is a batched companion to one or more gatherers: given many foci
+# (of one rdftype), it loads what those gatherers would otherwise query for one
+# focus at a time, and leaves it where they will look (like django's prefetch
+# cache on `focus.dbmodel`)
+Prefetcher = typing.Callable[[list[Focus]], None]
+__prefetcher_registry: dict[Gatherer, set[Prefetcher]] = {}
 
-def gatherer(*predicate_iris, focustype_iris=None):
+
+def gatherer(*predicate_iris, focustype_iris=None, cacheable=False):
     """decorator to register metadata gatherer functions
 
+    pass `cacheable=True` only if the gatherer's triples depend on nothing but the
+    focus itself (so `focus.cache_version()` tells when they may have changed)
+    and it never gathers another Focus -- see gather.GatherCache
+
     for example:
         ```
         from osf.metadata import gather
@@ -38,6 +49,7 @@ def gatherer(*predicate_iris, focustype_iris=None):
     """
     def _decorator(gatherer: Gatherer):
         tidy_gatherer = _make_gatherer_tidy(gatherer)
+        tidy_gatherer.cacheable = cacheable
         add_gatherer(tidy_gatherer, predicate_iris, focustype_iris)
         return tidy_gatherer
     return _decorator
@@ -75,6 +87,42 @@ def get_gatherers(focustype_iri, predicate_iris, *, include_focustype_defaults=T
     return gatherer_set
 
 
+def get_focustype_gatherers(focustype_iri):
+    '''all gatherers that could gather anything about a focus of the given type
+    '''
+    gatherer_set = set()
+    for focustype in (None, focustype_iri):
+        for _gatherers in __gatherer_registry.get(focustype, {}).values():
+            gatherer_set.update(_gatherers)
+    return gatherer_set
+
+
+def prefetcher(*gatherers):
+    """decorator to register a batched prefetch for the given gatherers
+
+    for example:
+        ```
+        @gather.prefetcher(gather_language)
+        def prefetch_language(foci: list[gather.Focus]):
+            prefetch_related_objects([_focus.dbmodel for _focus in foci], 'language')
+        ```
+    """
+    assert gatherers, 'cannot register prefetcher without gatherers'
+
+    def _decorator(prefetch_fn: Prefetcher):
+        for _gatherer in gatherers:
+            __prefetcher_registry.setdefault(_gatherer, set()).add(prefetch_fn)
+        return prefetch_fn
+    return _decorator
+
+
+def get_prefetchers(gatherers):
+    prefetcher_set = set()
+    for _gatherer in gatherers:
+        prefetcher_set.update(__prefetcher_registry.get(_gatherer, ()))
+    return prefetcher_set
+
+
 class QuietlySkippleTriple(Exception):
     pass
 
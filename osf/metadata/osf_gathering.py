@@ -5,6 +5,7 @@ import enum
 import logging
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
 from django import db
 import rdflib
 
@@ -47,13 +48,64 @@ logger = logging.getLogger(__name__)
 ##### BEGIN "public" api #####
 
 
-def pls_get_magic_metadata_basket(osf_item) -> gather.Basket:
+def pls_get_magic_metadata_basket(osf_item, *, gather_cache=None) -> gather.Basket:
     '''for when you just want a basket of rdf metadata about a thing
 
     @osf_item: the thing (an instance of osf.models.base.GuidMixin or a 5-ish character osf:id string)
+    @gather_cache: optional gather.GatherCache, to share gathered metadata with other baskets
     '''
     focus = OsfFocus(osf_item)
-    return gather.Basket(focus)
+    return gather.Basket(focus, gather_cache=gather_cache)
+
+
+def pls_get_magic_metadata_baskets(osf_items, *, gather_cache=None) -> list[gather.Basket]:
+    '''for when you want baskets of rdf metadata about many things of one type
+
+    @osf_items: iterable of osf model instances (all of the same type)
+    @gather_cache: optional gather.GatherCache (default: one shared by the returned baskets)
+
+    loads guids and guid metadata records for all the items at once, and runs
+    gatherers' prefetchers, so serializing the baskets takes far fewer queries
+    than calling `pls_get_magic_metadata_basket` for each item
+    '''
+    osf_items = list(osf_items)
+    if not osf_items:
+        return []
+    db.models.prefetch_related_objects(osf_items, 'guids')
+    _guid_by_item_id = {}
+    for _item in osf_items:
+        try:
+            _guid_by_item_id[_item.id] = osfdb.base.coerce_guid(_item, create_if_needed=True)
+        except osfdb.base.InvalidGuid:
+            pass
+    _record_by_guid_id = {
+        _record.guid_id: _record
+        for _record in osfdb.GuidMetadataRecord.objects.filter(
+            guid__in=_guid_by_item_id.values(),
+        )
+    }
+    _foci = []
+    for _item in osf_items:
+        _guid = _guid_by_item_id.get(_item.id)
+        _foci.append(OsfFocus(
+            _item,
+            guid_metadata_record=(
+                _record_by_guid_id.get(_guid.id) or osfdb.GuidMetadataRecord(guid=_guid)
+                if _guid is not None
+                else None
+            ),
+        ))
+    # registrations and components (or projects) may differ in rdftype
+    _foci_by_rdftype = {}
+    for _focus in _foci:
+        _foci_by_rdftype.setdefault(_focus.rdftype, []).append(_focus)
+    if gather_cache is None:
+        gather_cache = gather.GatherCache()
+    _basket_by_focus = {}
+    for _typed_foci in _foci_by_rdftype.values():
+        for _basket in gather.Basket.pls_gather_many(_typed_foci, gather_cache=gather_cache):
+            _basket_by_focus[_basket.focus] = _basket
+    return [_basket_by_focus[_focus] for _focus in _foci]
 
 
 ##### END "public" api #####
@@ -349,7 +401,7 @@ class OsfmapPartition(enum.Enum):
 ##### BEGIN osf-specific utils #####
 
 class OsfFocus(gather.Focus):
-    def __init__(self, osf_item):
+    def __init__(self, osf_item, *, guid_metadata_record=None):
         if isinstance(osf_item, str):
             osf_item = osfdb.base.coerce_guid(osf_item).referent
         super().__init__(
@@ -358,11 +410,18 @@ class OsfFocus(gather.Focus):
             provider_id=osf_item.provider._id if (osf_item and getattr(osf_item, 'type', '') == 'osf.registration' and osf_item.provider) else None
         )
         self.dbmodel = osf_item
+        if guid_metadata_record is not None:
+            self.guid_metadata_record = guid_metadata_record
+            return
         try:
             self.guid_metadata_record = osfdb.GuidMetadataRecord.objects.for_guid(osf_item)
         except osfdb.base.InvalidGuid:
             pass  # is ok for a focus to be something non-osfguidy
 
+    def cache_version(self):
+        _modified = getattr(self.dbmodel, 'modified', None)
+        return (_modified.isoformat() if _modified else None)
+
 
 def is_root(osf_node):
     return (osf_node.root_id == osf_node.id)
@@ -409,6 +468,43 @@ def osfguid_from_iri(iri):
     raise ValueError(f'expected iri starting with "{OSFIO}" (got "{iri}")')
 
 
+# attributes set on a focus's dbmodel by the prefetchers below
+PREFETCHED_VISIBLE_CONTRIBUTORS = '_metadata_prefetched_visible_contributors'
+PREFETCHED_KEYWORD_TAGS = '_metadata_prefetched_keyword_tags'
+PREFETCHED_SUBJECTS = '_metadata_prefetched_subjects'
+
+
+def _prefetch_for_foci(foci, get_lookups):
+    '''prefetch_related_objects on the foci's dbmodels, grouped by model
+
+    @get_lookups: callable taking a model class, returning lookups for it (or none)
+    '''
+    _dbmodels_by_type = {}
+    for _focus in foci:
+        _dbmodel = getattr(_focus, 'dbmodel', None)
+        if _dbmodel is not None:
+            _dbmodels_by_type.setdefault(type(_dbmodel), []).append(_dbmodel)
+    for _model, _dbmodels in _dbmodels_by_type.items():
+        _lookups = get_lookups(_model)
+        if _lookups:
+            db.models.prefetch_related_objects(_dbmodels, *_lookups)
+
+
+def _has_relation(model, relation_name):
+    try:
+        model._meta.get_field(relation_name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _contributor_relation_name(model):
+    if issubclass(model, osfdb.Preprint):
+        return 'preprintcontributor_set'
+    if issubclass(model, osfdb.AbstractNode):
+        return 'contributor_set'
+    return None
+
 ##### END osf-specific utils #####
 
 
@@ -612,10 +708,11 @@ def gather_description(focus):
 @gather.er(OSF.keyword)
 def gather_keywords(focus):
     if hasattr(focus.dbmodel, 'tags'):
+        _prefetched = getattr(focus.dbmodel, PREFETCHED_KEYWORD_TAGS, None)
         tag_names = (
-            focus.dbmodel.tags
-            .filter(system=False)
-            .values_list('name', flat=True)
+            [_tag.name for _tag in _prefetched]
+            if _prefetched is not None
+            else focus.dbmodel.tags.filter(system=False).values_list('name', flat=True)
         )
         for tag_name in tag_names:
             yield (OSF.keyword, tag_name)
@@ -624,7 +721,10 @@ def gather_keywords(focus):
 @gather.er(DCTERMS.subject)
 def gather_subjects(focus):
     if hasattr(focus.dbmodel, 'subjects'):
-        for subject in focus.dbmodel.subjects.all().select_related('bepress_subject', 'parent__parent'):
+        _subjects = getattr(focus.dbmodel, PREFETCHED_SUBJECTS, None)
+        if _subjects is None:
+            _subjects = focus.dbmodel.subjects.all().select_related('bepress_subject', 'parent__parent')
+        for subject in _subjects:
             yield from _subject_triples(subject)
 
 
@@ -903,16 +1003,26 @@ def gather_registration_related_items(focus):
 @gather.er(DCTERMS.creator)
 def gather_agents(focus):
     # TODO: contributor roles
-    for user in getattr(focus.dbmodel, 'visible_contributors', ()):
+    _prefetched = getattr(focus.dbmodel, PREFETCHED_VISIBLE_CONTRIBUTORS, None)
+    _users = (
+        [_contributor.user for _contributor in _prefetched]
+        if _prefetched is not None
+        else getattr(focus.dbmodel, 'visible_contributors', ())
+    )
+    for user in _users:
         yield (DCTERMS.creator, OsfFocus(user))
     # TODO: preserve order via rdflib.Seq
 
 
 @gather.er(PROV.qualifiedAttribution)
 def gather_qualified_attributions(focus):
-    _contributor_set = getattr(focus.dbmodel, 'contributor_set', None)
-    if _contributor_set is not None:
-        for index, _contributor in enumerate(_contributor_set.filter(visible=True).select_related('user')):
+    _contributors = getattr(focus.dbmodel, PREFETCHED_VISIBLE_CONTRIBUTORS, None)
+    if _contributors is None:
+        _contributor_set = getattr(focus.dbmodel, 'contributor_set', None)
+        if _contributor_set is not None:
+            _contributors = _contributor_set.filter(visible=True).select_related('user')
+    if _contributors is not None:
+        for index, _contributor in enumerate(_contributors):
             _osfrole_ref = OSF_CONTRIBUTOR_ROLES.get(_contributor.permission)
             if _osfrole_ref is not None:
                 _attribution_ref = rdflib.BNode()
@@ -1006,7 +1116,7 @@ def gather_hosting_institution(focus):
         )
 
 
-@gather.er(focustype_iris=[DCTERMS.Agent])
+@gather.er(focustype_iris=[DCTERMS.Agent], cacheable=True)
 def gather_user_basics(focus):
     if isinstance(focus.dbmodel, osfdb.OSFUser):
         yield (RDF.type, FOAF.Person)  # note: assumes osf user accounts represent people
@@ -1192,3 +1302,67 @@ def gather_storage_byte_count(focus):
     _storage_usage_total = get_storage_usage_total(focus.dbmodel)
     if _storage_usage_total is not None:
         yield (OSF.storageByteCount, _storage_usage_total)
+
+
+##### BEGIN the prefetchers #####
+# batched companions to the gatherers above, used by `pls_get_magic_metadata_baskets`
+
+@gather.prefetcher(gather_identifiers)
+def prefetch_guids(foci):
+    _prefetch_for_foci(foci, lambda _model: (
+        ['guids'] if _has_relation(_model, 'guids') else []
+    ))
+
+
+@gather.prefetcher(gather_agents, gather_qualified_attributions)
+def prefetch_visible_contributors(foci):
+    def _lookups(model):
+        _relation_name = _contributor_relation_name(model)
+        if _relation_name is None:
+            return []
+        _contributor_model = model._meta.get_field(_relation_name).related_model
+        return [db.models.Prefetch(
+            _relation_name,
+            queryset=(
+                _contributor_model.objects
+                .filter(visible=True)
+                .select_related('user')
+                .prefetch_related('user__guids')
+                .order_by('_order')
+            ),
+            to_attr=PREFETCHED_VISIBLE_CONTRIBUTORS,
+        )]
+    _prefetch_for_foci(foci, _lookups)
+
+
+@gather.prefetcher(gather_affiliated_institutions)
+def prefetch_affiliated_institutions(foci):
+    _prefetch_for_foci(foci, lambda _model: (
+        ['affiliated_institutions'] if _has_relation(_model, 'affiliated_institutions') else []
+    ))
+
+
+@gather.prefetcher(gather_keywords)
+def prefetch_keywords(foci):
+    _prefetch_for_foci(foci, lambda _model: (
+        [db.models.Prefetch(
+            'tags',
+            queryset=osfdb.Tag.objects.filter(system=False),
+            to_attr=PREFETCHED_KEYWORD_TAGS,
+        )]
+        if _has_relation(_model, 'tags')
+        else []
+    ))
+
+
+@gather.prefetcher(gather_subjects)
+def prefetch_subjects(foci):
+    _prefetch_for_foci(foci, lambda _model: (
+        [db.models.Prefetch(
+            'subjects',
+            queryset=osfdb.Subject.objects.select_related('bepress_subject', 'parent__parent'),
+            to_attr=PREFETCHED_SUBJECTS,
+        )]
+        if _has_relation(_model, 'subjects')
+        else []
+    ))
@@ -13,28 +13,30 @@ class SerializedMetadataFile(typing.NamedTuple):
     serialized_metadata: str | bytes
 
 
-def pls_gather_metadata_as_dict(osf_item, format_key, serializer_config=None):
+def pls_gather_metadata_as_dict(osf_item, format_key, serializer_config=None, *, gather_cache=None):
     '''for when you want metadata made of python primitives (e.g. a dictionary)
 
     @osf_item: the thing (osf model instance or 5-ish character guid string)
     @format_key: str (must be known by osf.metadata.serializers)
     @serializer_config: optional dict (use only when you know the serializer will understand)
+    @gather_cache: optional osf.metadata.gather.GatherCache, to reuse metadata gathered for other items/formats
     '''
     osfguid = coerce_guid(osf_item, create_if_needed=True)
-    basket = pls_get_magic_metadata_basket(osfguid.referent)
+    basket = pls_get_magic_metadata_basket(osfguid.referent, gather_cache=gather_cache)
     serializer = get_metadata_serializer(format_key, basket, serializer_config)
     return serializer.metadata_as_dict()
 
 
-def pls_gather_metadata_file(osf_item, format_key, serializer_config=None) -> SerializedMetadataFile:
+def pls_gather_metadata_file(osf_item, format_key, serializer_config=None, *, gather_cache=None) -> SerializedMetadataFile:
     '''for when you want metadata in a file (for saving or downloading)
 
     @osf_item: the thing (osf model instance or 5-ish character guid string)
     @format_key: str (must be known by osf.metadata.serializers)
     @serializer_config: optional dict (use only when you know the serializer will understand)
+    @gather_cache: optional osf.metadata.gather.GatherCache, to reuse metadata gathered for other items/formats
     '''
     osfguid = coerce_guid(osf_item, create_if_needed=True)
-    basket = pls_get_magic_metadata_basket(osfguid.referent)
+    basket = pls_get_magic_metadata_basket(osfguid.referent, gather_cache=gather_cache)
     serializer = get_metadata_serializer(format_key, basket, serializer_config)
     return SerializedMetadataFile(
         mediatype=serializer.mediatype,
@@ -6,7 +6,10 @@ from urllib.parse import urlsplit
 from elasticsearch6_dsl import InnerDoc, analyzer, tokenizer
 from elasticsearch_metrics import metrics
 from elasticsearch_metrics.signals import pre_save
+from django.conf import settings
+from django.core.cache import cache
 from django.dispatch import receiver
+from django.utils import timezone
 import pytz
 
 from osf.metrics.utils import stable_key
@@ -89,10 +92,81 @@ def _autofill_fields(sender, instance, **kwargs):
         from osf.models import Guid
         guid_instance = Guid.load(item_guid)
         if guid_instance and guid_instance.referent:
-            _fill_osfguid_info(instance, guid_instance.referent)
+            _fill_osfguid_info(instance, _get_osfguid_info(guid_instance.referent))
     _fill_document_id(instance)
 
 
+def record_many(usages_kwargs):
+    """save many CountedAuthUsages in one bulk request
+
+    fields are filled in as by `_autofill_fields`, but with each item guid's info
+    looked up once for the whole batch (see `get_osfguid_infos`)
+
+    a usage that cannot be built or fails validation is left out of the request; errors
+    reaching elasticsearch (e.g. `TransportError`) are raised as usual
+
+    :return: {position in `usages_kwargs`: error} for each usage that was not saved --
+        the exception raised building it, or the bulk response item elasticsearch rejected
+    """
+    guid_infos = get_osfguid_infos({_kwargs['item_guid'] for _kwargs in usages_kwargs if _kwargs.get('item_guid')})
+    failed = {}
+    positions = []
+    bulk_body = []
+    for _position, _kwargs in enumerate(usages_kwargs):
+        try:
+            usage = CountedAuthUsage(**_kwargs)
+            usage.timestamp = usage.timestamp or timezone.now()
+            if usage.pageview_info:
+                _fill_pageview_info(usage)
+            if usage.item_guid in guid_infos:
+                _fill_osfguid_info(usage, guid_infos[usage.item_guid])
+            _fill_document_id(usage)
+            usage.full_clean()
+        except Exception as e:
+            failed[_position] = e
+            continue
+        positions.append(_position)
+        bulk_body.append({'index': {
+            '_index': CountedAuthUsage.get_index_name(usage.timestamp),
+            '_type': CountedAuthUsage._doc_type.name,
+            '_id': usage.meta.id,
+        }})
+        bulk_body.append(usage.to_dict())
+    if bulk_body:
+        response = CountedAuthUsage._get_connection().bulk(body=bulk_body)
+        if response.get('errors'):
+            for _position, _item in zip(positions, response['items']):
+                if _item['index'].get('error'):
+                    failed[_position] = _item['index']
+    if failed:
+        logger.error(f'failed to save {len(failed)} of {len(usages_kwargs)} counted usages: {list(failed.values())[:3]}')
+    return failed
+
+
+def get_osfguid_infos(item_guids):
+    """map each of the given guids to info about its referent (for `_fill_osfguid_info`)
+
+    loads every uncached guid at once, and keeps the results in django's cache for
+    `COUNTED_USAGE_GUID_INFO_TIMEOUT` seconds -- a popular item's visibility may be
+    that stale in its usage counts
+    """
+    from osf.models import Guid
+    cache_keys = {_guid: f'osf.metrics.counted_usage.guid_info:{_guid}' for _guid in item_guids}
+    cached = cache.get_many(cache_keys.values())
+    guid_infos = {
+        _guid: cached[_cache_key]
+        for _guid, _cache_key in cache_keys.items()
+        if _cache_key in cached
+    }
+    to_cache = {}
+    for _guid, _guid_instance in Guid.load_many([_guid for _guid in cache_keys if _guid not in guid_infos]).items():
+        if _guid_instance.referent:
+            guid_infos[_guid] = to_cache[cache_keys[_guid]] = _get_osfguid_info(_guid_instance.referent)
+    if to_cache:
+        cache.set_many(to_cache, timeout=settings.COUNTED_USAGE_GUID_INFO_TIMEOUT)
+    return guid_infos
+
+
 def _fill_pageview_info(counted_usage):
     pageview = counted_usage.pageview_info
     pageview_dict = pageview.to_dict()
@@ -102,12 +176,21 @@ def _fill_pageview_info(counted_usage):
         pageview.referer_domain = urlsplit(referer).netloc
 
 
-def _fill_osfguid_info(counted_usage, guid_referent):
-    counted_usage.item_public = _get_ispublic(guid_referent)
-    counted_usage.item_type = get_item_type(guid_referent)
-    counted_usage.surrounding_guids = _get_surrounding_guids(guid_referent)
+def _get_osfguid_info(guid_referent):
+    return {
+        'item_public': _get_ispublic(guid_referent),
+        'item_type': get_item_type(guid_referent),
+        'surrounding_guids': _get_surrounding_guids(guid_referent),
+        'provider_id': get_provider_id(guid_referent),
+    }
+
+
+def _fill_osfguid_info(counted_usage, osfguid_info):
+    counted_usage.item_public = osfguid_info['item_public']
+    counted_usage.item_type = osfguid_info['item_type']
+    counted_usage.surrounding_guids = osfguid_info['surrounding_guids']
     if not counted_usage.provider_id:
-        counted_usage.provider_id = get_provider_id(guid_referent)
+        counted_usage.provider_id = osfguid_info['provider_id']
 
 
 def _fill_document_id(counted_usage):
@@ -0,0 +1,121 @@
+"""Buffer counted usage, so recording one is a single redis push instead of a guid lookup and an index request.
+
+When `settings.COUNTED_USAGE_BUFFER_NAME` names a django-redis cache, `buffer_counted_usage`
+appends the usage to a redis list. The first usage in a window schedules a flush for when
+the window closes (as `website.search.queue` does for search updates), and the flush pops
+the list in batches, saving each with `osf.metrics.counted_usage.record_many`: one bulk
+request, with each item's guid info looked up once per batch.
+
+Usages that cannot be saved because of their data (they fail to load or validate, or
+elasticsearch rejects the document) are moved to a dead-letter list, so one bad usage cannot
+hold up the rest of the buffer. Any other failure, such as elasticsearch being unreachable,
+puts the batch back at the front of the buffer and ends the flush; the next flush retries it.
+"""
+import datetime
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from elasticsearch.exceptions import TransportError
+
+from framework.celery_tasks import app as celery_app
+from framework.celery_tasks.handlers import enqueue_task
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'osf.metrics.counted_usage_buffer'
+FLUSH_SCHEDULED_KEY = 'osf.metrics.counted_usage_buffer:flush-scheduled'
+DEAD_LETTER_KEY = 'osf.metrics.counted_usage_buffer:dead-letter'
+
+
+def is_enabled():
+    return bool(getattr(settings, 'COUNTED_USAGE_BUFFER_NAME', None))
+
+
+def _get_redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection(settings.COUNTED_USAGE_BUFFER_NAME)
+
+
+def buffer_counted_usage(**usage_kwargs):
+    """Queue a `CountedAuthUsage` (as kwargs to `record_many`) to be saved by the next flush."""
+    usage_kwargs.setdefault('timestamp', timezone.now())
+    _get_redis().rpush(BUFFER_KEY, json.dumps(usage_kwargs, cls=DjangoJSONEncoder))
+    window = settings.COUNTED_USAGE_FLUSH_WINDOW
+    # Only one flush per window; the periodic flush covers anything missed
+    if cache.add(FLUSH_SCHEDULED_KEY, True, timeout=window):
+        enqueue_task(flush_counted_usage.si().set(countdown=window))
+    return usage_kwargs
+
+
+def _load_usage_kwargs(raw_usage):
+    from osf.metrics.counted_usage import PageviewInfo
+    usage_kwargs = json.loads(raw_usage)
+    usage_kwargs['timestamp'] = datetime.datetime.fromisoformat(usage_kwargs['timestamp'])
+    if usage_kwargs.get('pageview_info'):
+        usage_kwargs['pageview_info'] = PageviewInfo(**usage_kwargs['pageview_info'])
+    return usage_kwargs
+
+
+def _is_retryable(error):
+    # elasticsearch turning a document away under load, rather than a problem with the usage
+    return isinstance(error, dict) and error.get('status') == 429
+
+
+@celery_app.task(ignore_results=True)
+def flush_counted_usage(batch_size=None):
+    """Save every buffered counted usage, `batch_size` per bulk request."""
+    if not is_enabled():
+        return
+    from osf.metrics.counted_usage import record_many
+
+    batch_size = batch_size or settings.COUNTED_USAGE_FLUSH_BATCH_SIZE
+    redis = _get_redis()
+    flushed = 0
+    while True:
+        # Take the batch off the list atomically, so concurrent flushes never share usages
+        with redis.pipeline() as pipe:
+            pipe.lrange(BUFFER_KEY, 0, batch_size - 1)
+            pipe.ltrim(BUFFER_KEY, batch_size, -1)
+            raw_usages, _ = pipe.execute()
+        if not raw_usages:
+            break
+        loaded_raw_usages = []
+        usages_kwargs = []
+        dead_letters = []
+        for raw_usage in raw_usages:
+            try:
+                usages_kwargs.append(_load_usage_kwargs(raw_usage))
+            except Exception:
+                logger.exception(f'Cannot load buffered counted usage; moving it to {DEAD_LETTER_KEY}')
+                dead_letters.append(raw_usage)
+            else:
+                loaded_raw_usages.append(raw_usage)
+        if dead_letters:
+            redis.rpush(DEAD_LETTER_KEY, *dead_letters)
+        if not usages_kwargs:
+            continue
+        try:
+            failed = record_many(usages_kwargs)
+        except Exception as e:
+            # Nothing in the batch was saved; put it back at the front of the list
+            redis.lpush(BUFFER_KEY, *reversed(loaded_raw_usages))
+            if isinstance(e, TransportError):
+                logger.exception(f'Cannot reach elasticsearch; {len(loaded_raw_usages)} counted usages left for the next flush')
+                break
+            raise
+        retry = [loaded_raw_usages[_position] for _position, _error in failed.items() if _is_retryable(_error)]
+        dead_letters = [loaded_raw_usages[_position] for _position, _error in failed.items() if not _is_retryable(_error)]
+        if dead_letters:
+            logger.error(f'Moving {len(dead_letters)} counted usages that could not be saved to {DEAD_LETTER_KEY}')
+            redis.rpush(DEAD_LETTER_KEY, *dead_letters)
+        flushed += len(usages_kwargs) - len(failed)
+        if retry:
+            redis.lpush(BUFFER_KEY, *reversed(retry))
+            logger.warning(f'Elasticsearch rejected {len(retry)} counted usages under load; left for the next flush')
+            break
+    if flushed:
+        logger.info(f'Saved {flushed} buffered counted usages')
@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 class MonthlyReporter:
     yearmonth: YearMonth
 
+    # how many report kwargs `monthly_reporters_go` hands to each `report_many` task
+    REPORT_CHUNK_SIZE = 100
+
     def iter_report_kwargs(self, continue_after: dict | None = None) -> abc.Iterator[dict]:
         # override for multiple reports per month
         if continue_after is None:
@@ -25,6 +28,14 @@ class MonthlyReporter:
         """
         raise NotImplementedError(f'{self.__class__.__name__} must implement `report`')
 
+    def report_many(self, report_kwargs_list: list[dict]) -> abc.Iterator[MonthlyReport | None]:
+        """build a report for each of the given report kwargs
+
+        override to share work across a chunk of reports
+        """
+        for _report_kwargs in report_kwargs_list:
+            yield self.report(**_report_kwargs)
+
     def followup_task(self, report) -> celery.Signature | None:
         return None
 
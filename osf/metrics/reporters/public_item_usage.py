@@ -2,6 +2,7 @@ from __future__ import annotations
 import datetime
 import typing
 
+from elasticsearch.exceptions import NotFoundError
 import waffle
 if typing.TYPE_CHECKING:
     import elasticsearch_dsl as edsl
@@ -38,6 +39,8 @@ class PublicItemUsageReporter(MonthlyReporter):
 
     includes projects, project components, registrations, registration components, and preprints
     '''
+    REPORT_CHUNK_SIZE = _CHUNK_SIZE
+
     def iter_report_kwargs(self, continue_after: dict | None = None):
         _after_osfid = continue_after['osfid'] if continue_after else None
         for _osfid in _zip_sorted(
@@ -48,7 +51,14 @@ class PublicItemUsageReporter(MonthlyReporter):
             yield {'osfid': _osfid}
 
     def report(self, **report_kwargs):
-        _osfid = report_kwargs['osfid']
+        (_report,) = self.report_many([report_kwargs])
+        return _report
+
+    def report_many(self, report_kwargs_list):
+        '''build reports for a chunk of items, counting usage for the whole chunk at once
+
+        (a few searches per chunk, instead of a few per item)
+        '''
         # get usage metrics from several sources:
         # - osf.metrics.counted_usage:
         #   - views and downloads for each item (using `CountedAuthUsage.item_guid`)
@@ -56,23 +66,27 @@ class PublicItemUsageReporter(MonthlyReporter):
         # - osf.metrics.preprint_metrics:
         #   - preprint views and downloads
         # - PageCounter? (no)
-        try:
-            _guid = osfdb.Guid.load(_osfid)
-            if _guid is None or _guid.referent is None:
-                raise _SkipItem
-            _obj = _guid.referent
-            _report = self._init_report(_obj)
-            self._fill_report_counts(_report, _obj)
-            if not any((
+        _osfids = [_kwargs['osfid'] for _kwargs in report_kwargs_list]
+        _guids = osfdb.Guid.load_many(_osfids)
+        _reports = {}  # osfid => (report, osf_obj)
+        for _osfid in _osfids:
+            _guid = _guids.get(_osfid)
+            try:
+                if _guid is None or _guid.referent is None:
+                    raise _SkipItem
+                _reports[_osfid] = (self._init_report(_guid.referent), _guid.referent)
+            except _SkipItem:
+                pass
+        self._fill_report_counts(list(_reports.values()))
+        for _osfid in _osfids:
+            _report, _ = _reports.get(_osfid, (None, None))
+            _has_usage = _report is not None and any((
                 _report.view_count,
                 _report.view_session_count,
                 _report.download_count,
                 _report.download_session_count,
-            )):
-                raise _SkipItem
-            return _report
-        except _SkipItem:
-            return None
+            ))
+            yield (_report if _has_usage else None)
 
     def followup_task(self, report):
         _is_last_month = report.report_yearmonth.next() == YearMonth.from_date(datetime.date.today())
@@ -142,23 +156,32 @@ class PublicItemUsageReporter(MonthlyReporter):
             # leave counts null; will be set if there's data
         )
 
-    def _fill_report_counts(self, report, osf_obj):
-        if (
-            isinstance(osf_obj, osfdb.Preprint)
-            and not waffle.switch_is_active(osf.features.COUNTEDUSAGE_UNIFIED_METRICS_2024)  # type: ignore[attr-defined]
-        ):
+    def _fill_report_counts(self, reports_and_objs):
+        _use_preprint_metrics = not waffle.switch_is_active(osf.features.COUNTEDUSAGE_UNIFIED_METRICS_2024)  # type: ignore[attr-defined]
+        _preprint_items = []
+        _countedusage_items = []
+        for _report, _osf_obj in reports_and_objs:
+            if _use_preprint_metrics and isinstance(_osf_obj, osfdb.Preprint):
+                _preprint_items.append((_report, _osf_obj))
+            else:
+                _countedusage_items.append((_report, _osf_obj))
+        if _preprint_items:
             # note: no session-count info in preprint metrics
-            report.view_count = self._preprint_views(osf_obj)
-            report.download_count = self._preprint_downloads(osf_obj)
-        else:
-            (
-                report.view_count,
-                report.view_session_count,
-            ) = self._countedusage_view_counts(osf_obj)
-            (
-                report.download_count,
-                report.download_session_count,
-            ) = self._countedusage_download_counts(osf_obj)
+            _preprints = [_osf_obj for _, _osf_obj in _preprint_items]
+            _view_counts = self._preprint_counts(PreprintView, _preprints)
+            _download_counts = self._preprint_counts(PreprintDownload, _preprints)
+            for _report, _osf_obj in _preprint_items:
+                _report.view_count = _view_counts[_osf_obj._id]
+                _report.download_count = _download_counts[_osf_obj._id]
+        if _countedusage_items:
+            _counts = self._countedusage_counts([_osf_obj._id for _, _osf_obj in _countedusage_items])
+            for _report, _osf_obj in _countedusage_items:
+                (
+                    _report.view_count,
+                    _report.view_session_count,
+                    _report.download_count,
+                    _report.download_session_count,
+                ) = _counts[_osf_obj._id]
 
     def _base_usage_search(self):
         return (
@@ -171,79 +194,110 @@ class PublicItemUsageReporter(MonthlyReporter):
             .extra(size=0)  # only aggregations, no hits
         )
 
-    def _countedusage_view_counts(self, osf_obj) -> tuple[int, int]:
-        '''compute view_session_count separately to avoid double-counting
+    def _countedusage_counts(self, osfids: list[str]) -> dict[str, tuple[int, int, int, int]]:
+        '''count views and downloads (and their sessions) for each osfid, in one search
 
-        (the same session may be represented in both the composite agg on `item_guid`
-        and that on `surrounding_guids`)
+        views include views of each item's components and files (`surrounding_guids`), while
+        downloads are only of the item itself; each osfid gets its own bucket (and so its own
+        session count) to avoid double-counting sessions represented both ways
         '''
-        _search = (
-            self._base_usage_search()
-            .query(
-                'bool',
-                filter=[
-                    {'term': {'action_labels': CountedAuthUsage.ActionLabel.VIEW.value}},
-                ],
-                should=[
-                    {'term': {'item_guid': osf_obj._id}},
-                    {'term': {'surrounding_guids': osf_obj._id}},
-                ],
-                minimum_should_match=1,
-            )
-        )
-        _search.aggs.metric(
+        _search = self._base_usage_search()
+        _search.aggs.bucket(
+            'agg_views',
+            'filter',
+            term={'action_labels': CountedAuthUsage.ActionLabel.VIEW.value},
+        ).bucket(
+            'agg_osfid',
+            'filters',
+            filters={
+                _osfid: {'bool': {
+                    'should': [
+                        {'term': {'item_guid': _osfid}},
+                        {'term': {'surrounding_guids': _osfid}},
+                    ],
+                    'minimum_should_match': 1,
+                }}
+                for _osfid in osfids
+            },
+        ).metric(
             'agg_session_count',
             'cardinality',
             field='session_id',
             precision_threshold=_MAX_CARDINALITY_PRECISION,
         )
-        _response = _search.execute()
-        _view_count = _response.hits.total
-        _view_session_count = (
-            _response.aggregations.agg_session_count.value
-            if 'agg_session_count' in _response.aggregations
-            else 0
-        )
-        return (_view_count, _view_session_count)
-
-    def _countedusage_download_counts(self, osf_obj) -> tuple[int, int]:
-        '''aggregate downloads on each osfid (not including components/files)'''
-        _search = (
-            self._base_usage_search()
-            .filter('term', item_guid=osf_obj._id)
-            .filter('term', action_labels=CountedAuthUsage.ActionLabel.DOWNLOAD.value)
-        )
-        # agg: get download session count
-        _search.aggs.metric(
+        _search.aggs.bucket(
+            'agg_downloads',
+            'filter',
+            term={'action_labels': CountedAuthUsage.ActionLabel.DOWNLOAD.value},
+        ).bucket(
+            'agg_osfid',
+            'filters',
+            filters={
+                _osfid: {'term': {'item_guid': _osfid}}
+                for _osfid in osfids
+            },
+        ).metric(
             'agg_session_count',
             'cardinality',
             field='session_id',
             precision_threshold=_MAX_CARDINALITY_PRECISION,
         )
         _response = _search.execute()
-        _download_count = _response.hits.total
-        _download_session_count = (
-            _response.aggregations.agg_session_count.value
-            if 'agg_session_count' in _response.aggregations
-            else 0
-        )
-        return (_download_count, _download_session_count)
-
-    def _preprint_views(self, preprint: osfdb.Preprint) -> int:
-        '''aggregate views on each preprint'''
-        return PreprintView.get_count_for_preprint(
-            preprint=preprint,
-            after=self.yearmonth.month_start(),
-            before=self.yearmonth.month_end(),
-        )
+        _view_counts = _bucket_counts(_response.aggregations, 'agg_views')
+        _download_counts = _bucket_counts(_response.aggregations, 'agg_downloads')
+        return {
+            _osfid: (*_view_counts.get(_osfid, (0, 0)), *_download_counts.get(_osfid, (0, 0)))
+            for _osfid in osfids
+        }
+
+    def _preprint_counts(self, metric_class, preprints: list[osfdb.Preprint]) -> dict[str, int]:
+        '''sum views or downloads for each preprint, in one search
 
-    def _preprint_downloads(self, preprint: osfdb.Preprint) -> int:
-        '''aggregate downloads on each preprint'''
-        return PreprintDownload.get_count_for_preprint(
-            preprint=preprint,
-            after=self.yearmonth.month_start(),
-            before=self.yearmonth.month_end(),
+        like `get_count_for_preprint`, counts a first-version preprint also under its unversioned guid
+        '''
+        _preprint_id_values = {}  # preprint_id value => preprint._id
+        for _preprint in preprints:
+            _preprint_id_values[_preprint._id] = _preprint._id
+            if _preprint.version == 1:
+                _base_guid_str = osfdb.Guid.split_guid(_preprint._id)[0]
+                _preprint_id_values[_base_guid_str] = _preprint._id
+        _search = (
+            metric_class.search()
+            .filter('terms', preprint_id=list(_preprint_id_values))
+            .filter('range', timestamp={
+                'gte': self.yearmonth.month_start(),
+                'lt': self.yearmonth.month_end(),
+            })
+            .extra(size=0)  # only aggregations, no hits
         )
+        _search.aggs.bucket(
+            'agg_preprint_id',
+            'terms',
+            field='preprint_id',
+            size=len(_preprint_id_values),
+        ).metric('sum_count', 'sum', field='count')
+        try:
+            _response = _search.execute()
+        except NotFoundError:
+            # fall back to the default index, as `get_count_for_preprint` does
+            _search = _search.index().index(metric_class._default_index())
+            _response = _search.execute()
+        _counts = {_preprint._id: 0 for _preprint in preprints}
+        if 'agg_preprint_id' in _response.aggregations:
+            for _bucket in _response.aggregations.agg_preprint_id.buckets:
+                _counts[_preprint_id_values[_bucket.key]] += int(_bucket.sum_count.value)
+        return _counts
+
+
+def _bucket_counts(aggregations, filter_agg_name: str) -> dict[str, tuple[int, int]]:
+    '''get (doc count, session count) for each osfid bucket under the named filter agg'''
+    if filter_agg_name not in aggregations:
+        return {}
+    _buckets = aggregations[filter_agg_name].agg_osfid.buckets.to_dict()  # keyed by osfid
+    return {
+        _osfid: (_bucket['doc_count'], _bucket['agg_session_count']['value'])
+        for _osfid, _bucket in _buckets.items()
+    }
 
 
 def _is_item_public(osfid_referent) -> bool:
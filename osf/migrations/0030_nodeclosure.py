@@ -0,0 +1,47 @@
+# Generated by Django 4.2.15 on 2026-10-18 12:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BACKFILL_NODE_CLOSURE = """
+    INSERT INTO osf_nodeclosure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE closure (ancestor_id, descendant_id, depth) AS (
+        SELECT parent_id, child_id, 1
+        FROM osf_noderelation
+        WHERE is_node_link IS FALSE
+    UNION ALL
+        SELECT C.ancestor_id, R.child_id, C.depth + 1
+        FROM closure AS C
+        JOIN osf_noderelation AS R ON R.parent_id = C.descendant_id
+        WHERE R.is_node_link IS FALSE
+        AND C.depth < 100
+    )
+    SELECT ancestor_id, descendant_id, MIN(depth)
+    FROM closure
+    GROUP BY ancestor_id, descendant_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0029_nodestorageusage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeClosure',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_descendants', to='osf.abstractnode')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_ancestors', to='osf.abstractnode')),
+            ],
+            options={
+                'unique_together': {('ancestor', 'descendant')},
+                'index_together': {('descendant', 'depth')},
+            },
+        ),
+        migrations.RunSQL(BACKFILL_NODE_CLOSURE, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.15 on 2026-10-18 13:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import osf.utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0030_nodeclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSearchUpdate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=32)),
+                ('object_id', models.PositiveIntegerField()),
+                ('created', osf.utils.fields.NonNaiveDateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'unique_together': {('category', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.15 on 2026-10-18 14:10
+
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('osf', '0031_pendingsearchupdate'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='basefilenode',
+            index=models.Index(
+                models.F('target_content_type'),
+                models.F('target_object_id'),
+                OpClass(models.F('_materialized_path'), name='text_pattern_ops'),
+                name='osf_basefilenode_mpath_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.15 on 2026-10-18 15:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('osf', '0032_basefilenode_mpath_idx'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='basefilenode',
+            index=models.Index(fields=['parent', 'name', 'id'], name='osf_basefilenode_children_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.15 on 2026-10-18 17:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import osf.utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0033_basefilenode_children_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyReporterCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reporter_key', models.CharField(max_length=255)),
+                ('report_yearmonth', models.CharField(max_length=7)),
+                ('continue_after', models.JSONField(blank=True, null=True)),
+                ('scheduling_done', models.BooleanField(default=False)),
+                ('chunks_scheduled', models.PositiveIntegerField(default=0)),
+                ('chunks_done', models.PositiveIntegerField(default=0)),
+                ('reports_saved', models.PositiveIntegerField(default=0)),
+                ('chunk_seconds', models.FloatField(default=0)),
+                ('failed_chunks', models.JSONField(blank=True, default=list)),
+                ('created', osf.utils.fields.NonNaiveDateTimeField(default=django.utils.timezone.now)),
+                ('modified', osf.utils.fields.NonNaiveDateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('reporter_key', 'report_yearmonth')},
+            },
+        ),
+    ]
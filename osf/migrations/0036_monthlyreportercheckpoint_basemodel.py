@@ -0,0 +1,24 @@
+# Generated by Django 4.2.15 on 2026-10-18 19:00
+
+from django.db import migrations
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osf', '0035_basefilenode_version_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='monthlyreportercheckpoint',
+            name='created',
+            field=django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='monthlyreportercheckpoint',
+            name='modified',
+            field=django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified'),
+        ),
+    ]
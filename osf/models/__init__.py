@@ -58,8 +58,9 @@ from .metaschema import (
     RegistrationSchema,
     RegistrationSchemaBlock,
 )
+from .monthly_reporter_checkpoint import MonthlyReporterCheckpoint
 from .node import AbstractNode, Node
-from .node_relation import NodeRelation
+from .node_relation import NodeRelation, NodeClosure
 from .nodelog import NodeLog
 from .notable_domain import NotableDomain, DomainReference
 from .notifications import NotificationDigest, NotificationSubscription
@@ -101,9 +102,11 @@ from .sanctions import (
 )
 from .schema_response import SchemaResponse
 from .schema_response_block import SchemaResponseBlock
+from .search_update import PendingSearchUpdate
 from .session import UserSessionMap
 from .spam import SpamStatus, SpamMixin
 from .storage import ProviderAssetFile, InstitutionAssetFile
+from .storage_usage import NodeStorageUsage
 from .subject import Subject
 from .tag import Tag
 from .user import (
@@ -8,14 +8,15 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import MultipleObjectsReturned
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import connections, models
-from django.db.models import ForeignKey, UniqueConstraint
+from django.db.models import ForeignKey, UniqueConstraint, prefetch_related_objects
 from django.db.models.query import QuerySet
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django_extensions.db.models import TimeStampedModel
 
 from framework import sentry
 from osf.exceptions import ValidationError
+from osf.utils import guid_cache
 from osf.utils.caching import cached_property
 from osf.utils.fields import LowercaseCharField, NonNaiveDateTimeField
 from website import settings as website_settings
@@ -230,14 +231,60 @@ class Guid(BaseModel):
         base_guid_str, version = cls.split_guid(data)
         try:
             if not select_for_update:
-                return cls.objects.get(_id=base_guid_str)
-            return cls.objects.filter(_id=base_guid_str).select_for_update().get()
+                return cls.load_cached(base_guid_str)
+            guid = cls.objects.filter(_id=base_guid_str).select_for_update().get()
+            guid_cache.remember(guid)
+            return guid
         except cls.DoesNotExist:
             if not skip_log_not_found:
                 logger.debug(f'Object not found from base guid: '
                              f'[data={data}, base_guid={base_guid_str}, version={version}]')
             return None
 
+    @classmethod
+    def load_cached(cls, base_guid_str):
+        """Load by base guid str, using the request's identity map and the shared guid cache (see
+        `osf.utils.guid_cache`) before the database. Raises `Guid.DoesNotExist` if there is no such guid.
+        """
+        guid = guid_cache.get_guid(cls, base_guid_str)
+        if guid is None:
+            guid = cls.objects.get(_id=base_guid_str)
+            guid_cache.remember(guid)
+        return guid
+
+    @classmethod
+    def load_many(cls, guid_strs):
+        """Load guids for many guid strs at once, with their referents.
+
+        Return a dict mapping each guid str found (as given) to its `Guid`; versioned guid strs map to
+        their base guid, as with `load`. Uncached guids take one query, and their referents one query
+        per content type.
+        """
+        base_guid_strs = {
+            guid_str: cls.split_guid(guid_str)[0]
+            for guid_str in guid_strs
+            if guid_str
+        }
+        guids = {}
+        missing = set()
+        for base_guid_str in set(base_guid_strs.values()):
+            guid = guid_cache.get_guid(cls, base_guid_str)
+            if guid is None:
+                missing.add(base_guid_str)
+            else:
+                guids[base_guid_str] = guid
+        if missing:
+            for guid in cls.objects.filter(_id__in=missing):
+                guid_cache.remember(guid)
+                guids[guid._id] = guid
+        # Skips guids whose referent is already cached
+        prefetch_related_objects(list(guids.values()), 'referent')
+        return {
+            guid_str: guids[base_guid_str]
+            for guid_str, base_guid_str in base_guid_strs.items()
+            if base_guid_str in guids
+        }
+
     @classmethod
     def load_referent(cls, guid_str):
         """Find and return the referent from a given guid str.
@@ -482,13 +529,35 @@ class GuidMixin(BaseIDMixin):
         # Minor optimization--no need to query if q is None or ''
         if not q:
             return None
+        if not select_for_update and isinstance(q, str):
+            guid = guid_cache.get_guid(Guid, q)
+            if guid is not None:
+                return cls._load_from_cached_guid(guid)
         try:
             # guids___id__isnull=False forces an INNER JOIN
             if select_for_update:
                 return cls.objects.filter(guids___id__isnull=False, guids___id=q).select_for_update()[:1].get()
-            return cls.objects.filter(guids___id__isnull=False, guids___id=q)[:1].get()
+            referent = cls.objects.filter(guids___id__isnull=False, guids___id=q)[:1].get()
         except cls.DoesNotExist:
             return None
+        # Remember the (already prefetched) guid, so the next load skips the query
+        for guid in referent.guids.all():
+            if guid._id == q.lower():
+                Guid.referent.set_cached_value(guid, referent)
+                guid_cache.remember(guid)
+        return referent
+
+    @classmethod
+    def _load_from_cached_guid(cls, guid):
+        if guid.content_type_id != ContentType.objects.get_for_model(cls).id:
+            return None
+        if Guid.referent.is_cached(guid) and isinstance(guid.referent, cls):
+            return guid.referent
+        # Filtering by pk (rather than taking guid.referent) keeps typed models' type filtering
+        referent = cls.objects.filter(pk=guid.object_id).first()
+        if referent is not None:
+            Guid.referent.set_cached_value(guid, referent)
+        return referent
 
     @property
     def deep_url(self):
@@ -600,6 +669,13 @@ class VersionedGuidMixin(GuidMixin):
             raise ValueError(f'no osfid for {self} (cannot build semantic iri)')
         return osfid_iri(_osfid)
 
+@receiver(post_save, sender=Guid)
+@receiver(post_delete, sender=Guid)
+def forget_cached_guid(sender, instance, **kwargs):
+    """Drop a repointed or deleted guid from the guid caches."""
+    guid_cache.forget(instance._id)
+
+
 @receiver(post_save)
 def ensure_guid(sender, instance, **kwargs):
     """Generate guid if it doesn't exist for subclasses of GuidMixin except for subclasses of VersionedGuidMixin
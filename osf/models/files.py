@@ -4,7 +4,8 @@ import os
 import requests
 from dateutil.parser import parse as parse_date
 from django.apps import apps
-from django.db import models, IntegrityError
+from django.contrib.postgres.indexes import OpClass
+from django.db import connection, models, IntegrityError
 from django.db.models import Manager
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
@@ -37,6 +38,31 @@ __all__ = (
 PROVIDER_MAP = {}
 logger = logging.getLogger(__name__)
 
+# Records each file's latest version, first version's created and version count from its
+# versions, for the files with ids in (after_id, through_id] whose stored values are stale
+RECORD_VERSION_FIELDS_SQL = """
+    UPDATE osf_basefilenode AS B
+    SET
+      version_count = V.version_count,
+      latest_version_id = V.latest_version_id,
+      first_version_created = V.first_version_created
+    FROM (
+      SELECT
+        T.basefilenode_id,
+        COUNT(*) AS version_count,
+        (ARRAY_AGG(FV.id ORDER BY FV.created DESC, FV.id DESC))[1] AS latest_version_id,
+        MIN(FV.created) AS first_version_created
+      FROM osf_basefileversionsthrough AS T
+        JOIN osf_fileversion AS FV ON FV.id = T.fileversion_id
+      WHERE T.basefilenode_id > %(after_id)s AND T.basefilenode_id <= %(through_id)s
+      GROUP BY T.basefilenode_id
+    ) AS V
+    WHERE B.id = V.basefilenode_id
+      AND (B.version_count, B.latest_version_id, B.first_version_created)
+        IS DISTINCT FROM (V.version_count, V.latest_version_id, V.first_version_created)
+    RETURNING B.id, B.version_count, B.latest_version_id, B.first_version_created;
+"""
+
 
 class BaseFileNodeManager(TypedModelManager):
 
@@ -88,6 +114,11 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
     _history = DateTimeAwareJSONField(default=list, blank=True)
     # A concrete version of a FileNode, must have an identifier
     versions = models.ManyToManyField('FileVersion', through='BaseFileVersionsThrough')
+    # Maintained by `add_version`, so reads need not sort or count the versions; null until
+    # recorded (see the backfill_file_version_fields command), in which case reads fall back
+    latest_version = models.ForeignKey('FileVersion', blank=True, null=True, related_name='+', on_delete=models.SET_NULL)
+    first_version_created = NonNaiveDateTimeField(blank=True, null=True)
+    version_count = models.PositiveIntegerField(blank=True, null=True)
 
     target_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     target_object_id = models.PositiveIntegerField()
@@ -117,6 +148,17 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
         index_together = (
             ('target_content_type', 'target_object_id', )
         )
+        indexes = [
+            # Prefix scans on stored materialized paths, e.g. everything below an osfstorage folder
+            models.Index(
+                'target_content_type',
+                'target_object_id',
+                OpClass('_materialized_path', name='text_pattern_ops'),
+                name='osf_basefilenode_mpath_idx',
+            ),
+            # Keyset pagination over a folder's children
+            models.Index(fields=['parent', 'name', 'id'], name='osf_basefilenode_children_idx'),
+        ]
 
     @property
     def history(self):
@@ -183,11 +225,35 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
             return len(self.history)
         return 1
 
+    def get_latest_version(self):
+        """The newest version (by created), or None"""
+        if self.latest_version_id is not None:
+            return self.latest_version
+        return self.versions.first()
+
+    def get_first_version_created(self):
+        if self.first_version_created is not None:
+            return self.first_version_created
+        earliest_version = self.versions.order_by('created').first()
+        return earliest_version.created if earliest_version else None
+
+    def get_version_count(self):
+        if self.version_count is not None:
+            return self.version_count
+        return self.versions.count()
+
     @classmethod
     def create(cls, **kwargs):
         kwargs.update(provider=cls._provider)
         return cls(**kwargs)
 
+    def clone(self):
+        copy = super().clone()
+        # Recorded again as versions are added to the copy
+        copy.first_version_created = None
+        copy.version_count = None
+        return copy
+
     @classmethod
     def get_or_create(cls, target, path, **unused_query_params):
         content_type = ContentType.objects.get_for_model(target)
@@ -249,8 +315,25 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
         """
         version_name = name or self.name
         BaseFileVersionsThrough.objects.create(fileversion=version, basefilenode=self, version_name=version_name)
+        self.record_version_fields(added_version=version)
         return version
 
+    def record_version_fields(self, added_version=None):
+        """Store the latest version, first version's created and version count, from the versions themselves.
+
+        Recomputed rather than incremented, as versions may be added out of order (e.g. when copying).
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(RECORD_VERSION_FIELDS_SQL, {'after_id': self.id - 1, 'through_id': self.id})
+            row = cursor.fetchone()
+        if row is None:
+            return  # already up to date
+        _, self.version_count, latest_version_id, self.first_version_created = row
+        if added_version is not None and added_version.id == latest_version_id:
+            self.latest_version = added_version
+        else:
+            self.latest_version_id = latest_version_id
+
     @classmethod
     def files_checked_out(cls, user):
         """
@@ -370,8 +453,8 @@ class BaseFileNode(TypedModel, CommentableMixin, OptionalGuidMixin, Taggable, Ob
         self.parent = destination_parent
         self._update_node(save=True)  # Trust _update_node to save us
 
-        if renaming and self.is_file and self.versions.exists():
-            newest_version = self.versions.first()
+        newest_version = self.get_latest_version() if renaming and self.is_file else None
+        if newest_version is not None:
             node_file_version = newest_version.get_basefilenode_version(self)
             # Rename version in through table
             node_file_version.version_name = self.name
@@ -0,0 +1,71 @@
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .base import BaseModel
+
+
+class MonthlyReporterCheckpoint(BaseModel):
+    """How far one monthly reporter has got with one month's reports.
+
+    `monthly_reporters_go` hands a reporter's report kwargs out in chunks, one celery task
+    each. Scheduling records the last kwargs it handed out, so an interrupted run picks up
+    after them instead of starting over; each chunk task adds to the counters when it
+    finishes, and a chunk that ran out of retries is kept in `failed_chunks` to be retried.
+    """
+    reporter_key = models.CharField(max_length=255)
+    report_yearmonth = models.CharField(max_length=7)
+    continue_after = models.JSONField(null=True, blank=True)
+    scheduling_done = models.BooleanField(default=False)
+    chunks_scheduled = models.PositiveIntegerField(default=0)
+    chunks_done = models.PositiveIntegerField(default=0)
+    reports_saved = models.PositiveIntegerField(default=0)
+    chunk_seconds = models.FloatField(default=0)  # total time spent in finished chunks
+    failed_chunks = models.JSONField(default=list, blank=True)  # report kwargs of each failed chunk
+
+    class Meta:
+        unique_together = ('reporter_key', 'report_yearmonth')
+
+    def __str__(self):
+        return f'{self.reporter_key} {self.report_yearmonth}'
+
+    def progress_message(self):
+        _message = (
+            f'{self} -- {self.chunks_done} of {self.chunks_scheduled} chunks done'
+            f' ({self.reports_saved} reports, {self.chunk_seconds:.1f}s)'
+        )
+        if self.failed_chunks:
+            _message += f', {len(self.failed_chunks)} failed'
+        if not self.scheduling_done:
+            _message += ', still scheduling'
+        return _message
+
+    @classmethod
+    def record_scheduled(cls, reporter_key, report_yearmonth, last_kwargs):
+        cls.objects.filter(reporter_key=reporter_key, report_yearmonth=report_yearmonth).update(
+            continue_after=last_kwargs,
+            chunks_scheduled=F('chunks_scheduled') + 1,
+            modified=timezone.now(),
+        )
+
+    @classmethod
+    def record_done(cls, reporter_key, report_yearmonth, reports_saved, seconds):
+        cls.objects.filter(reporter_key=reporter_key, report_yearmonth=report_yearmonth).update(
+            chunks_done=F('chunks_done') + 1,
+            reports_saved=F('reports_saved') + reports_saved,
+            chunk_seconds=F('chunk_seconds') + seconds,
+            modified=timezone.now(),
+        )
+
+    @classmethod
+    @transaction.atomic
+    def record_failed(cls, reporter_key, report_yearmonth, report_kwargs_list):
+        _checkpoint = (
+            cls.objects
+            .select_for_update()
+            .filter(reporter_key=reporter_key, report_yearmonth=report_yearmonth)
+            .first()
+        )
+        if _checkpoint is not None:
+            _checkpoint.failed_chunks.append(report_kwargs_list)
+            _checkpoint.save(update_fields=['failed_chunks', 'modified'])
@@ -1,4 +1,5 @@
 import functools
+from collections import defaultdict
 import itertools
 import logging
 import re
@@ -21,7 +22,6 @@ from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.functional import cached_property
 from keen import scoped_keys
-from psycopg2._psycopg import AsIs
 from typedmodels.models import TypedModel, TypedModelManager
 from guardian.models import (
     GroupObjectPermissionBase,
@@ -45,7 +45,7 @@ from .metadata import GuidMetadataRecord
 from .mixins import (AddonModelMixin, CommentableMixin, Loggable, GuardianMixin,
                      NodeLinkMixin, SpamOverrideMixin, RegistrationResponseMixin,
                      EditableFieldsMixin)
-from .node_relation import NodeRelation
+from .node_relation import NodeClosure, NodeRelation
 from .nodelog import NodeLog
 from .private_link import PrivateLink
 from .tag import Tag
@@ -82,7 +82,7 @@ from website.util.metrics import OsfSourceTags, CampaignSourceTags
 from website.util import api_url_for, api_v2_url, web_url_for
 from .base import BaseModel, GuidMixin, GuidMixinQuerySet
 from api.base.exceptions import Conflict
-from api.caching.tasks import update_storage_usage
+from api.caching.tasks import get_persisted_storage_usage_total, update_storage_usage
 from api.caching import settings as cache_settings
 from api.caching.utils import storage_usage_cache
 
@@ -105,47 +105,42 @@ class AbstractNodeQuerySet(GuidMixinQuerySet):
                 query = query.filter(is_deleted=False)
             return query
         else:
-            sql = """
-                WITH RECURSIVE descendants AS (
-                SELECT
-                    parent_id,
-                    child_id,
-                    1 AS LEVEL,
-                    ARRAY[parent_id] as pids
-                FROM %s
-                %s
-                WHERE is_node_link IS FALSE AND parent_id = %s %s
-                UNION ALL
-                SELECT
-                    d.parent_id,
-                    s.child_id,
-                    d.level + 1,
-                    d.pids || s.parent_id
-                FROM descendants AS d
-                    JOIN %s AS s
-                    ON d.child_id = s.parent_id
-                WHERE s.is_node_link IS FALSE AND %s = ANY(pids)
-                ) SELECT array_agg(DISTINCT child_id)
-                FROM descendants
-                WHERE parent_id = %s;
-            """
-            with connection.cursor() as cursor:
-                node_relation_table = AsIs(NodeRelation._meta.db_table)
-                cursor.execute(sql, [
-                    node_relation_table,
-                    AsIs(
-                        f'LEFT JOIN osf_abstractnode ON {node_relation_table}.child_id = osf_abstractnode.id' if active else ''),
-                    root.pk,
-                    AsIs('AND osf_abstractnode.is_deleted IS FALSE' if active else ''),
-                    node_relation_table,
-                    root.pk,
-                    root.pk])
-                row = cursor.fetchone()[0]
-                if not row:
-                    return AbstractNode.objects.filter(id=root.pk) if include_root else AbstractNode.objects.none()
-                if include_root:
-                    row.append(root.pk)
-                return AbstractNode.objects.filter(id__in=row)
+            query = AbstractNode.objects.filter(id__in=NodeClosure.objects.filter(ancestor=root).values('descendant_id'))
+            if active:
+                query = query.filter(is_deleted=False)
+            if include_root:
+                query |= AbstractNode.objects.filter(id=root.pk)
+            return query
+
+    def _implicit_read_query(self, user):
+        """Q matching nodes `user` can read through admin permission on a project at or above them.
+
+        The admin projects come from the user's guardian groups and their descendants from
+        NodeClosure, so both halves are indexed lookups rather than a recursive CTE.
+        """
+        OSFUserGroup = apps.get_model('osf', 'osfuser_groups')
+        admin_node_ids = NodeGroupObjectPermission.objects.filter(
+            group_id__in=OSFUserGroup.objects.filter(osfuser_id=user.id).values('group_id'),
+            permission__codename=ADMIN_NODE,
+            content_object__type='osf.node',
+        ).values('content_object_id')
+        return Q(id__in=admin_node_ids) | Q(
+            id__in=NodeClosure.objects.filter(ancestor_id__in=admin_node_ids).values('descendant_id'),
+        )
+
+    def get_descendants_of(self, node, include_self=False):
+        """Filter to the primary (non-node-link) descendants of `node`, at any depth"""
+        query = Q(id__in=NodeClosure.objects.filter(ancestor=node).values('descendant_id'))
+        if include_self:
+            query |= Q(id=node.pk)
+        return self.filter(query)
+
+    def get_ancestors_of(self, node, include_self=False):
+        """Filter to the primary (non-node-link) ancestors of `node`, up to and including its root"""
+        query = Q(id__in=NodeClosure.objects.filter(descendant=node).values('ancestor_id'))
+        if include_self:
+            query |= Q(id=node.pk)
+        return self.filter(query)
 
     def can_view(self, user=None, private_link=None):
         qs = self.filter(is_public=True)
@@ -162,25 +157,7 @@ class AbstractNodeQuerySet(GuidMixinQuerySet):
         if user is not None and not isinstance(user, AnonymousUser):
             read_user_query = get_objects_for_user(user, READ_NODE, self, with_superuser=False)
             qs |= read_user_query
-            qs |= self.extra(where=["""
-                "osf_abstractnode".id in (
-                    WITH RECURSIVE implicit_read AS (
-                        SELECT N.id as node_id
-                        FROM osf_abstractnode as N, auth_permission as P, osf_nodegroupobjectpermission as G, osf_osfuser_groups as UG
-                        WHERE P.codename = 'admin_node'
-                        AND G.permission_id = P.id
-                        AND UG.osfuser_id = %s
-                        AND G.group_id = UG.group_id
-                        AND G.content_object_id = N.id
-                        AND N.type = 'osf.node'
-                    UNION ALL
-                        SELECT "osf_noderelation"."child_id"
-                        FROM "implicit_read"
-                        LEFT JOIN "osf_noderelation" ON "osf_noderelation"."parent_id" = "implicit_read"."node_id"
-                        WHERE "osf_noderelation"."is_node_link" IS FALSE
-                    ) SELECT * FROM implicit_read
-                )
-            """], params=(user.id,))
+            qs |= self.filter(self._implicit_read_query(user))
         return qs.filter(is_deleted=False)
 
 
@@ -199,6 +176,12 @@ class AbstractNodeManager(TypedModelManager):
     def get_children(self, root, active=False, include_root=False):
         return self.get_queryset().get_children(root, active=active, include_root=include_root)
 
+    def get_descendants_of(self, node, include_self=False):
+        return self.get_queryset().get_descendants_of(node, include_self=include_self)
+
+    def get_ancestors_of(self, node, include_self=False):
+        return self.get_queryset().get_ancestors_of(node, include_self=include_self)
+
     def can_view(self, user=None, private_link=None):
         return self.get_queryset().can_view(user=user, private_link=private_link)
 
@@ -1333,39 +1316,10 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
         return self.private_links.filter(is_deleted=True).values_list('key', flat=True)
 
     def get_root(self):
-        sql = """
-            WITH RECURSIVE ascendants AS (
-              SELECT
-                parent_id,
-                child_id,
-                1 AS LEVEL,
-                ARRAY[child_id] as cids
-              FROM %s
-              WHERE is_node_link IS FALSE and child_id = %s
-              UNION ALL
-              SELECT
-                S.parent_id,
-                D.child_id,
-                D.level + 1,
-                D.cids || S.child_id
-              FROM ascendants AS D
-                JOIN %s AS S
-                  ON D.parent_id = S.child_id
-              WHERE S.is_node_link IS FALSE
-                AND %s = ANY(cids)
-            ) SELECT parent_id
-              FROM ascendants
-              WHERE child_id = %s
-              ORDER BY level DESC
-              LIMIT 1;
-        """
-        with connection.cursor() as cursor:
-            node_relation_table = AsIs(NodeRelation._meta.db_table)
-            cursor.execute(sql, [node_relation_table, self.pk, node_relation_table, self.pk, self.pk])
-            res = cursor.fetchone()
-            if res:
-                return AbstractNode.objects.get(pk=res[0])
-            return self
+        closure = NodeClosure.objects.filter(descendant=self).select_related('ancestor').order_by('-depth').first()
+        if closure:
+            return closure.ancestor
+        return self
 
     def find_readable_antecedent(self, auth):
         """ Returns first antecendant node readable by <user>.
@@ -1560,18 +1514,35 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
     def get_primary(self, node):
         return NodeRelation.objects.filter(parent=self, child=node, is_node_link=False).exists()
 
-    # TODO optimize me
     def get_descendants_recursive(self, primary_only=False):
-        query = self.nodes_primary if primary_only else self._nodes
-        for node in query.all():
+        if primary_only:
+            yield from self._get_primary_descendants()
+            return
+        for node in self._nodes.all():
             yield node
-            if not primary_only:
-                primary = self.get_primary(node)
-                if primary:
-                    yield from node.get_descendants_recursive(primary_only=primary_only)
-            else:
+            primary = self.get_primary(node)
+            if primary:
                 yield from node.get_descendants_recursive(primary_only=primary_only)
 
+    def _get_primary_descendants(self):
+        """Depth-first walk of the primary tree below this node, loaded in two queries via NodeClosure"""
+        descendants = {node.id: node for node in AbstractNode.objects.get_descendants_of(self)}
+        if not descendants:
+            return
+        children = defaultdict(list)
+        relations = NodeRelation.objects.filter(
+            is_node_link=False,
+            child_id__in=descendants.keys(),
+        ).order_by('parent_id', '_order').values_list('parent_id', 'child_id')
+        for parent_id, child_id in relations:
+            children[parent_id].append(descendants[child_id])
+
+        stack = list(reversed(children[self.id]))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(children[node.id]))
+
     @property
     def nodes_primary(self):
         """For v1 compat."""
@@ -1586,12 +1557,10 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
         """Recursively checks whether the current node or any of its nodes
         contains a pointer.
         """
-        if self.linked_nodes.exists():
-            return True
-        for node in self.nodes_primary:
-            if node.has_pointers_recursive:
-                return True
-        return False
+        return NodeRelation.objects.filter(
+            is_node_link=True,
+            parent__in=AbstractNode.objects.get_descendants_of(self, include_self=True),
+        ).exists()
 
     def add_affiliations(self, user, new):
         # add all of the user's affiliations to the forked or templated node
@@ -1868,15 +1837,29 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
 
         returns a list of [(node, [children]), ...]
         """
-        ret = []
-        for node in self._nodes.order_by('created').all():
-            if condition(auth, node):
-                # base case
-                ret.append((node, []))
-            else:
-                ret.append((node, node.next_descendants(auth, condition)))
-        ret = [item for item in ret if item[1] or condition(auth, item[0])]  # prune empty branches
-        return ret
+        # Load every relation below this node's primary tree at once; nodes reached
+        # through a node link outside of it are walked from there.
+        subtree_ids = set(AbstractNode.objects.get_descendants_of(self, include_self=True).values_list('id', flat=True))
+        children = defaultdict(list)
+        relations = NodeRelation.objects.filter(
+            parent_id__in=subtree_ids,
+        ).select_related('child').order_by('child__created')
+        for relation in relations:
+            children[relation.parent_id].append(relation.child)
+
+        def walk(parent):
+            ret = []
+            for node in children[parent.id]:
+                if condition(auth, node):
+                    # base case
+                    ret.append((node, []))
+                elif node.id in subtree_ids:
+                    ret.append((node, walk(node)))
+                else:
+                    ret.append((node, node.next_descendants(auth, condition)))
+            return [item for item in ret if item[1] or condition(auth, item[0])]  # prune empty branches
+
+        return walk(self)
 
     def node_and_primary_descendants(self):
         """Return an iterator for a node and all of its primary (non-pointer) descendants.
@@ -2419,6 +2402,11 @@ class AbstractNode(DirtyFieldsMixin, TypedModel, AddonModelMixin, IdentifierMixi
         storage_usage_total = storage_usage_cache.get(key)
         if storage_usage_total is not None:
             return storage_usage_total
+
+        storage_usage_total = get_persisted_storage_usage_total(self)
+        if storage_usage_total is not None:
+            storage_usage_cache.set(key, storage_usage_total, settings.STORAGE_USAGE_CACHE_TIMEOUT)
+            return storage_usage_total
         else:
             update_storage_usage(self)  # sets cache
             return storage_usage_cache.get(key)
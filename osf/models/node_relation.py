@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from .base import BaseModel, ObjectIDMixin
 
@@ -25,3 +27,73 @@ class NodeRelation(ObjectIDMixin, BaseModel):
         index_together = (
             ('is_node_link', 'child', 'parent'),
         )
+
+
+class NodeClosure(models.Model):
+    """Transitive closure of the primary (non-node-link) NodeRelation tree.
+
+    One row per (ancestor, descendant) pair at any distance, so descendant, ancestor and
+    root lookups are a single indexed join instead of a recursive CTE. A node is not
+    stored as its own ancestor. Maintained by the NodeRelation signal receivers below.
+    """
+    ancestor = models.ForeignKey('AbstractNode', related_name='closure_descendants', on_delete=models.CASCADE)
+    descendant = models.ForeignKey('AbstractNode', related_name='closure_ancestors', on_delete=models.CASCADE)
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        index_together = (
+            ('descendant', 'depth'),
+        )
+
+    @classmethod
+    def link(cls, parent_id, child_id):
+        """Connect every ancestor of `parent_id` (and itself) to every descendant of `child_id` (and itself)"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {cls._meta.db_table} (ancestor_id, descendant_id, depth)
+                SELECT A.ancestor_id, D.descendant_id, A.depth + D.depth + 1
+                FROM (
+                    SELECT ancestor_id, depth FROM {cls._meta.db_table} WHERE descendant_id = %(parent_id)s
+                    UNION ALL SELECT %(parent_id)s, 0
+                ) AS A
+                CROSS JOIN (
+                    SELECT descendant_id, depth FROM {cls._meta.db_table} WHERE ancestor_id = %(child_id)s
+                    UNION ALL SELECT %(child_id)s, 0
+                ) AS D
+                ON CONFLICT (ancestor_id, descendant_id) DO NOTHING
+                """,
+                {'parent_id': parent_id, 'child_id': child_id},
+            )
+
+    @classmethod
+    def unlink(cls, parent_id, child_id):
+        """Disconnect the subtree rooted at `child_id` from `parent_id` and everything above it"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {cls._meta.db_table}
+                WHERE descendant_id IN (
+                    SELECT descendant_id FROM {cls._meta.db_table} WHERE ancestor_id = %(child_id)s
+                    UNION ALL SELECT %(child_id)s
+                )
+                AND ancestor_id IN (
+                    SELECT ancestor_id FROM {cls._meta.db_table} WHERE descendant_id = %(parent_id)s
+                    UNION ALL SELECT %(parent_id)s
+                )
+                """,
+                {'parent_id': parent_id, 'child_id': child_id},
+            )
+
+
+@receiver(post_save, sender=NodeRelation)
+def add_node_relation_to_closure(sender, instance, created, **kwargs):
+    if created and not instance.is_node_link:
+        NodeClosure.link(instance.parent_id, instance.child_id)
+
+
+@receiver(post_delete, sender=NodeRelation)
+def remove_node_relation_from_closure(sender, instance, **kwargs):
+    if not instance.is_node_link:
+        NodeClosure.unlink(instance.parent_id, instance.child_id)
@@ -55,7 +55,7 @@ from osf.utils.workflows import (
     ApprovalStates,
     SanctionTypes
 )
-from api.caching.tasks import update_storage_usage
+from api.caching.tasks import get_persisted_storage_usage_total, update_storage_usage
 from api.caching import settings as cache_settings
 from api.caching.utils import storage_usage_cache
 from website import settings
@@ -1471,6 +1471,10 @@ class DraftRegistration(ObjectIDMixin, RegistrationResponseMixin, DirtyFieldsMix
         if storage_usage_total is not None:
             return storage_usage_total
 
+        storage_usage_total = get_persisted_storage_usage_total(self.branched_from)
+        if storage_usage_total is not None:
+            return storage_usage_total
+
         update_storage_usage(self)  # sets cache
         return storage_usage_cache.get(key)
 
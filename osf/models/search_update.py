@@ -0,0 +1,49 @@
+from django.db import connection, models
+from django.utils import timezone
+
+from osf.utils.fields import NonNaiveDateTimeField
+
+
+class PendingSearchUpdate(models.Model):
+    """An object whose search document is out of date and waiting to be reindexed.
+
+    Rows are unique per (category, object_id), so any number of saves between two
+    flushes leave a single row behind; `website.search.queue` claims them in batches.
+    """
+    category = models.CharField(max_length=32)
+    object_id = models.PositiveIntegerField()
+    created = NonNaiveDateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('category', 'object_id')
+
+    def __unicode__(self):
+        return f'{self.category}: {self.object_id}'
+
+    @classmethod
+    def mark(cls, category, object_ids):
+        cls.objects.bulk_create(
+            [cls(category=category, object_id=object_id) for object_id in object_ids],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def claim(cls, category, limit):
+        """Delete and return up to `limit` pending object ids, skipping rows another worker holds."""
+        table = cls._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {table}
+                WHERE id IN (
+                    SELECT id FROM {table}
+                    WHERE category = %s
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING object_id
+                """,
+                [category, limit],
+            )
+            return sorted(row[0] for row in cursor.fetchall())
@@ -0,0 +1,53 @@
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from osf.utils.fields import NonNaiveDateTimeField
+from .base import BaseModel
+
+
+class NodeStorageUsage(BaseModel):
+    """Persisted running total of osfstorage bytes (all file versions) for a node.
+
+    Maintained from WaterButler callback deltas so reading a node's usage does not
+    re-sum osf_basefileversionsthrough; `reconciled` records the last time the total
+    was verified against a full recompute.
+    """
+    node = models.OneToOneField('AbstractNode', related_name='storage_usage_record', on_delete=models.CASCADE)
+    total = models.BigIntegerField(default=0)
+    reconciled = NonNaiveDateTimeField(null=True, blank=True)
+
+    def __unicode__(self):
+        return f'{self.node_id}: {self.total}'
+
+    @classmethod
+    def get_total(cls, node):
+        return cls.objects.filter(node=node).values_list('total', flat=True).first()
+
+    @classmethod
+    def set_total(cls, node, total, reconciled=True):
+        now = timezone.now()
+        values = {'total': total, 'modified': now}
+        if reconciled:
+            # The same timestamp as `modified`, so a just-reconciled total doesn't look changed since
+            values['reconciled'] = now
+        # Queryset updates, since save() would stamp `modified` after `reconciled`
+        if not cls.objects.filter(node=node).update(**values):
+            cls.objects.get_or_create(node=node)
+            cls.objects.filter(node=node).update(**values)
+        return total
+
+    @classmethod
+    def apply_delta(cls, node, delta):
+        """Atomically add `delta` bytes to the node's total, never going below zero.
+
+        :return: the new total, or None if the node has no total to adjust yet
+        """
+        updated = cls.objects.filter(node=node).update(
+            total=Greatest(F('total') + delta, 0),
+            modified=timezone.now(),
+        )
+        if not updated:
+            return None
+        return cls.get_total(node)
@@ -57,7 +57,7 @@ from osf.utils.datetime_aware_jsonfield import DateTimeAwareJSONField
 from osf.utils.fields import NonNaiveDateTimeField, LowercaseEmailField, ensure_str
 from osf.utils.names import impute_names
 from osf.utils.requests import check_select_for_update
-from osf.utils.permissions import API_CONTRIBUTOR_PERMISSIONS, MANAGER, MEMBER, MANAGE, ADMIN
+from osf.utils.permissions import API_CONTRIBUTOR_PERMISSIONS, MANAGER, MEMBER, MANAGE, ADMIN, READ_NODE
 from website import settings as website_settings
 from website import filters, mails
 from website.project import new_bookmark_collection
@@ -1664,6 +1664,25 @@ class OSFUser(DirtyFieldsMixin, GuidMixin, BaseModel, AbstractBaseUser, Permissi
         """Returns number of "shared projects" (projects that both users are contributors or group members for)"""
         return self._projects_in_common_query(other_user).count()
 
+    def n_projects_in_common_many(self, other_users):
+        """Returns a dict of user id to number of "shared projects" with each of `other_users`, counted in one query"""
+        from .node import NodeGroupObjectPermission
+
+        other_user_ids = [other_user.id for other_user in other_users]
+        shared_project_counts = (
+            NodeGroupObjectPermission.objects.filter(
+                permission__codename=READ_NODE,
+                group__user__id__in=other_user_ids,
+                content_object_id__in=self.contributor_or_group_member_to.exclude(type='osf.collection').values('id'),
+            )
+            .values('group__user__id')
+            .annotate(n_projects=Count('content_object_id', distinct=True))
+            .values_list('group__user__id', 'n_projects')
+        )
+        n_projects_in_common = dict.fromkeys(other_user_ids, 0)
+        n_projects_in_common.update(shared_project_counts)
+        return n_projects_in_common
+
     def add_unclaimed_record(self, claim_origin, referrer, given_name, email=None):
         """Add a new project entry in the unclaimed records dictionary.
 
@@ -0,0 +1,113 @@
+"""Caches for resolving guid strings to `Guid` rows (and so to their referents).
+
+Two layers, both keyed by the lowercased base guid str:
+
+* a per-request identity map of loaded `Guid` instances, so repeated loads within a
+  request reuse the same instance (and its cached referent) without touching the
+  database. It is only active between `guid_cache_before_request` and
+  `guid_cache_teardown_request` (or inside `guid_cache_scope`), so long-lived
+  processes like celery workers never hold on to stale rows.
+* an optional shared layer in the django cache named by `settings.GUID_CACHE_NAME`
+  (e.g. redis), mapping a guid str to its (id, content_type_id, object_id, created),
+  so a guid can be rebuilt without a query and its referent loaded with one.
+
+Saving or deleting a `Guid` forgets it in both layers (see `osf.models.base`).
+"""
+import contextlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+
+_local = threading.local()
+
+GUID_FIELDS = ('id', '_id', 'content_type_id', 'object_id', 'created')
+DEFAULT_TIMEOUT = 60 * 60  # seconds
+
+
+def _key(guid_str):
+    return guid_str.lower()
+
+
+def _shared_cache():
+    cache_name = getattr(settings, 'GUID_CACHE_NAME', None)
+    return caches[cache_name] if cache_name else None
+
+
+def _shared_key(guid_str):
+    return f'osf.guid:{_key(guid_str)}'
+
+
+def identity_map():
+    """The current request's identity map, or None outside of a request."""
+    return getattr(_local, 'identity_map', None)
+
+
+def guid_cache_before_request():
+    _local.identity_map = {}
+
+
+def guid_cache_teardown_request(*args, **kwargs):
+    _local.identity_map = None
+
+
+@contextlib.contextmanager
+def guid_cache_scope():
+    """Use an identity map for the duration of the block (e.g. within a celery task)."""
+    previous = identity_map()
+    _local.identity_map = {} if previous is None else previous
+    try:
+        yield
+    finally:
+        _local.identity_map = previous
+
+
+def get_guid(guid_cls, guid_str):
+    """Return a cached `Guid` instance for `guid_str`, or None on a miss."""
+    _identity_map = identity_map()
+    if _identity_map is not None and _key(guid_str) in _identity_map:
+        return _identity_map[_key(guid_str)]
+    cache = _shared_cache()
+    if cache is None:
+        return None
+    values = cache.get(_shared_key(guid_str))
+    if values is None:
+        return None
+    guid = guid_cls.from_db(router.db_for_read(guid_cls), GUID_FIELDS, values)
+    remember(guid, share=False)
+    return guid
+
+
+def remember(guid, share=True):
+    _identity_map = identity_map()
+    if _identity_map is not None:
+        _identity_map[_key(guid._id)] = guid
+    cache = _shared_cache()
+    if share and cache is not None:
+        values = tuple(getattr(guid, field) for field in GUID_FIELDS)
+        # Only share rows that are committed, so a rollback can't leave a phantom mapping behind
+        transaction.on_commit(lambda: cache.set(
+            _shared_key(guid._id),
+            values,
+            timeout=getattr(settings, 'GUID_CACHE_TIMEOUT', DEFAULT_TIMEOUT),
+        ))
+
+
+def forget(guid_str):
+    if not guid_str:
+        return
+    _identity_map = identity_map()
+    if _identity_map is not None:
+        _identity_map.pop(_key(guid_str), None)
+    cache = _shared_cache()
+    if cache is not None:
+        cache.delete(_shared_key(guid_str))
+        # Again after commit, in case another process re-cached the old row in the meantime
+        transaction.on_commit(lambda: cache.delete(_shared_key(guid_str)))
+
+
+handlers = {
+    'before_request': guid_cache_before_request,
+    'teardown_request': guid_cache_teardown_request,
+}
@@ -0,0 +1,105 @@
+import dataclasses
+from unittest import mock
+
+import pytest
+from django.db import OperationalError
+
+from osf.management.commands import monthly_reporters_go as reporters_go
+from osf.metrics.reporters._base import MonthlyReporter
+from osf.models import MonthlyReporterCheckpoint
+
+
+@dataclasses.dataclass
+class _CountingReporter(MonthlyReporter):
+    REPORT_CHUNK_SIZE = 2
+    fail_after: int | None = None
+
+    def iter_report_kwargs(self, continue_after=None):
+        _start = continue_after['n'] + 1 if continue_after else 0
+        for _n in range(_start, 5):
+            if self.fail_after is not None and _n > self.fail_after:
+                raise OperationalError
+            yield {'n': _n}
+
+
+@pytest.mark.django_db
+class TestMonthlyReportersGo:
+
+    @pytest.fixture
+    def mock_do_chunk(self):
+        with mock.patch.object(reporters_go.monthly_reporter_do_chunk, 'apply_async') as _mock:
+            yield _mock
+
+    def _chunks(self, mock_do_chunk):
+        return [
+            [_kwargs['n'] for _kwargs in _call.kwargs['kwargs']['report_kwargs_list']]
+            for _call in mock_do_chunk.call_args_list
+        ]
+
+    def test_schedules_chunks(self, mock_do_chunk):
+        with mock.patch.object(reporters_go, '_get_reporter', return_value=_CountingReporter(None)):
+            reporters_go.schedule_monthly_reporter(yearmonth='2024-08', reporter_key='COUNTING')
+        assert self._chunks(mock_do_chunk) == [[0, 1], [2, 3], [4]]
+        _checkpoint = MonthlyReporterCheckpoint.objects.get(reporter_key='COUNTING', report_yearmonth='2024-08')
+        assert _checkpoint.scheduling_done
+        assert _checkpoint.chunks_scheduled == 3
+        assert _checkpoint.continue_after == {'n': 4}
+
+    def test_resumes_after_checkpoint(self, mock_do_chunk):
+        MonthlyReporterCheckpoint.objects.create(
+            reporter_key='COUNTING',
+            report_yearmonth='2024-08',
+            continue_after={'n': 1},
+            chunks_scheduled=1,
+        )
+        with mock.patch.object(reporters_go, '_get_reporter', return_value=_CountingReporter(None)):
+            reporters_go.schedule_monthly_reporter(yearmonth='2024-08', reporter_key='COUNTING')
+            assert self._chunks(mock_do_chunk) == [[2, 3], [4]]
+            # once scheduled, running again schedules nothing
+            mock_do_chunk.reset_mock()
+            reporters_go.schedule_monthly_reporter(yearmonth='2024-08', reporter_key='COUNTING')
+        assert not mock_do_chunk.called
+
+    @mock.patch('osf.management.commands.monthly_reporters_go.framework.sentry.log_exception')
+    @mock.patch.object(reporters_go.schedule_monthly_reporter, 'apply_async')
+    def test_error_continues_after_last_chunk(self, mock_schedule, mock_log, mock_do_chunk):
+        with mock.patch.object(reporters_go, '_get_reporter', return_value=_CountingReporter(None, fail_after=2)):
+            reporters_go.schedule_monthly_reporter(yearmonth='2024-08', reporter_key='COUNTING')
+        assert self._chunks(mock_do_chunk) == [[0, 1]]
+        assert mock_schedule.call_args.kwargs['kwargs']['continue_after'] == {'n': 1}
+        assert not MonthlyReporterCheckpoint.objects.get(reporter_key='COUNTING').scheduling_done
+
+    def test_do_chunk(self):
+        MonthlyReporterCheckpoint.objects.create(reporter_key='COUNTING', report_yearmonth='2024-08', chunks_scheduled=1)
+        _reporter = _CountingReporter(None)
+        _reports = [mock.Mock(), None]
+        with mock.patch.object(reporters_go, '_get_reporter', return_value=_reporter), \
+                mock.patch.object(_reporter, 'report_many', return_value=iter(_reports)) as mock_report_many:
+            reporters_go.monthly_reporter_do_chunk(
+                reporter_key='COUNTING',
+                yearmonth='2024-08',
+                report_kwargs_list=[{'n': 0}, {'n': 1}],
+            )
+        mock_report_many.assert_called_once_with([{'n': 0}, {'n': 1}])
+        _reports[0].save.assert_called_once_with()
+        _checkpoint = MonthlyReporterCheckpoint.objects.get(reporter_key='COUNTING')
+        assert _checkpoint.chunks_done == 1
+        assert _checkpoint.reports_saved == 1
+        assert 'COUNTING 2024-08 -- 1 of 1 chunks done' in _checkpoint.progress_message()
+
+    def test_retry_failed_chunks(self, mock_do_chunk):
+        MonthlyReporterCheckpoint.objects.create(
+            reporter_key='COUNTING',
+            report_yearmonth='2024-08',
+            failed_chunks=[[{'n': 2}, {'n': 3}]],
+        )
+        reporters_go.monthly_reporters_go(yearmonth='2024-08', reporter_key='COUNTING', retry_failed=True)
+        assert self._chunks(mock_do_chunk) == [[2, 3]]
+        assert MonthlyReporterCheckpoint.objects.get(reporter_key='COUNTING').failed_chunks == []
+
+    @mock.patch.object(reporters_go.schedule_monthly_reporter, 'apply_async')
+    def test_restart_forgets_checkpoint(self, mock_schedule):
+        MonthlyReporterCheckpoint.objects.create(reporter_key='COUNTING', report_yearmonth='2024-08', scheduling_done=True)
+        reporters_go.monthly_reporters_go(yearmonth='2024-08', reporter_key='COUNTING', restart=True)
+        assert not MonthlyReporterCheckpoint.objects.exists()
+        assert mock_schedule.called
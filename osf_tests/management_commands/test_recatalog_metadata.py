@@ -20,7 +20,7 @@ class TestRecatalogMetadata:
 
     @pytest.fixture
     def mock_update_share_task(self):
-        with mock.patch('osf.management.commands.recatalog_metadata.task__update_share') as _shmock:
+        with mock.patch('osf.management.commands.recatalog_metadata.task__update_share_batch') as _shmock:
             yield _shmock
 
     @pytest.fixture
@@ -106,8 +106,9 @@ class TestRecatalogMetadata:
     ):
         def _actual_osfids() -> set[str]:
             return {
-                _call[-1]['kwargs']['guid']
+                _guid
                 for _call in mock_update_share_task.apply_async.mock_calls
+                for _guid in _call[-1]['kwargs']['guids']
             }
 
         # test preprints
@@ -184,7 +185,10 @@ class TestRecatalogMetadata:
             '--chunk-size=2',
             '--chunk-count=2',
         )
-        assert mock_update_share_task.apply_async.mock_calls == expected_apply_async_calls(registrations[2:6])
+        assert mock_update_share_task.apply_async.mock_calls == [
+            *expected_apply_async_calls(registrations[2:4]),
+            *expected_apply_async_calls(registrations[4:6]),
+        ]
 
         mock_update_share_task.reset_mock()
 
@@ -212,15 +216,15 @@ class TestRecatalogMetadata:
 # local utils
 
 def expected_apply_async_calls(items):
+    # one call per chunk of items
     return [
         mock.call(
             kwargs={
-                'guid': _osfid,
+                'guids': list(_iter_osfids(items)),
                 'is_backfill': True,
             },
             queue='low',
         )
-        for _osfid in _iter_osfids(items)
     ]
 
 
@@ -2,6 +2,7 @@ from unittest import mock
 
 import rdflib
 import pytest
+from django.core.cache import cache
 
 from osf.metadata import gather
 
@@ -81,3 +82,95 @@ def test_goodbasket():
     assert len(basket.gathered_metadata) == 0
     assert len(basket._gathertasks_done) == 0
     assert len(basket._known_focus_dict) == 1
+
+
+class VersionedFocus(gather.Focus):
+    version = 'v1'
+
+    def cache_version(self):
+        return self.version
+
+
+@mock.patch('osf.metadata.gather.gatherer.__gatherer_registry', new={})
+def test_shared_gather_cache():
+    BLARG = rdflib.Namespace('https://blarg.example/blarg/')
+    mock_gatherer = mock.Mock(return_value=(
+        (BLARG.item, BLARG.zork, BLARG.zorked),
+    ))
+    gather.er(BLARG.zork)(mock_gatherer)
+    focus = VersionedFocus(BLARG.item, BLARG.Type)
+    gather_cache = gather.GatherCache()
+    basket_one = gather.Basket(focus, gather_cache=gather_cache)
+    basket_two = gather.Basket(focus, gather_cache=gather_cache)
+    assert set(basket_one[BLARG.zork]) == {BLARG.zorked}
+    assert set(basket_two[BLARG.zork]) == {BLARG.zorked}
+    mock_gatherer.assert_called_once()
+    assert (gather_cache.hits, gather_cache.misses) == (1, 1)
+    # a new focus version is gathered anew
+    focus.version = 'v2'
+    basket_three = gather.Basket(focus, gather_cache=gather_cache)
+    assert set(basket_three[BLARG.zork]) == {BLARG.zorked}
+    assert mock_gatherer.call_count == 2
+    # unshared baskets gather for themselves
+    assert set(gather.Basket(focus)[BLARG.zork]) == {BLARG.zorked}
+    assert mock_gatherer.call_count == 3
+
+
+@mock.patch('osf.metadata.gather.gatherer.__gatherer_registry', new={})
+def test_cacheable_gatherer_shared_across_caches():
+    BLARG = rdflib.Namespace('https://blarg.example/blarg/')
+    calls = []
+
+    @gather.er(BLARG.zork, cacheable=True)
+    def gather_zork(focus):
+        calls.append('zork')
+        yield (BLARG.zork, BLARG.zorked)
+
+    @gather.er(BLARG.bork)
+    def gather_bork(focus):
+        calls.append('bork')
+        yield (BLARG.bork, BLARG.borked)
+
+    cache.clear()
+    focus = VersionedFocus(BLARG.item, BLARG.Type)
+    for _ in range(2):
+        basket = gather.Basket(focus)  # each with its own GatherCache
+        assert set(basket[BLARG.zork]) == {BLARG.zorked}
+        assert set(basket[BLARG.bork]) == {BLARG.borked}
+    assert calls == ['zork', 'bork', 'bork']
+    # unversioned foci are never shared
+    unversioned = gather.Focus(BLARG.item, BLARG.Type)
+    assert set(gather.Basket(unversioned)[BLARG.zork]) == {BLARG.zorked}
+    assert calls == ['zork', 'bork', 'bork', 'zork']
+
+
+@mock.patch('osf.metadata.gather.gatherer.__prefetcher_registry', new={})
+@mock.patch('osf.metadata.gather.gatherer.__gatherer_registry', new={})
+def test_pls_gather_many():
+    BLARG = rdflib.Namespace('https://blarg.example/blarg/')
+    prefetched = []
+
+    @gather.er(BLARG.zork, focustype_iris=[BLARG.Type])
+    def gather_zork(focus):
+        yield (BLARG.zork, BLARG[f'{focus.iri}-zorked'])
+
+    @gather.prefetcher(gather_zork)
+    def prefetch_zork(foci):
+        prefetched.append([_focus.iri for _focus in foci])
+
+    foci = [
+        gather.Focus(BLARG.one, BLARG.Type),
+        gather.Focus(BLARG.two, BLARG.Type),
+    ]
+    baskets = gather.Basket.pls_gather_many(foci, {BLARG.zork: {}})
+    assert prefetched == [[BLARG.one, BLARG.two]]  # once for all foci
+    assert [_basket.focus for _basket in baskets] == foci
+    assert set(baskets[0][BLARG.zork]) == {BLARG[f'{BLARG.one}-zorked']}
+    assert set(baskets[1][BLARG.zork]) == {BLARG[f'{BLARG.two}-zorked']}
+    assert baskets[0].gather_cache is baskets[1].gather_cache
+    # foci of mixed types are refused
+    with pytest.raises(AssertionError):
+        gather.Basket.pls_gather_many([
+            gather.Focus(BLARG.one, BLARG.Type),
+            gather.Focus(BLARG.two, BLARG.OtherType),
+        ])
@@ -893,3 +893,20 @@ class TestOsfGathering(TestCase):
         assert_triples(osf_gathering.gather_storage_byte_count(self.preprintfocus), {
             (self.preprintfocus.iri, OSF.storageByteCount, Literal(1337)),
         })
+
+    def test_pls_get_magic_metadata_baskets(self):
+        self.project.update_tags(['woop', 'a', 'doo'], auth=Auth(self.user__admin))
+        _items = [self.project, self.registration, self.component]
+        _baskets = osf_gathering.pls_get_magic_metadata_baskets(_items)
+        assert [_basket.focus.dbmodel for _basket in _baskets] == _items
+        assert _baskets[0].gather_cache is _baskets[1].gather_cache
+        # prefetched or not, gatherers gather the same
+        for _basket, _single_focus in zip(_baskets, (self.projectfocus, self.registrationfocus, self.componentfocus)):
+            assert _basket.focus == _single_focus
+            for _gatherer in (
+                osf_gathering.gather_agents,
+                osf_gathering.gather_qualified_attributions,
+                osf_gathering.gather_keywords,
+                osf_gathering.gather_subjects,
+            ):
+                assert_triples(_gatherer(_basket.focus), set(_gatherer(_single_focus)))
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from operator import attrgetter
 from unittest import mock
 
+from elasticsearch6_dsl import Search
 import pytest
 
 from osf.metrics.counted_usage import CountedAuthUsage
@@ -242,6 +243,16 @@ class TestPublicItemUsageReporter:
         assert _busy_item2.download_count == 11
         assert _busy_item2.download_session_count == 11
 
+    def test_report_many(self, ym_busy, busy_month_item0, busy_month_item1, busy_month_item2):
+        _reporter = PublicItemUsageReporter(ym_busy)
+        _kwargs_list = list(_reporter.iter_report_kwargs())
+        _one_by_one = [_reporter.report(**_kwargs) for _kwargs in _kwargs_list]
+        with mock.patch.object(Search, 'execute', autospec=True, side_effect=Search.execute) as mock_execute:
+            _batched = list(_reporter.report_many(_kwargs_list))
+        # one search for counted usage, one each for preprint views and downloads
+        assert mock_execute.call_count == 3
+        assert [_report.to_dict() for _report in _batched] == [_report.to_dict() for _report in _one_by_one]
+
 
 def _save_usage(
     item,
@@ -763,6 +763,54 @@ class TestNodeSearch(OsfTestCase):
             assert doc['license'].get('id') == new_license.license_id
 
 
+@pytest.mark.enable_search
+@pytest.mark.enable_enqueue_task
+class TestBulkReindexNodes(OsfTestCase):
+
+    def setUp(self):
+        super().setUp()
+        search.delete_index(elastic_search.INDEX)
+        search.create_index(elastic_search.INDEX)
+        self.user = factories.UserFactory(fullname='Ali Farka Toure')
+        self.project = factories.ProjectFactory(creator=self.user, is_public=True, title='Savane')
+        self.project.add_tag('blues', Auth(self.user), save=True)
+        self.project.affiliated_institutions.add(factories.InstitutionFactory())
+        self.component = factories.NodeFactory(parent=self.project, creator=self.user, is_public=True, title='Ai Du')
+        self.private = factories.ProjectFactory(creator=self.user, is_public=False, title='Talking Timbuktu')
+        self.wiki_page = WikiPage.objects.create_for_node(self.project, 'home', 'Niafunke', Auth(self.user))
+
+    def test_prefetched_document_matches_unprefetched(self):
+        nodes = [self.project, self.component]
+        prefetched = elastic_search.prefetch_node_search_data(nodes)
+        for node in nodes:
+            category = elastic_search.get_doctype_from_node(node)
+            assert elastic_search.serialize_node(node, category, prefetched=prefetched[node.id]) == \
+                elastic_search.serialize_node(node, category)
+
+    def test_bulk_reindex_nodes(self):
+        search.delete_index(elastic_search.INDEX)
+        search.create_index(elastic_search.INDEX)
+        stats = elastic_search.bulk_reindex_nodes(
+            [self.project.id, self.component.id, self.private.id],
+            refresh=True,
+        )
+        assert stats['succeeded'] == 3
+        assert stats['failed'] == 0
+
+        docs = query('category:project AND Savane')['results']
+        assert len(docs) == 1
+        assert docs[0]['tags'] == ['blues']
+        assert query('category:component AND "Ai Du"')['results']
+        assert not query('"Talking Timbuktu"')['results']
+
+    def test_bulk_reindex_node_contributors(self):
+        self.user.fullname = 'Toumani Diabate'
+        self.user.save()
+        elastic_search.bulk_reindex_node_contributors([self.project.id], refresh=True)
+        docs = query('category:project AND Savane')['results']
+        assert [c['fullname'] for c in docs[0]['contributors']] == ['Toumani Diabate']
+
+
 @pytest.mark.enable_search
 @pytest.mark.enable_enqueue_task
 class TestRegistrationRetractions(OsfTestCase):
@@ -1107,6 +1155,22 @@ class TestAddContributor(OsfTestCase):
         results = query(unreg.fullname)['results']
         assert len(results) == 1
 
+    def test_search_projects_in_common(self):
+        current_user = factories.UserFactory()
+        with run_celery_tasks():
+            project = factories.ProjectFactory(creator=current_user)
+            project.add_contributor(self.user, auth=Auth(current_user))
+            project.save()
+        contribs = search.search_contributor(self.name1, current_user=current_user)
+        assert [contrib['n_projects_in_common'] for contrib in contribs['users']] == [1]
+        assert contribs['users'][0]['profile_url'] == self.user.profile_url
+
+        contribs = search.search_contributor(self.name1, current_user=self.user)
+        assert [contrib['n_projects_in_common'] for contrib in contribs['users']] == [-1]
+
+        contribs = search.search_contributor(self.name3, current_user=current_user)
+        assert [contrib['n_projects_in_common'] for contrib in contribs['users']] == [0]
+
     def test_search_fullname(self):
         # Searching for full name yields exactly one result.
         contribs = search.search_contributor(self.name1)
@@ -1,13 +1,16 @@
 from unittest import mock
 from urllib.parse import quote
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone
 from django.core.exceptions import MultipleObjectsReturned
 import pytest
 
 from framework.auth import Auth
-from osf.models import Guid, GuidVersionsThrough, NodeLicenseRecord, OSFUser, Preprint
+from osf.models import Guid, GuidVersionsThrough, Node, NodeLicenseRecord, OSFUser, Preprint, Registration
 from osf.models.base import VersionedGuidMixin
+from osf.utils.guid_cache import guid_cache_scope
 from osf.utils.permissions import ADMIN
 from osf_tests.factories import (
     AuthUserFactory,
@@ -141,6 +144,82 @@ class TestReferent:
             pytest.fail(f'Multiple objects returned for {Factory._meta.model} with multiple guids. {ex}')
 
 
+@pytest.mark.django_db
+class TestGuidCache:
+
+    def test_identity_map(self):
+        node = NodeFactory()
+        with guid_cache_scope():
+            guid = Guid.load(node._id)
+            assert guid.referent == node
+            with CaptureQueriesContext(connection) as queries:
+                assert Guid.load(node._id) is guid
+                assert Guid.load(node._id.upper()).referent == node
+                assert Guid.load_referent(node._id)[0] == node
+            assert not queries.captured_queries
+        # no identity map outside of a scope
+        assert Guid.load(node._id) is not guid
+
+    def test_guid_mixin_load(self):
+        node = NodeFactory()
+        user = UserFactory()
+        with guid_cache_scope():
+            assert Node.load(node._id) == node
+            with CaptureQueriesContext(connection) as queries:
+                assert Node.load(node._id) == node
+                assert OSFUser.load(node._id) is None
+            assert not queries.captured_queries
+            assert OSFUser.load(user._id) == user
+            assert Registration.load(node._id) is None
+
+    def test_repoint_invalidates(self):
+        node = NodeFactory()
+        other_node = NodeFactory()
+        with guid_cache_scope():
+            guid = Guid.load(node._id)
+            guid.referent = other_node
+            guid.save()
+            assert Guid.load(node._id).referent == other_node
+            guid.delete()
+            assert Guid.load(node._id) is None
+
+    @override_settings(GUID_CACHE_NAME='default')
+    def test_shared_cache(self, django_capture_on_commit_callbacks):
+        node = NodeFactory()
+        with django_capture_on_commit_callbacks(execute=True):
+            Guid.load(node._id)
+        with CaptureQueriesContext(connection) as queries:
+            guid = Guid.load(node._id)
+        assert not queries.captured_queries
+        assert guid.referent == node
+        with django_capture_on_commit_callbacks(execute=True):
+            guid.referent = UserFactory()
+            guid.save()
+        with CaptureQueriesContext(connection) as queries:
+            assert Guid.load(node._id).referent != node
+        assert queries.captured_queries
+
+    def test_load_many(self):
+        nodes = [NodeFactory(), NodeFactory()]
+        user = UserFactory()
+        preprint = PreprintFactory()
+        guid_strs = [nodes[0]._id, nodes[1]._id, user._id, preprint._id, 'nope']
+        with CaptureQueriesContext(connection) as queries:
+            guids = Guid.load_many(guid_strs)
+        # one for the guids, one per content type
+        assert len(queries.captured_queries) <= 4
+        assert set(guids) == set(guid_strs) - {'nope'}
+        with CaptureQueriesContext(connection) as queries:
+            referents = {guid_str: guid.referent for guid_str, guid in guids.items()}
+        assert not queries.captured_queries
+        assert referents == {
+            nodes[0]._id: nodes[0],
+            nodes[1]._id: nodes[1],
+            user._id: user,
+            preprint._id: preprint,
+        }
+
+
 @pytest.mark.enable_bookmark_creation
 class TestResolveGuid(OsfTestCase):
 
@@ -1,10 +1,15 @@
 import logging
 import pytest
 import requests
+import responses
 from http import HTTPStatus
+from unittest import mock
+
+from django.core.cache import cache
 
 from osf.external.gravy_valet import (
     auth_helpers as gv_auth,
+    client as gv_client,
     translations,
     request_helpers as gv_requests
 )
@@ -496,6 +501,101 @@ class TestRequestHelpers:
         assert not expected_addons  # all addons popped
 
 
+@pytest.mark.django_db
+class TestGVClient:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        gv_client.stats.reset()
+        with mock.patch('website.settings.GRAVYVALET_CACHE_TIMEOUT', 60):
+            yield
+        cache.clear()
+
+    @pytest.fixture
+    def fake_gv(self):
+        return gv_fakes.FakeGravyValet()
+
+    @pytest.fixture
+    def contributor(self):
+        return factories.AuthUserFactory()
+
+    @pytest.fixture
+    def resource(self, contributor):
+        return factories.ProjectFactory(creator=contributor)
+
+    @pytest.fixture
+    def configured_addon(self, fake_gv, resource, contributor):
+        external_service = fake_gv.configure_fake_provider('blarg')
+        external_account = fake_gv.configure_fake_account(contributor, external_service.name)
+        return fake_gv.configure_fake_addon(resource, external_account)
+
+    def _get_addon(self, resource, contributor, configured_addon):
+        return gv_requests.get_addon(
+            gv_addon_pk=configured_addon.pk,
+            requested_resource=resource,
+            requesting_user=contributor,
+            addon_type='configured-storage-addons',
+        )
+
+    def test_get_responses_cached(self, fake_gv, resource, contributor, configured_addon):
+        with fake_gv.run_fake() as requests_mock:
+            first = self._get_addon(resource, contributor, configured_addon)
+            second = self._get_addon(resource, contributor, configured_addon)
+            assert len(requests_mock.calls) == 1
+            # another user is signed with other permissions, so gets their own response
+            gv_requests.get_addon(
+                gv_addon_pk=configured_addon.pk,
+                requested_resource=resource,
+                requesting_user=factories.AuthUserFactory(),
+                addon_type='configured-storage-addons',
+            )
+            assert len(requests_mock.calls) == 2
+        assert first.json() == second.json()
+        (stat, ) = gv_client.stats.snapshot().values()
+        assert stat['count'] == 2
+        assert stat['cache_hits'] == 1
+
+    def test_forget_resource(self, fake_gv, resource, contributor, configured_addon):
+        with fake_gv.run_fake() as requests_mock:
+            self._get_addon(resource, contributor, configured_addon)
+            gv_client.forget_resource(resource.get_semantic_iri())
+            self._get_addon(resource, contributor, configured_addon)
+            assert len(requests_mock.calls) == 2
+
+    def test_not_cached_when_disabled(self, fake_gv, resource, contributor, configured_addon):
+        with mock.patch('website.settings.GRAVYVALET_CACHE_TIMEOUT', 0), fake_gv.run_fake() as requests_mock:
+            self._get_addon(resource, contributor, configured_addon)
+            self._get_addon(resource, contributor, configured_addon)
+            assert len(requests_mock.calls) == 2
+
+    def test_resource_addons_sent_together(self, fake_gv, resource, contributor, configured_addon):
+        with fake_gv.run_fake(), mock.patch.object(gv_client, 'send_many', wraps=gv_client.send_many) as mock_send_many:
+            addons = list(gv_requests.iterate_addons_for_resource(
+                requested_resource=resource,
+                requesting_user=contributor,
+            ))
+        assert [addon.resource_id for addon in addons] == [configured_addon.pk]
+        (gv_requests_sent, ), _ = mock_send_many.call_args
+        assert len(gv_requests_sent) == len(gv_requests.AddonType)
+
+    def test_session_keeps_no_cookies(self):
+        with responses.RequestsMock() as requests_mock:
+            requests_mock.add(
+                responses.GET, f'{GRAVYVALET_URL}/v1/user-references/1',
+                json={}, headers={'Set-Cookie': 'sessionid=abc; Path=/'},
+            )
+            requests_mock.add(responses.GET, f'{GRAVYVALET_URL}/v1/user-references/2', json={})
+            for pk in (1, 2):
+                gv_client.send(gv_client.GVRequest('GET', f'{GRAVYVALET_URL}/v1/user-references/{pk}', headers={}))
+            assert 'Cookie' not in requests_mock.calls[1].request.headers
+
+    def test_endpoint_name(self):
+        assert gv_client.endpoint_name(
+            'GET', gv_requests.WB_CONFIG_ENDPOINT.format(pk=12, addon_type='configured-storage-addons'),
+        ) == 'GET /v1/configured-storage-addons/{pk}/waterbutler-credentials'
+
+
 @pytest.mark.django_db
 class TestEphemeralSettings:
 
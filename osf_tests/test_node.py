@@ -32,6 +32,7 @@ from osf.models import (
     Contributor,
     RegistrationSchema,
     NodeRelation,
+    NodeClosure,
     Registration,
     DraftRegistration,
     CollectionSubmission
@@ -570,6 +571,57 @@ class TestRoot:
                 assert p.parent_node._id in parent_list
 
 
+@pytest.mark.django_db
+class TestNodeClosure:
+
+    @pytest.fixture()
+    def tree(self, project):
+        child = NodeFactory(parent=project)
+        grandchild = NodeFactory(parent=child)
+        sibling = NodeFactory(parent=project)
+        return project, child, grandchild, sibling
+
+    def test_closure_rows(self, tree):
+        project, child, grandchild, sibling = tree
+        assert set(NodeClosure.objects.filter(ancestor=project).values_list('descendant_id', 'depth')) == {
+            (child.id, 1), (grandchild.id, 2), (sibling.id, 1),
+        }
+        assert set(NodeClosure.objects.filter(descendant=grandchild).values_list('ancestor_id', 'depth')) == {
+            (child.id, 1), (project.id, 2),
+        }
+
+    def test_node_links_are_not_in_closure(self, tree):
+        project, child, grandchild, sibling = tree
+        linked = ProjectFactory(creator=project.creator)
+        NodeRelationFactory(parent=grandchild, child=linked, is_node_link=True)
+        assert not NodeClosure.objects.filter(descendant=linked).exists()
+
+    def test_queryset_helpers(self, tree):
+        project, child, grandchild, sibling = tree
+        assert set(AbstractNode.objects.get_descendants_of(child)) == {grandchild}
+        assert set(AbstractNode.objects.get_descendants_of(child, include_self=True)) == {child, grandchild}
+        assert set(AbstractNode.objects.get_ancestors_of(grandchild)) == {project, child}
+        assert set(AbstractNode.objects.get_children(child, include_root=True)) == {child, grandchild}
+
+    def test_get_root(self, tree):
+        project, child, grandchild, sibling = tree
+        assert grandchild.get_root() == project
+        assert project.get_root() == project
+
+    def test_has_pointers_recursive(self, tree):
+        project, child, grandchild, sibling = tree
+        assert not project.has_pointers_recursive
+        NodeRelationFactory(parent=grandchild, child=ProjectFactory(), is_node_link=True)
+        assert project.has_pointers_recursive
+        assert not sibling.has_pointers_recursive
+
+    def test_removing_relation_detaches_subtree(self, tree):
+        project, child, grandchild, sibling = tree
+        NodeRelation.objects.get(parent=project, child=child).delete()
+        assert set(AbstractNode.objects.get_descendants_of(project)) == {sibling}
+        assert set(AbstractNode.objects.get_descendants_of(child)) == {grandchild}
+
+
 @pytest.mark.enable_implicit_clean
 class TestNodeMODMCompat:
 
@@ -4470,6 +4522,19 @@ class TestAdminImplicitRead:
         assert lvl2component in qs
         assert lvl3component in qs
 
+    def test_node_link_does_not_grant_implicit_read(self, admin_user, project):
+        linked = ProjectFactory(is_public=False)
+        NodeRelationFactory(parent=project, child=linked, is_node_link=True)
+
+        assert linked not in Node.objects.can_view(admin_user)
+
+    def test_removing_admin_revokes_implicit_read(self, admin_user, project, creator, lvl2component):
+        assert lvl2component in Node.objects.can_view(admin_user)
+
+        project.remove_contributor(admin_user, auth=Auth(creator))
+
+        assert lvl2component not in Node.objects.can_view(admin_user)
+
     def test_private_link(self, jane_doe, project, lvl1component):
         pl = PrivateLinkFactory()
         lvl1component.private_links.add(pl)
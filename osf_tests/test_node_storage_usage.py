@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pytest
+
+from api.caching import settings as cache_settings
+from api.caching.tasks import (
+    adjust_storage_usage_total,
+    get_storage_usage_total,
+    reconcile_storage_usage,
+)
+from api.caching.utils import storage_usage_cache
+from api_tests.utils import create_test_file
+from osf.management.commands.reconcile_storage_usage import reconcile_storage_usage_totals
+from osf.models import NodeStorageUsage
+from osf_tests.factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestNodeStorageUsage:
+
+    @pytest.fixture()
+    def node(self):
+        return ProjectFactory()
+
+    @pytest.fixture()
+    def cache_key(self, node):
+        return cache_settings.STORAGE_USAGE_KEY.format(target_id=node._id)
+
+    def test_apply_delta_without_total(self, node):
+        assert NodeStorageUsage.apply_delta(node, 100) is None
+        assert not NodeStorageUsage.objects.filter(node=node).exists()
+
+    def test_apply_delta(self, node):
+        NodeStorageUsage.set_total(node, 100)
+        assert NodeStorageUsage.apply_delta(node, 50) == 150
+        assert NodeStorageUsage.apply_delta(node, -500) == 0
+
+    def test_adjust_seeds_total_from_cache(self, node, cache_key):
+        storage_usage_cache.set(cache_key, 1000)
+        adjust_storage_usage_total(node, 337)
+        assert NodeStorageUsage.get_total(node) == 1337
+        assert storage_usage_cache.get(cache_key) == 1337
+        assert NodeStorageUsage.objects.get(node=node).reconciled is None
+
+    def test_storage_usage_reads_persisted_total(self, node, cache_key):
+        NodeStorageUsage.set_total(node, 42)
+        storage_usage_cache.delete(cache_key)
+        assert node.storage_usage == 42
+        assert storage_usage_cache.get(cache_key) == 42
+
+    def test_get_storage_usage_total_persists_recompute(self, node):
+        create_test_file(node, node.creator, size=1337)
+        assert get_storage_usage_total(node) == 1337
+        assert NodeStorageUsage.get_total(node) == 1337
+
+    def test_reconcile_repairs_drift(self, node, cache_key):
+        create_test_file(node, node.creator, size=1337)
+        NodeStorageUsage.set_total(node, 5)
+
+        drifted = reconcile_storage_usage([node.id], dry_run=True)
+        assert drifted == {node.id: (5, 1337)}
+        assert NodeStorageUsage.get_total(node) == 5
+
+        reconcile_storage_usage([node.id])
+        assert NodeStorageUsage.get_total(node) == 1337
+        assert storage_usage_cache.get(cache_key) == 1337
+        assert reconcile_storage_usage([node.id]) == {}
+
+    def test_reconcile_selects_only_changed_totals(self, node):
+        other_node = ProjectFactory()
+        NodeStorageUsage.set_total(node, 100)
+        NodeStorageUsage.set_total(other_node, 100, reconciled=False)
+        record = NodeStorageUsage.objects.get(node=node)
+        assert record.reconciled == record.modified
+
+        with mock.patch('osf.management.commands.reconcile_storage_usage.reconcile_storage_usage', return_value={}) as mock_reconcile:
+            reconcile_storage_usage_totals()
+        assert mock_reconcile.call_args[0][0] == [other_node.id]
+
+        NodeStorageUsage.set_total(other_node, 100)
+        NodeStorageUsage.apply_delta(node, 10)
+        with mock.patch('osf.management.commands.reconcile_storage_usage.reconcile_storage_usage', return_value={}) as mock_reconcile:
+            reconcile_storage_usage_totals()
+        assert mock_reconcile.call_args[0][0] == [node.id]
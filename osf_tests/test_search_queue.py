@@ -0,0 +1,88 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from osf.models import PendingSearchUpdate
+from osf_tests.factories import ProjectFactory
+from website import settings
+from website.search import queue as search_queue
+from website.search import search
+
+
+@pytest.mark.django_db
+class TestPendingSearchUpdate:
+
+    def test_mark_deduplicates(self):
+        PendingSearchUpdate.mark('node', [1, 2])
+        PendingSearchUpdate.mark('node', [2, 3])
+        PendingSearchUpdate.mark('preprint', [2])
+        assert PendingSearchUpdate.objects.filter(category='node').count() == 3
+        assert PendingSearchUpdate.objects.filter(category='preprint').count() == 1
+
+    def test_claim(self):
+        PendingSearchUpdate.mark('node', [3, 1, 2])
+        PendingSearchUpdate.mark('preprint', [4])
+        assert PendingSearchUpdate.claim('node', 2) == [1, 2]
+        assert PendingSearchUpdate.claim('node', 2) == [3]
+        assert PendingSearchUpdate.claim('node', 2) == []
+        assert PendingSearchUpdate.objects.filter(category='preprint').count() == 1
+
+
+@pytest.mark.django_db
+class TestSearchUpdateQueue:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture()
+    def node(self):
+        return ProjectFactory(is_public=True)
+
+    @mock.patch('website.search.queue.enqueue_task')
+    def test_mark_dirty_schedules_one_flush_per_window(self, mock_enqueue, node):
+        search_queue.mark_dirty(search_queue.NODE, node.id)
+        search_queue.mark_dirty(search_queue.NODE, node.id)
+        assert mock_enqueue.call_count == 1
+        signature = mock_enqueue.call_args[0][0]
+        assert signature.args == (search_queue.NODE, )
+        assert signature.options['countdown'] == settings.SEARCH_UPDATE_COALESCE_WINDOW
+        assert PendingSearchUpdate.objects.filter(category='node', object_id=node.id).count() == 1
+
+    @mock.patch('website.search.queue.enqueue_task')
+    @mock.patch('website.search.search.enqueue_task')
+    def test_update_node_is_coalesced(self, mock_search_enqueue, mock_queue_enqueue, node):
+        with mock.patch.object(settings, 'USE_CELERY', True):
+            search.update_node(node)
+            search.update_node(node)
+        assert not mock_search_enqueue.called
+        assert mock_queue_enqueue.call_count == 1
+        assert PendingSearchUpdate.objects.filter(category='node', object_id=node.id).exists()
+
+    @mock.patch('website.search.elastic_search.flush_node_updates', return_value={'failed_object_ids': []})
+    def test_flush_search_updates(self, mock_flush, node):
+        other = ProjectFactory(is_public=True)
+        PendingSearchUpdate.mark('node', [node.id, other.id])
+        search_queue.flush_search_updates('node', batch_size=1)
+        assert mock_flush.call_args_list == [mock.call([node.id]), mock.call([other.id])]
+        assert not PendingSearchUpdate.objects.exists()
+
+    @mock.patch('website.search.elastic_search.flush_node_updates', side_effect=ConnectionError)
+    def test_failed_flush_keeps_pending_updates(self, mock_flush, node):
+        PendingSearchUpdate.mark('node', [node.id])
+        with pytest.raises(ConnectionError):
+            search_queue.flush_search_updates('node')
+        assert PendingSearchUpdate.objects.filter(category='node', object_id=node.id).exists()
+
+    @mock.patch('website.search.elastic_search.flush_node_updates')
+    def test_failed_documents_are_marked_again(self, mock_flush, node):
+        other = ProjectFactory(is_public=True)
+        mock_flush.return_value = {'failed_object_ids': [other.id]}
+        PendingSearchUpdate.mark('node', [node.id, other.id])
+        search_queue.flush_search_updates('node')
+        assert mock_flush.call_count == 1
+        assert list(PendingSearchUpdate.objects.values_list('object_id', flat=True)) == [other.id]
+
@@ -872,6 +872,30 @@ class TestProjectsInCommon:
         assert user.n_projects_in_common(user2) == 1
         assert user.n_projects_in_common(user3) == 1
 
+    def test_n_projects_in_common_many(self, user, auth):
+        user2 = UserFactory()
+        user3 = UserFactory()
+        stranger = UserFactory()
+        project = NodeFactory(creator=user)
+        other_project = NodeFactory(creator=user)
+        NodeFactory(creator=user2)
+
+        project.add_contributor(contributor=user2, auth=auth)
+        project.save()
+        other_project.add_contributor(contributor=user2, auth=auth)
+        other_project.save()
+
+        group = OSFGroupFactory(name='Platform', creator=user)
+        group.make_member(user3)
+        project.add_osf_group(group)
+        project.save()
+
+        other_users = [user2, user3, stranger]
+        assert user.n_projects_in_common_many(other_users) == {
+            other_user.id: user.n_projects_in_common(other_user)
+            for other_user in other_users
+        } == {user2.id: 2, user3.id: 1, stranger.id: 0}
+
 
 class TestCookieMethods:
 
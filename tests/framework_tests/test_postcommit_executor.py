@@ -0,0 +1,108 @@
+import threading
+from unittest import mock
+
+import gevent
+import pytest
+
+from framework.postcommit_tasks.executor import PostcommitExecutor, get_executor
+
+
+@pytest.fixture()
+def executor():
+    return PostcommitExecutor(size=2, deadline=0.5)
+
+
+def test_run_completes_tasks_and_records_timing(executor):
+    calls = []
+
+    def task():
+        calls.append(1)
+
+    report = executor.run([task, task])
+    assert calls == [1, 1]
+    assert report.ok
+    assert len(report.completed) == 2
+    stats = executor.stats.snapshot()
+    [(name, stat)] = stats.items()
+    assert name.endswith('task')
+    assert stat['count'] == 2
+    assert stat['errors'] == 0
+
+
+@mock.patch('framework.postcommit_tasks.executor.sentry.log_exception')
+def test_run_reports_failures_without_raising(mock_log_exception, executor):
+    def broken():
+        raise ValueError('nope')
+
+    report = executor.run([broken])
+    assert not report.ok
+    assert len(report.failed) == 1
+    assert mock_log_exception.called
+    assert executor.stats.snapshot()[report.failed[0]]['errors'] == 1
+
+
+def test_run_reports_deadline_instead_of_raising(executor):
+    def slow():
+        gevent.sleep(2)
+
+    report = executor.run([slow])
+    assert len(report.timed_out) == 1
+    assert report.elapsed < 2
+    assert executor.stats.snapshot()[report.timed_out[0]]['timeouts'] == 1
+
+
+@mock.patch('framework.postcommit_tasks.executor.group')
+def test_publish_sends_one_group(mock_group, executor):
+    signatures = [mock.Mock(task='website.tasks.one'), mock.Mock(task='website.tasks.two')]
+    report = executor.publish(signatures)
+    mock_group.assert_called_once_with(signatures)
+    mock_group.return_value.apply_async.assert_called_once_with()
+    assert report.published == 2
+    assert set(executor.stats.snapshot()) == {'website.tasks.one', 'website.tasks.two'}
+
+
+def test_get_executor_is_shared():
+    assert get_executor() is get_executor()
+
+
+def test_run_reports_tasks_not_started_when_pool_is_full(executor):
+    started = []
+
+    def slow():
+        started.append(1)
+        gevent.sleep(2)
+
+    busy = [executor.pool.spawn(gevent.sleep, 2) for _ in range(executor.size)]
+    try:
+        report = executor.run([slow])
+    finally:
+        gevent.killall(busy)
+    assert report.elapsed < 2
+    assert not started
+    assert len(report.not_started) == 1
+    assert not report.ok
+    assert executor.stats.snapshot()[report.not_started[0]]['not_started'] == 1
+
+
+@mock.patch('framework.postcommit_tasks.executor.sentry.log_exception')
+def test_run_raises_errors_when_asked(mock_log_exception, executor):
+    calls = []
+
+    def broken():
+        raise ValueError('nope')
+
+    def task():
+        calls.append(1)
+
+    with pytest.raises(ValueError):
+        executor.run([broken, task], raise_errors=True)
+    assert calls == [1]
+
+
+def test_pool_is_per_thread(executor):
+    pools = []
+    thread = threading.Thread(target=lambda: pools.append(executor.pool))
+    thread.start()
+    thread.join()
+    assert executor.pool is executor.pool
+    assert pools[0] is not executor.pool
@@ -1,6 +1,10 @@
+from unittest import mock
+
 import pytest
 from django.utils import timezone
 
+from api.citations import utils as citation_utils
+
 from framework.auth.core import Auth
 from osf_tests.factories import (
     fake,
@@ -142,6 +146,33 @@ class CitationsUserTestCase(OsfTestCase):
         )
 
 
+class CitationsRenderTestCase(OsfTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.node = ProjectFactory()
+        self.other_node = ProjectFactory()
+        citation_utils.get_style.cache_clear()
+
+    def test_render_citations_matches_render_citation(self):
+        for style in ('apa', 'modern-language-association', 'chicago-author-date', 'ieee'):
+            assert citation_utils.render_citations([self.node, self.other_node, self.node], style=style) == [
+                citation_utils.render_citation(self.node, style=style),
+                citation_utils.render_citation(self.other_node, style=style),
+                citation_utils.render_citation(self.node, style=style),
+            ]
+
+    def test_style_parsed_once(self):
+        with mock.patch.object(citation_utils, 'CitationStylesStyle', wraps=citation_utils.CitationStylesStyle) as mock_parse:
+            citation_utils.render_citation(self.node, style='apa')
+            citation_utils.render_citations([self.node, self.other_node], style='apa')
+        assert mock_parse.call_count == 1
+
+    def test_unknown_style(self):
+        with pytest.raises(ValueError):
+            citation_utils.render_citations([self.node], style='not-a-style')
+
+
 class CitationsViewsTestCase(OsfTestCase):
 
     @pytest.fixture(autouse=True)
@@ -1,9 +1,12 @@
 import collections
+from concurrent.futures import Future
 from unittest import mock
 
 import pytest
 from babel import dates, Locale
 from schema import Schema, And, Use, Or
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from framework.auth import Auth
@@ -1272,6 +1275,46 @@ class TestCompileSubscriptions(NotificationTestCase):
         subs = emails.compile_subscriptions(node5, 'file_updated')
         assert subs == {'email_transactional': [], 'email_digest': [self.user_1._id], 'none': []}
 
+    def test_event_subscription_overrides_node_subscription(self):
+        self.base_sub.email_transactional.add(self.user_1)
+        self.base_sub.save()
+        file_sub = factories.NotificationSubscriptionFactory(
+            _id=self.shared_node._id + '_xyz42_file_updated',
+            node=self.shared_node,
+            event_name='xyz42_file_updated'
+        )
+        file_sub.none.add(self.user_1)
+        file_sub.save()
+        result = emails.compile_subscriptions(self.shared_node, 'file_updated', 'xyz42_file_updated')
+        assert {'email_transactional': [], 'none': [self.user_1._id], 'email_digest': []} == result
+        result = emails.compile_subscriptions(self.private_node, 'file_updated', 'xyz42_file_updated')
+        assert {'email_transactional': [self.user_1._id], 'none': [], 'email_digest': []} == result
+
+    def test_admin_on_parent_listed_for_child(self):
+        self.base_project.add_contributor(self.user_4, permissions=permissions.ADMIN)
+        self.base_sub.email_digest.add(self.user_4)
+        self.base_sub.save()
+        result = emails.compile_subscriptions(self.private_node, 'file_updated')
+        assert {'email_transactional': [], 'none': [], 'email_digest': [self.user_4._id]} == result
+
+    def test_disabled_user_not_listed(self):
+        self.base_sub.email_transactional.add(self.user_1, self.user_2)
+        self.base_sub.save()
+        self.user_2.is_disabled = True
+        self.user_2.save()
+        result = emails.compile_subscriptions(self.shared_node, 'file_updated')
+        assert {'email_transactional': [self.user_1._id], 'none': [], 'email_digest': []} == result
+
+    def test_compiled_in_one_query(self):
+        self.base_sub.email_transactional.add(self.user_1)
+        self.base_sub.save()
+        node = factories.NodeFactory(parent=self.shared_node)
+        node = factories.NodeFactory(parent=node)
+        expected = emails.compile_subscriptions(node, 'file_updated')
+        with CaptureQueriesContext(connection) as queries:
+            assert emails.compile_subscriptions(node, 'file_updated') == expected
+        assert len(queries.captured_queries) == 1
+
 
 class TestMoveSubscription(NotificationTestCase):
     def setUp(self):
@@ -1438,6 +1481,25 @@ class TestSendEmails(NotificationTestCase):
         emails.notify('comments', user=user, node=node, timestamp=timezone.now())
         assert not mock_store.called
 
+    @mock.patch('website.mails.render_message', return_value='Hello')
+    def test_store_emails(self, mock_render):
+        recipient = factories.UserFactory()
+        disabled = factories.UserFactory()
+        disabled.is_disabled = True
+        disabled.save()
+        emails.store_emails(
+            [recipient._id, disabled._id, self.user._id],
+            'email_digest',
+            'comments',
+            self.user,
+            self.node,
+            timezone.now(),
+        )
+        digests = NotificationDigest.objects.filter(event='comments')
+        assert [digest.user for digest in digests] == [recipient]
+        assert digests[0].node_lineage == [self.project._id, self.node._id]
+        assert digests[0].message == 'Hello'
+
     @mock.patch('website.notifications.emails.store_emails')
     def test_notify_no_subscribers(self, mock_store):
         node = factories.NodeFactory()
@@ -1568,6 +1630,27 @@ class TestSendEmails(NotificationTestCase):
         subs = emails.check_node(self.project, 'comments')
         assert subs == {'email_transactional': [self.project.creator._id], 'email_digest': [], 'none': []}
 
+    def test_get_users_subscriptions(self):
+        subscribed = factories.UserFactory()
+        unsubscribed = factories.UserFactory()
+        disabled = factories.UserFactory()
+        disabled.is_disabled = True
+        disabled.save()
+        subscription = factories.NotificationSubscriptionFactory(
+            _id=subscribed._id + '_global_mentions',
+            user=subscribed,
+            event_name='global_mentions'
+        )
+        subscription.email_digest.add(subscribed)
+        subscription.save()
+        subs = emails.get_users_subscriptions([subscribed, unsubscribed, disabled], 'global_mentions')
+        assert subs == {
+            subscribed._id: emails.get_user_subscriptions(subscribed, 'global_mentions'),
+            unsubscribed._id: emails.get_user_subscriptions(unsubscribed, 'global_mentions'),
+        }
+        assert subs[subscribed._id]['email_digest'] == [subscribed._id]
+        assert subs[unsubscribed._id]['email_transactional'] == [unsubscribed._id]
+
     @mock.patch('website.project.views.comment.notify')
     def test_check_user_comment_reply_subscription_if_email_not_sent_to_target_user(self, mock_notify):
         # user subscribed to comment replies
@@ -1857,6 +1940,46 @@ class TestSendDigest(OsfTestCase):
         send_users_email(send_type)
         assert not mock_send_mail.called
 
+    @mock.patch('website.mails.send_mail')
+    def test_send_users_email_in_batches(self, mock_send_mail):
+        send_type = 'email_transactional'
+        digests = [
+            factories.NotificationDigestFactory(
+                user=user,
+                send_type=send_type,
+                event='comment_replies',
+                timestamp=self.timestamp,
+                message='Hello',
+                node_lineage=[self.project._id]
+            ) for user in (self.user_1, self.user_2)
+        ]
+        with mock.patch.object(settings, 'NOTIFICATION_DIGEST_BATCH_SIZE', 1):
+            send_users_email(send_type)
+        assert {call[1]['to_addr'] for call in mock_send_mail.call_args_list} == {
+            self.user_1.username,
+            self.user_2.username,
+        }
+        assert all(call[1]['node'] == self.project for call in mock_send_mail.call_args_list)
+        assert not NotificationDigest.objects.filter(_id__in=[d._id for d in digests]).exists()
+
+    @mock.patch('website.mails.send_mail')
+    def test_send_users_email_keeps_failed_notifications(self, mock_send_mail):
+        send_type = 'email_transactional'
+        failed = Future()
+        failed.set_exception(ConnectionError())
+        mock_send_mail.return_value = failed
+        d = factories.NotificationDigestFactory(
+            user=self.user_1,
+            send_type=send_type,
+            event='comment_replies',
+            timestamp=self.timestamp,
+            message='Hello',
+            node_lineage=[self.project._id]
+        )
+        send_users_email(send_type)
+        assert mock_send_mail.called
+        assert NotificationDigest.objects.filter(_id=d._id).exists()
+
     def test_remove_sent_digest_notifications(self):
         d = factories.NotificationDigestFactory(
             event='comment_replies',
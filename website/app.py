@@ -17,6 +17,7 @@ from framework.flask import add_handlers, app
 from framework.logging import logger as root_logger  # noqa
 from framework.postcommit_tasks import handlers as postcommit_handlers
 from framework.transactions import handlers as transaction_handlers
+from osf.utils import guid_cache
 # Imports necessary to connect signals
 from website.archiver import listeners  # noqa
 from website.mails import listeners  # noqa
@@ -55,6 +56,7 @@ def attach_handlers(app, settings):
     add_handlers(app, celery_task_handlers.handlers)
     add_handlers(app, transaction_handlers.handlers)
     add_handlers(app, postcommit_handlers.handlers)
+    add_handlers(app, guid_cache.handlers)
     add_handlers(app, csrf_handlers.handlers)
 
     # Attach handler for checking view-only link keys.
@@ -32,7 +32,7 @@ def copy_files(src, target_node, parent=None, name=None):
             attach_versions(cloned, src.versions.all(), src)
 
         if renaming:
-            latest_version = cloned.versions.first()
+            latest_version = cloned.get_latest_version()
             node_file_version = latest_version.get_basefilenode_version(cloned)
             # If this is a copy and a rename, update the name on the through table
             node_file_version.version_name = cloned.name
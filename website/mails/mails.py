@@ -19,6 +19,7 @@ Usage: ::
 """
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import waffle
 
 from mako.lookup import TemplateLookup, Template
@@ -31,8 +32,10 @@ logger = logging.getLogger(__name__)
 
 EMAIL_TEMPLATES_DIR = os.path.join(settings.TEMPLATES_PATH, 'emails')
 
+# Compiled templates are kept by the lookup; only recheck the files for changes while developing
 _tpl_lookup = TemplateLookup(
     directories=[EMAIL_TEMPLATES_DIR],
+    filesystem_checks=settings.DEBUG_MODE,
 )
 
 HTML_EXT = '.html.mako'
@@ -57,6 +60,7 @@ class Mail:
     def __init__(self, tpl_prefix, subject, categories=None, engagement=False):
         self.tpl_prefix = tpl_prefix
         self._subject = subject
+        self._subject_tpl = None
         self.categories = categories
         self.engagement = engagement
 
@@ -66,7 +70,9 @@ class Mail:
         return render_message(tpl_name, **context)
 
     def subject(self, **context):
-        return Template(self._subject).render(**context)
+        if self._subject_tpl is None:
+            self._subject_tpl = Template(self._subject)
+        return self._subject_tpl.render(**context)
 
 
 def render_message(tpl_name, **context):
@@ -149,6 +155,51 @@ def send_mail(
             return ret
 
 
+class PooledMailer:
+    """Send mails from a pool of threads, for callers sending many at once (e.g. digests).
+
+    Pass as `send_mail(..., mailer=pooled_mailer)`: the message is still rendered by the
+    caller, but handing it to `mailer` (queueing the celery task, or sending it directly)
+    happens on one of `concurrency` threads. `send_mail` then returns a future; `wait`
+    blocks until every mail handed over so far is out.
+
+    Usage: ::
+
+        with mails.PooledMailer(concurrency=8) as mailer:
+            future = mails.send_mail('foo@bar.com', mails.DIGEST, mailer=mailer, ...)
+    """
+
+    def __init__(self, mailer=None, concurrency=1):
+        self.mailer = mailer or tasks.send_email
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._futures = []
+
+    def apply_async(self, kwargs, link=None):
+        return self._submit(self.mailer.apply_async, kwargs=kwargs, link=link)
+
+    def __call__(self, **kwargs):
+        return self._submit(self.mailer, **kwargs)
+
+    def _submit(self, fn, *args, **kwargs):
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._futures.append(future)
+        return future
+
+    def wait(self):
+        futures, self._futures = self._futures, []
+        for future in futures:
+            exception = future.exception()
+            if exception is not None:
+                logger.error('Failed to send mail', exc_info=exception)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wait()
+        self._executor.shutdown()
+
+
 def get_english_article(word):
     """
     Decide whether to use 'a' or 'an' for a given English word.
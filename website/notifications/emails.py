@@ -1,9 +1,14 @@
+import collections
+
 from django.apps import apps
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 
 from babel import dates, core, Locale
 
 from osf.models import AbstractNode, NotificationDigest, NotificationSubscription
-from osf.utils.permissions import ADMIN, READ
+from osf.utils.permissions import ADMIN, ADMIN_NODE, READ, READ_NODE
 from website import mails
 from website.notifications import constants
 from website.notifications import utils
@@ -66,8 +71,10 @@ def notify_global_event(event, sender_user, node, timestamp, recipients, templat
     if not context:
         context = {}
 
+    recipients = list(recipients)
+    subscriptions_by_user = get_users_subscriptions(recipients, event_type)
     for recipient in recipients:
-        subscriptions = get_user_subscriptions(recipient, event_type)
+        subscriptions = subscriptions_by_user.get(recipient._id, {})
         context['is_creator'] = recipient == node.creator
         if node.provider:
             context['has_psyarxiv_chronos_text'] = node.has_permission(recipient, ADMIN) and 'psyarxiv' in node.provider.name.lower()
@@ -93,6 +100,7 @@ def store_emails(recipient_ids, notification_type, event, user, node, timestamp,
     :return: --
     """
     OSFUser = apps.get_model('osf', 'OSFUser')
+    Guid = apps.get_model('osf', 'Guid')
 
     if notification_type == 'none':
         return
@@ -104,16 +112,19 @@ def store_emails(recipient_ids, notification_type, event, user, node, timestamp,
     context['user'] = user
     node_lineage_ids = get_node_lineage(node) if node else []
 
-    for recipient_id in recipient_ids:
-        if recipient_id == user._id:
-            continue
-        recipient = OSFUser.load(recipient_id)
-        if recipient.is_disabled:
+    recipient_guids = Guid.load_many([
+        recipient_id for recipient_id in recipient_ids
+        if recipient_id != user._id
+    ])
+    digests = []
+    for recipient_id, recipient_guid in recipient_guids.items():
+        recipient = recipient_guid.referent
+        if not isinstance(recipient, OSFUser) or recipient.is_disabled:
             continue
         context['localized_timestamp'] = localize_timestamp(timestamp, recipient)
         context['recipient'] = recipient
         message = mails.render_message(template, **context)
-        digest = NotificationDigest(
+        digests.append(NotificationDigest(
             timestamp=timestamp,
             send_type=notification_type,
             event=event,
@@ -121,38 +132,147 @@ def store_emails(recipient_ids, notification_type, event, user, node, timestamp,
             message=message,
             node_lineage=node_lineage_ids,
             provider=abstract_provider
-        )
-        digest.save()
+        ))
+    NotificationDigest.objects.bulk_create(digests)
+
 
+def compile_subscriptions(node, event_type, event=None):
+    """Find who is subscribed to an event on `node`, through it or any of its parents.
 
-def compile_subscriptions(node, event_type, event=None, level=0):
-    """Recurse through node and parents for subscriptions.
+    A subscription on a node overrides those on its parents, and a subscription to the
+    particular `event` (e.g. a file's file_updated) overrides the node's `event_type` one.
+    Subscriptions only count on nodes the user can read, and only users who can read
+    `node` itself are returned. Resolved in a single query; see `SUBSCRIBERS_SQL`.
 
     :param node: current node
     :param event_type: Generally node_subscriptions_available
     :param event: Particular event such a file_updated that has specific file subs
-    :param level: How deep the recursion is
     :return: a dict of notification types with lists of users.
     """
-    subscriptions = check_node(node, event_type)
-    if event:
-        subscriptions = check_node(node, event)  # Gets particular event subscriptions
-        parent_subscriptions = compile_subscriptions(node, event_type, level=level + 1)  # get node and parent subs
-    elif getattr(node, 'parent_id', False):
-        parent_subscriptions = \
-            compile_subscriptions(AbstractNode.load(node.parent_id), event_type, level=level + 1)
-    else:
-        parent_subscriptions = check_node(None, event_type)
-    for notification_type in parent_subscriptions:
-        p_sub_n = parent_subscriptions[notification_type]
-        p_sub_n.extend(subscriptions[notification_type])
-        for nt in subscriptions:
-            if notification_type != nt:
-                p_sub_n = list(set(p_sub_n).difference(set(subscriptions[nt])))
-        if level == 0:
-            p_sub_n, removed = utils.separate_users(node, p_sub_n)
-        parent_subscriptions[notification_type] = p_sub_n
-    return parent_subscriptions
+    OSFUser = apps.get_model('osf', 'OSFUser')
+
+    subscriptions = {key: [] for key in constants.NOTIFICATION_TYPES}
+    # Only projects and components can be subscribed to
+    if not isinstance(node, AbstractNode):
+        return subscriptions
+    with connection.cursor() as cursor:
+        cursor.execute(_build_subscribers_sql(SUBSCRIBERS_SQL), {
+            'node_id': node.id,
+            'event_type': event_type,
+            'event_subscription_id': utils.to_subscription_key(node._id, event) if event else None,
+            'node_content_type_id': ContentType.objects.get_for_model(AbstractNode).id,
+            'user_content_type_id': ContentType.objects.get_for_model(OSFUser).id,
+            'read_node': READ_NODE,
+            'admin_node': ADMIN_NODE,
+            **_subscriber_type_params(),
+        })
+        for notification_type, user_id in cursor.fetchall():
+            subscriptions[notification_type].append(user_id)
+    return subscriptions
+
+
+# Every level of the node's lineage (the node itself at depth 0, then its ancestors) with
+# the subscription key for that level, plus the `event` subscription on the node at depth -1.
+# Each user's subscription at the closest level they can read wins (and none of them do, if
+# they are subscribed there with more than one notification type).
+SUBSCRIBERS_SQL = """
+    WITH lineage AS (
+      SELECT %(node_id)s :: INTEGER AS node_id, 0 AS depth
+      UNION ALL
+      SELECT C.ancestor_id, C.depth
+      FROM {closure} AS C
+      WHERE C.descendant_id = %(node_id)s
+    ), levels AS (
+      SELECT L.node_id, L.depth, G._id || '_' || %(event_type)s AS subscription_id
+      FROM lineage AS L
+        JOIN {guid} AS G ON G.object_id = L.node_id AND G.content_type_id = %(node_content_type_id)s
+      UNION ALL
+      SELECT %(node_id)s, -1, %(event_subscription_id)s
+    ), readers AS (
+      -- Read permission on a node, or admin permission on it or any of its parents
+      SELECT DISTINCT L.node_id, UG.osfuser_id AS user_id
+      FROM lineage AS L
+        JOIN lineage AS A ON A.depth >= L.depth
+        JOIN {node_permission} AS P ON P.content_object_id = A.node_id
+        JOIN {permission} AS AP ON AP.id = P.permission_id
+        JOIN {user_groups} AS UG ON UG.group_id = P.group_id
+      WHERE AP.codename = %(admin_node)s OR (AP.codename = %(read_node)s AND A.node_id = L.node_id)
+    ), subscribed AS (
+      SELECT
+        T.user_id,
+        T.notification_type,
+        LV.depth,
+        MIN(LV.depth) OVER (PARTITION BY T.user_id) AS closest_depth
+      FROM levels AS LV
+        JOIN {subscription} AS S ON S._id = LV.subscription_id
+        JOIN ({subscribers}) AS T ON T.subscription_id = S.id
+        JOIN {user} AS U ON U.id = T.user_id AND U.date_disabled IS NULL
+        JOIN readers AS R ON R.node_id = LV.node_id AND R.user_id = T.user_id
+        JOIN readers AS RN ON RN.node_id = %(node_id)s AND RN.user_id = T.user_id
+    )
+    SELECT
+      MIN(S.notification_type),
+      (SELECT G._id
+       FROM {guid} AS G
+       WHERE G.content_type_id = %(user_content_type_id)s AND G.object_id = S.user_id
+       ORDER BY G.created DESC
+       LIMIT 1)
+    FROM subscribed AS S
+    WHERE S.depth = S.closest_depth
+    GROUP BY S.user_id
+    HAVING COUNT(DISTINCT S.notification_type) = 1
+    ORDER BY S.user_id;
+"""
+
+# The subscription each user named in `recipient_keys` has for themselves, if any,
+# with everyone subscribed to it (or a row of NULLs, if no one is).
+USER_SUBSCRIPTIONS_SQL = """
+    SELECT
+      S._id,
+      T.notification_type,
+      (SELECT G._id
+       FROM {guid} AS G
+       WHERE G.content_type_id = %(user_content_type_id)s AND G.object_id = T.user_id
+       ORDER BY G.created DESC
+       LIMIT 1)
+    FROM {subscription} AS S
+      LEFT JOIN ({subscribers}) AS T ON T.subscription_id = S.id
+    WHERE S._id IN %(subscription_ids)s;
+"""
+
+
+def _subscriber_type_params():
+    return {
+        f'notification_type_{i}': notification_type
+        for i, notification_type in enumerate(constants.NOTIFICATION_TYPES)
+    }
+
+
+def _build_subscribers_sql(sql):
+    """Fill in table names, and `subscribers`: every (subscription_id, user_id, notification_type)"""
+    OSFUser = apps.get_model('osf', 'OSFUser')
+    Guid = apps.get_model('osf', 'Guid')
+    NodeClosure = apps.get_model('osf', 'NodeClosure')
+    NodeGroupObjectPermission = apps.get_model('osf', 'NodeGroupObjectPermission')
+
+    subscribers = ' UNION ALL '.join(
+        f'SELECT {field.m2m_column_name()} AS subscription_id, {field.m2m_reverse_name()} AS user_id, '
+        f'%(notification_type_{i})s AS notification_type FROM {field.m2m_db_table()}'
+        for i, field in enumerate(
+            NotificationSubscription._meta.get_field(notification_type)
+            for notification_type in constants.NOTIFICATION_TYPES
+        )
+    )
+    return sql.format(
+        closure=NodeClosure._meta.db_table,
+        guid=Guid._meta.db_table,
+        node_permission=NodeGroupObjectPermission._meta.db_table,
+        permission=Permission._meta.db_table,
+        user_groups=OSFUser._meta.get_field('groups').m2m_db_table(),
+        subscription=NotificationSubscription._meta.db_table,
+        user=OSFUser._meta.db_table,
+        subscribers=subscribers,
+    )
 
 
 def check_node(node, event):
@@ -179,6 +299,34 @@ def get_user_subscriptions(user, event):
         return {key: [user._id] if (event in constants.USER_SUBSCRIPTIONS_AVAILABLE and key == 'email_transactional') else [] for key in constants.NOTIFICATION_TYPES}
 
 
+def get_users_subscriptions(users, event):
+    """`get_user_subscriptions` for many users at once, keyed by user id (disabled users are left out)."""
+    OSFUser = apps.get_model('osf', 'OSFUser')
+
+    users = [user for user in users if not user.is_disabled]
+    if not users:
+        return {}
+    keys = {utils.to_subscription_key(user._id, event): user._id for user in users}
+    found = collections.defaultdict(lambda: {key: [] for key in constants.NOTIFICATION_TYPES})
+    with connection.cursor() as cursor:
+        cursor.execute(_build_subscribers_sql(USER_SUBSCRIPTIONS_SQL), {
+            'subscription_ids': tuple(keys),
+            'user_content_type_id': ContentType.objects.get_for_model(OSFUser).id,
+            **_subscriber_type_params(),
+        })
+        for subscription_id, notification_type, user_id in cursor.fetchall():
+            subscriptions = found[keys[subscription_id]]
+            if notification_type is not None:
+                subscriptions[notification_type].append(user_id)
+    return {
+        user_id: found[user_id] if user_id in found else {
+            key: [user_id] if (event in constants.USER_SUBSCRIPTIONS_AVAILABLE and key == 'email_transactional') else []
+            for key in constants.NOTIFICATION_TYPES
+        }
+        for user_id in keys.values()
+    }
+
+
 def get_node_lineage(node):
     """ Get a list of node ids in order from the node to top most project
         e.g. [parent._id, node._id]
@@ -1,6 +1,7 @@
 """
 Tasks for making even transactional emails consolidated.
 """
+from concurrent.futures import Future
 import itertools
 
 from django.db import connection
@@ -8,6 +9,7 @@ from django.db import connection
 from framework.celery_tasks import app as celery_app
 from framework.sentry import log_message
 from osf.models import (
+    Guid,
     OSFUser,
     AbstractNode,
     AbstractProvider,
@@ -16,6 +18,7 @@ from osf.models import (
     NotificationDigest,
 )
 from osf.registrations.utils import get_registration_provider_submissions_url
+from osf.utils.guid_cache import guid_cache_scope
 from osf.utils.permissions import ADMIN
 from website import mails, settings
 from website.notifications.utils import NotificationsDict
@@ -36,30 +39,64 @@ def _send_global_and_node_emails(send_type):
     """
     Called by `send_users_email`. Send all global and node-related notification emails.
     """
-    grouped_emails = get_users_emails(send_type)
+    grouped_emails = iter(get_users_emails(send_type))
+    with mails.PooledMailer(concurrency=settings.NOTIFICATION_DIGEST_SEND_CONCURRENCY) as mailer:
+        while True:
+            batch = list(itertools.islice(grouped_emails, settings.NOTIFICATION_DIGEST_BATCH_SIZE))
+            if not batch:
+                break
+            # The digest template loads each node by guid; share loaded guids within the batch
+            with guid_cache_scope():
+                _send_digest_batch(batch, mailer)
+
+
+def _send_digest_batch(grouped_emails, mailer):
+    """Send one batch of digests, loading all of the batch's users and nodes up front.
+
+    Notifications are removed once their mail is sent (or skipped, for disabled users);
+    those whose mail failed stay for the next run.
+    """
+    node_ids = {
+        node_id
+        for group in grouped_emails
+        for message in group['info']
+        for node_id in message['node_lineage']
+    }
+    guids = Guid.load_many([group['user_id'] for group in grouped_emails] + list(node_ids))
+    sent = []
     for group in grouped_emails:
-        user = OSFUser.load(group['user_id'])
-        if not user:
+        user = getattr(guids.get(group['user_id']), 'referent', None)
+        if not isinstance(user, OSFUser):
             log_message(f"User with id={group['user_id']} not found")
             continue
         info = group['info']
         notification_ids = [message['_id'] for message in info]
         sorted_messages = group_by_node(info)
         if sorted_messages:
+            result = None
             if not user.is_disabled:
                 # If there's only one node in digest we can show it's preferences link in the template.
                 notification_nodes = list(sorted_messages['children'].keys())
-                node = AbstractNode.load(notification_nodes[0]) if len(
+                node = getattr(guids.get(notification_nodes[0]), 'referent', None) if len(
                     notification_nodes) == 1 else None
-                mails.send_mail(
+                node = node if isinstance(node, AbstractNode) else None
+                result = mails.send_mail(
                     to_addr=user.username,
                     can_change_node_preferences=bool(node),
                     node=node,
                     mail=mails.DIGEST,
                     name=user.fullname,
                     message=sorted_messages,
+                    mailer=mailer,
                 )
-            remove_notifications(email_notification_ids=notification_ids)
+            sent.append((result, notification_ids))
+    mailer.wait()
+    remove_notifications(email_notification_ids=[
+        notification_id
+        for result, notification_ids in sent
+        if not isinstance(result, Future) or result.exception() is None
+        for notification_id in notification_ids
+    ])
 
 
 def _send_reviews_moderator_emails(send_type):
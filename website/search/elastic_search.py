@@ -3,13 +3,13 @@ import functools
 import logging
 import math
 import re
+import time
 import unicodedata
 from framework import sentry
 
 from django.apps import apps
-from django.core.paginator import Paginator
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.db.models import F, Max, Q
 from elasticsearch2 import (ConnectionError, Elasticsearch, NotFoundError,
                             RequestError, TransportError, helpers)
 from framework.celery_tasks import app as celery_app
@@ -17,6 +17,7 @@ from framework.database import paginated
 from osf.models import AbstractNode
 from osf.models import OSFUser
 from osf.models import BaseFileNode
+from osf.models import Guid
 from osf.models import GuidMetadataRecord
 from osf.models import Institution
 from osf.models import OSFGroup
@@ -385,33 +386,38 @@ def update_user_async(self, user_id, index=None):
     except Exception as exc:
         self.retry(exc)
 
-def serialize_node(node, category):
-    parent_id = node.parent_id
+def serialize_node(node, category, prefetched=None):
+    """Serialize a node into its search document.
+
+    :param dict prefetched: Optional entry from `prefetch_node_search_data` for this node. When
+        given, related rows are read from it instead of being queried one node at a time.
+    """
+    if prefetched is None:
+        prefetched = _query_node_search_data(node)
 
     normalized_title = unicodedata.normalize('NFKD', node.title)
     elastic_document = {
-        **serialize_guid_metadata(node._id),
+        **prefetched['guid_metadata'],
         'id': node._id,
         'contributors': [
             {
                 'fullname': x['user__fullname'],
                 'url': '/{}/'.format(x['user__guids___id']) if x['user__is_active'] else None
             }
-            for x in node.contributor_set.filter(visible=True).order_by('_order')
-            .values('user__fullname', 'user__guids___id', 'user__is_active')
+            for x in prefetched['contributors']
         ],
         'groups': [
             {
                 'name': x['name'],
                 'url': '/{}/'.format(x['_id'])
             }
-            for x in node.osf_groups.values('name', '_id')
+            for x in prefetched['groups']
         ],
         'title': node.title,
         'normalized_title': normalized_title,
         'category': category,
         'public': node.is_public,
-        'tags': list(node.tags.filter(system=False).values_list('name', flat=True)),
+        'tags': prefetched['tags'],
         'description': node.description,
         'url': node.url,
         'is_registration': node.is_registration,
@@ -422,20 +428,135 @@ def serialize_node(node, category):
         'is_pending_embargo': node.is_pending_embargo,
         'registered_date': node.registered_date,
         'wikis': {},
-        'parent_id': parent_id,
+        'parent_id': prefetched['parent_id'],
         'date_created': node.created,
         'license': serialize_node_license_record(node.license),
-        'affiliated_institutions': list(node.affiliated_institutions.values_list('name', flat=True)),
+        'affiliated_institutions': prefetched['affiliated_institutions'],
         'boost': int(not node.is_registration) + 1,  # This is for making registered projects less relevant
         'extra_search_terms': clean_splitters(node.title),
     }
     if not node.is_retracted:
-        for wiki in WikiPage.objects.get_wiki_pages_latest(node):
-            # '.' is not allowed in field names in ES2
-            elastic_document['wikis'][wiki.wiki_page.page_name.replace('.', ' ')] = wiki.raw_text(node)
+        elastic_document['wikis'] = prefetched['wikis']
 
     return elastic_document
 
+def _query_node_search_data(node):
+    return {
+        'contributors': node.contributor_set.filter(visible=True).order_by('_order')
+        .values('user__fullname', 'user__guids___id', 'user__is_active'),
+        'groups': node.osf_groups.values('name', '_id'),
+        'tags': list(node.tags.filter(system=False).values_list('name', flat=True)),
+        'affiliated_institutions': list(node.affiliated_institutions.values_list('name', flat=True)),
+        'guid_metadata': serialize_guid_metadata(node._id),
+        'parent_id': node.parent_id,
+        'wikis': {
+            # '.' is not allowed in field names in ES2
+            wiki.wiki_page.page_name.replace('.', ' '): wiki.raw_text(node)
+            for wiki in WikiPage.objects.get_wiki_pages_latest(node).defer('rendered_html')
+        } if not node.is_retracted else {},
+    }
+
+def prefetch_node_search_data(nodes):
+    """Load the related rows `serialize_node` needs for many nodes in a handful of queries.
+
+    :param AbstractNode[] nodes: Nodes to prefetch for. Their guids should already be prefetched.
+    :return dict: Node pk -> prefetched data, suitable for `serialize_node(..., prefetched=...)`
+    """
+    from addons.wiki.models import WikiVersion
+    from osf.models import Contributor, NodeRelation
+    from osf.models.node import NodeGroupObjectPermission
+    from osf.models.osf_group import OSFGroupGroupObjectPermission
+
+    nodes = list(nodes)
+    node_ids = [node.id for node in nodes]
+    data = {
+        node.id: {
+            'contributors': [],
+            'groups': [],
+            'tags': [],
+            'all_tags': [],
+            'affiliated_institutions': [],
+            'guid_metadata': {},
+            'parent_id': None,
+            'wikis': {},
+        } for node in nodes
+    }
+
+    contributors = (
+        Contributor.objects.filter(node_id__in=node_ids, visible=True)
+        .order_by('node_id', '_order')
+        .values('node_id', 'user__fullname', 'user__guids___id', 'user__is_active')
+    )
+    for row in contributors:
+        data[row.pop('node_id')]['contributors'].append(row)
+
+    # Mirrors AbstractNode.osf_groups: guardian groups named "osfgroup..." that hold a
+    # permission on the node, mapped back to the OSFGroups they belong to
+    node_groups = NodeGroupObjectPermission.objects.filter(
+        content_object_id__in=node_ids,
+        group__name__icontains='osfgroup',
+    ).values_list('content_object_id', 'group_id').distinct()
+    group_to_node_ids = {}
+    for node_id, group_id in node_groups:
+        group_to_node_ids.setdefault(group_id, set()).add(node_id)
+    if group_to_node_ids:
+        osf_groups = OSFGroupGroupObjectPermission.objects.filter(
+            group_id__in=group_to_node_ids.keys(),
+        ).values_list('group_id', 'content_object_id', 'content_object__name', 'content_object___id').distinct()
+        seen = set()
+        for group_id, osf_group_id, name, _id in osf_groups:
+            for node_id in group_to_node_ids[group_id]:
+                if (node_id, osf_group_id) not in seen:
+                    seen.add((node_id, osf_group_id))
+                    data[node_id]['groups'].append({'name': name, '_id': _id})
+
+    tags = AbstractNode.tags.through.objects.filter(
+        abstractnode_id__in=node_ids,
+    ).values_list('abstractnode_id', 'tag__name', 'tag__system')
+    for node_id, name, system in tags:
+        # System tags are not indexed but still count towards DO_NOT_INDEX_LIST
+        data[node_id]['all_tags'].append(name)
+        if not system:
+            data[node_id]['tags'].append(name)
+
+    institutions = AbstractNode.affiliated_institutions.through.objects.filter(
+        abstractnode_id__in=node_ids,
+    ).values_list('abstractnode_id', 'institution__name')
+    for node_id, name in institutions:
+        data[node_id]['affiliated_institutions'].append(name)
+
+    guid_to_node_id = {node._id: node.id for node in nodes}
+    records = GuidMetadataRecord.objects.filter(guid___id__in=guid_to_node_id.keys()).select_related('guid')
+    for record in records:
+        data[guid_to_node_id[record.guid._id]]['guid_metadata'] = _serialize_guid_metadata_record(record)
+
+    parents = NodeRelation.objects.filter(
+        child_id__in=node_ids,
+        is_node_link=False,
+    ).values_list('child_id', 'parent__guids___id')
+    for node_id, parent_guid in parents:
+        data[node_id]['parent_id'] = parent_guid
+
+    latest_wikis = (
+        WikiVersion.objects
+        .annotate(newest_version=Max('wiki_page__versions__identifier'))
+        .filter(
+            identifier=F('newest_version'),
+            wiki_page__node_id__in=node_ids,
+            wiki_page__deleted__isnull=True,
+        )
+        .select_related('wiki_page')
+        .defer('rendered_html')
+    )
+    nodes_by_id = {node.id: node for node in nodes}
+    for wiki in latest_wikis:
+        node = nodes_by_id[wiki.wiki_page.node_id]
+        if not node.is_retracted:
+            # '.' is not allowed in field names in ES2
+            data[node.id]['wikis'][wiki.wiki_page.page_name.replace('.', ' ')] = wiki.raw_text(node)
+
+    return data
+
 def serialize_preprint(preprint, category):
     normalized_title = unicodedata.normalize('NFKD', preprint.title)
     elastic_document = {
@@ -501,8 +622,7 @@ def update_node(node, index=None, bulk=False, async_update=False):
     for file_ in paginated(OsfStorageFile, Q(target_content_type=ContentType.objects.get_for_model(type(node)), target_object_id=node.id)):
         file_.update_search()
 
-    is_qa_node = bool(set(settings.DO_NOT_INDEX_LIST['tags']).intersection(node.tags.all().values_list('name', flat=True))) or any(substring in node.title for substring in settings.DO_NOT_INDEX_LIST['titles'])
-    if node.is_deleted or not node.is_public or node.archiving or node.is_spam or (node.spam_status == SpamStatus.FLAGGED and settings.SPAM_FLAGGED_REMOVE_FROM_SEARCH) or node.is_quickfiles or is_qa_node:
+    if _should_remove_node_from_search(node, node.tags.all().values_list('name', flat=True)):
         delete_doc(node._id, node, index=index)
     else:
         category = get_doctype_from_node(node)
@@ -512,6 +632,10 @@ def update_node(node, index=None, bulk=False, async_update=False):
         else:
             client().index(index=index, doc_type=category, id=node._id, body=elastic_document, refresh=True)
 
+def _should_remove_node_from_search(node, tag_names):
+    is_qa_node = bool(set(settings.DO_NOT_INDEX_LIST['tags']).intersection(tag_names)) or any(substring in node.title for substring in settings.DO_NOT_INDEX_LIST['titles'])
+    return node.is_deleted or not node.is_public or node.archiving or node.is_spam or (node.spam_status == SpamStatus.FLAGGED and settings.SPAM_FLAGGED_REMOVE_FROM_SEARCH) or node.is_quickfiles or is_qa_node
+
 @requires_search
 def update_preprint(preprint, index=None, bulk=False, async_update=False):
     from addons.osfstorage.models import OsfStorageFile
@@ -569,6 +693,205 @@ def bulk_update_nodes(serialize, nodes, index=None, category=None):
         return helpers.bulk(client(), actions, refresh=True)
 
 
+def _get_doctype_from_prefetched(node, has_parent):
+    """Same as `get_doctype_from_node` for nodes, without loading the parent."""
+    if node.is_registration:
+        return 'registration'
+    elif not has_parent:
+        return 'project'
+    elif node.category in COMPONENT_CATEGORIES:
+        return 'component'
+    else:
+        return node.category
+
+
+def _iter_id_batches(node_ids, batch_size):
+    batch = []
+    for node_id in node_ids:
+        batch.append(node_id)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _node_search_batches(node_ids, batch_size):
+    for batch in _iter_id_batches(node_ids, batch_size):
+        nodes = list(
+            AbstractNode.objects.filter(id__in=batch)
+            .select_related('node_license__node_license')
+            .prefetch_related('guids')
+            .order_by('id')
+        )
+        yield nodes, prefetch_node_search_data(nodes)
+
+
+def _node_search_actions(node_ids, index, batch_size):
+    for nodes, prefetched in _node_search_batches(node_ids, batch_size):
+        for node in nodes:
+            data = prefetched[node.id]
+            category = _get_doctype_from_prefetched(node, data['parent_id'] is not None)
+            if _should_remove_node_from_search(node, data['all_tags']):
+                yield {
+                    '_op_type': 'delete',
+                    '_index': index,
+                    '_id': node._id,
+                    '_type': category,
+                }
+            else:
+                yield {
+                    '_op_type': 'update',
+                    '_index': index,
+                    '_id': node._id,
+                    '_type': category,
+                    'doc': serialize_node(node, category, prefetched=data),
+                    'doc_as_upsert': True,
+                }
+
+
+def _node_contributor_actions(node_ids, index, batch_size):
+    from osf.models import Contributor, NodeRelation
+
+    for batch in _iter_id_batches(node_ids, batch_size):
+        nodes = list(AbstractNode.objects.filter(id__in=batch).prefetch_related('guids').order_by('id'))
+        child_ids = set(
+            NodeRelation.objects.filter(child_id__in=batch, is_node_link=False).values_list('child_id', flat=True)
+        )
+        contributors = {node.id: [] for node in nodes}
+        rows = (
+            Contributor.objects.filter(node_id__in=batch, visible=True, user__is_active=True)
+            .order_by('node_id', '_order')
+            .values_list('node_id', 'user__fullname', 'user__guids___id')
+        )
+        for node_id, fullname, user_guid in rows:
+            contributors[node_id].append({
+                'fullname': fullname,
+                'url': f'/{user_guid}/',
+            })
+        for node in nodes:
+            yield {
+                '_op_type': 'update',
+                '_index': index,
+                '_id': node._id,
+                '_type': _get_doctype_from_prefetched(node, node.id in child_ids),
+                'doc': {'contributors': contributors[node.id]},
+                'doc_as_upsert': True,
+            }
+
+
+def _stream_bulk_actions(actions, description, chunk_size, refresh):
+    start = time.monotonic()
+    succeeded = 0
+    failed_ids = []
+    for ok, item in helpers.streaming_bulk(client(), actions, chunk_size=chunk_size, refresh=refresh, raise_on_error=False):
+        if ok:
+            succeeded += 1
+        else:
+            op, result = item.popitem()
+            # Deleting a document that was never indexed is expected
+            if op == 'delete' and result.get('status') == 404:
+                succeeded += 1
+            else:
+                failed_ids.append(result.get('_id'))
+                logger.error(f'Failed to {op} search document {result.get("_id")}: {result.get("error")}')
+        total = succeeded + len(failed_ids)
+        elapsed = time.monotonic() - start
+        if total % (chunk_size * 10) == 0 and elapsed:
+            logger.info(f'{description}: {total} documents sent ({total / elapsed:.1f} docs/s)')
+    elapsed = time.monotonic() - start
+    total = succeeded + len(failed_ids)
+    rate = total / elapsed if elapsed else 0.0
+    logger.info(f'{description}: {succeeded} documents updated, {len(failed_ids)} failed in {elapsed:.2f}s ({rate:.1f} docs/s)')
+    return {
+        'succeeded': succeeded,
+        'failed': len(failed_ids),
+        'failed_ids': failed_ids,
+        'elapsed': elapsed,
+        'rate': rate,
+    }
+
+
+@requires_search
+def bulk_reindex_nodes(node_ids, index=None, batch_size=500, chunk_size=500, refresh=False):
+    """Reindex many nodes, prefetching related rows one batch of node ids at a time.
+
+    Documents are streamed to elasticsearch as they are serialized. Nodes that should not
+    be searchable have their documents removed. Files are not reindexed.
+
+    :param int[] node_ids: Primary keys of the nodes to reindex; any iterable works
+    :param str index: Index to update
+    :param int batch_size: Number of nodes to load and prefetch per round of queries
+    :param int chunk_size: Number of documents per bulk request
+    :param bool refresh: Whether to refresh the index after each bulk request
+    :return dict: Counts of succeeded and failed documents, the ids of failed documents,
+        elapsed seconds and docs per second
+    """
+    index = index or INDEX
+    actions = _node_search_actions(node_ids, index, batch_size)
+    return _stream_bulk_actions(actions, 'Node reindex', chunk_size, refresh)
+
+
+@requires_search
+def bulk_reindex_node_contributors(node_ids, index=None, batch_size=500, chunk_size=500, refresh=False):
+    """Update only the contributor lists of many node documents. See `bulk_reindex_nodes`.
+    """
+    index = index or INDEX
+    actions = _node_contributor_actions(node_ids, index, batch_size)
+    return _stream_bulk_actions(actions, 'Node contributor reindex', chunk_size, refresh)
+
+
+def _failed_object_ids(model, result):
+    """Primary keys of the objects whose documents `_stream_bulk_actions` failed to update"""
+    if not result['failed_ids']:
+        return []
+    return list(model.objects.filter(guids___id__in=result['failed_ids']).values_list('id', flat=True))
+
+
+@requires_search
+def flush_node_updates(node_ids, index=None):
+    """Reindex nodes queued by `website.search.queue`, along with their files, as `update_node` would.
+
+    :return dict: As `bulk_reindex_nodes`, plus `failed_object_ids`, the nodes to retry
+    """
+    from addons.osfstorage.models import OsfStorageFile
+    index = index or INDEX
+    content_type = ContentType.objects.get_for_model(AbstractNode)
+    for file_ in paginated(OsfStorageFile, Q(target_content_type=content_type, target_object_id__in=node_ids)):
+        file_.update_search()
+    result = bulk_reindex_nodes(node_ids, index=index)
+    result['failed_object_ids'] = _failed_object_ids(AbstractNode, result)
+    return result
+
+
+def _preprint_search_actions(preprint_ids, index):
+    for preprint in Preprint.objects.filter(id__in=preprint_ids).order_by('id'):
+        # update_preprint removes the document itself when the preprint should not be searchable
+        elastic_document = update_preprint(preprint, index=index, bulk=True)
+        if elastic_document:
+            yield {
+                '_op_type': 'update',
+                '_index': index,
+                '_id': preprint._id,
+                '_type': 'preprint',
+                'doc': elastic_document,
+                'doc_as_upsert': True,
+            }
+
+
+@requires_search
+def flush_preprint_updates(preprint_ids, index=None, chunk_size=500):
+    """Reindex preprints queued by `website.search.queue` in one stream of bulk requests.
+
+    :return dict: As `_stream_bulk_actions`, plus `failed_object_ids`, the preprints to retry
+    """
+    index = index or INDEX
+    actions = _preprint_search_actions(preprint_ids, index)
+    result = _stream_bulk_actions(actions, 'Preprint reindex', chunk_size, refresh=False)
+    result['failed_object_ids'] = _failed_object_ids(Preprint, result)
+    return result
+
+
 def serialize_collection_submission_contributor(contrib):
     return {
         'fullname': contrib['user__fullname'],
@@ -649,9 +972,8 @@ def update_contributors_async(self, user_id):
     user = OSFUser.objects.get(id=user_id)
     # If search updated so group member names are displayed on project search results,
     # then update nodes that the user has group membership as well
-    p = Paginator(user.visible_contributor_to.order_by('id'), 100)
-    for page_num in p.page_range:
-        bulk_update_contributors(p.page(page_num).object_list)
+    node_ids = list(user.visible_contributor_to.order_by('id').values_list('id', flat=True))
+    bulk_reindex_node_contributors(node_ids)
 
 @requires_search
 def update_user(user, index=None):
@@ -954,21 +1276,36 @@ def search_contributor(query, page=0, size=10, exclude=None, current_user=None):
     pages = math.ceil(results['counts'].get('user', 0) / size)
     validate_page_num(page, pages)
 
+    # Load every hit's user in one go, and count projects in common with all of them at once
+    guids = Guid.load_many([doc['id'] for doc in docs])
+    users_by_id = {
+        guid_str: guid.referent
+        for guid_str, guid in guids.items()
+        if isinstance(guid.referent, OSFUser)
+    }
+    if current_user:
+        current_user_id = current_user._id
+        n_projects_in_common_by_pk = current_user.n_projects_in_common_many([
+            user for user_id, user in users_by_id.items()
+            if user_id != current_user_id and user.is_active
+        ])
+
     users = []
     for doc in docs:
         # TODO: use utils.serialize_user
-        user = OSFUser.load(doc['id'])
+        user = users_by_id.get(doc['id'])
 
-        if current_user and current_user._id == user._id:
+        if user is None:
+            logger.error(f"Could not load user {doc['id']}")
+            continue
+
+        if current_user and current_user_id == doc['id']:
             n_projects_in_common = -1
         elif current_user:
-            n_projects_in_common = current_user.n_projects_in_common(user)
+            n_projects_in_common = n_projects_in_common_by_pk.get(user.id, 0)
         else:
             n_projects_in_common = 0
 
-        if user is None:
-            logger.error(f"Could not load user {doc['id']}")
-            continue
         if user.is_active:  # exclude merged, unregistered, etc.
             current_employment = None
             education = None
@@ -990,7 +1327,7 @@ def search_contributor(query, page=0, size=10, exclude=None, current_user=None):
                                                        user,
                                                        use_ssl=True,
                                                        size=settings.PROFILE_IMAGE_MEDIUM),
-                'profile_url': user.profile_url,
+                'profile_url': f'/{doc["id"]}/',
                 'registered': user.is_registered,
                 'active': user.is_active
             })
@@ -1008,20 +1345,24 @@ def serialize_guid_metadata(guid):
     if guid:
         guid_metadata_record = GuidMetadataRecord.objects.for_guid(guid)
         if guid_metadata_record.id:
-            serialized_guid_metadata = {
-                'title': guid_metadata_record.title or None,
-                'description': guid_metadata_record.description or None,
-                'language': guid_metadata_record.language or None,
-                'resource_type_general': guid_metadata_record.resource_type_general or None,
-                'funder_name': _funding_values(guid_metadata_record, 'funder_name'),
-                'funder_identifier': _funding_values(guid_metadata_record, 'funder_identifier'),
-                'award_number': _funding_values(guid_metadata_record, 'award_number'),
-                'award_uri': _funding_values(guid_metadata_record, 'award_uri'),
-                'award_title': _funding_values(guid_metadata_record, 'award_title'),
-            }
+            serialized_guid_metadata = _serialize_guid_metadata_record(guid_metadata_record)
     return serialized_guid_metadata
 
 
+def _serialize_guid_metadata_record(guid_metadata_record):
+    return {
+        'title': guid_metadata_record.title or None,
+        'description': guid_metadata_record.description or None,
+        'language': guid_metadata_record.language or None,
+        'resource_type_general': guid_metadata_record.resource_type_general or None,
+        'funder_name': _funding_values(guid_metadata_record, 'funder_name'),
+        'funder_identifier': _funding_values(guid_metadata_record, 'funder_identifier'),
+        'award_number': _funding_values(guid_metadata_record, 'award_number'),
+        'award_uri': _funding_values(guid_metadata_record, 'award_uri'),
+        'award_title': _funding_values(guid_metadata_record, 'award_title'),
+    }
+
+
 def _funding_values(guid_metadata_record, funding_field):
     return [
         funding_info[funding_field]
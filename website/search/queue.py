@@ -0,0 +1,84 @@
+"""Coalesce search index updates.
+
+Saving a node or preprint records its id in `PendingSearchUpdate` instead of enqueueing
+its own reindex task. The first update in a window schedules a single flush task for
+when the window closes, and that flush reindexes every pending id in bulk requests
+without refreshing the index. Saves that land while the flush is scheduled are
+deduplicated by the table's unique constraint and picked up by that same flush.
+
+Each batch is claimed (deleted) in its own short transaction and reindexed outside of
+any transaction, so saves of the objects being reindexed never wait on the flush. Ids
+are marked pending again if reindexing the batch fails, and documents elasticsearch
+rejects are marked again once the flush is done, for the next flush to retry.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+from framework.celery_tasks import app as celery_app
+from framework.celery_tasks.handlers import enqueue_task
+from website import settings
+
+logger = logging.getLogger(__name__)
+
+NODE = 'node'
+PREPRINT = 'preprint'
+CATEGORIES = (NODE, PREPRINT)
+FLUSH_BATCH_SIZE = 500
+
+
+def _flush_scheduled_key(category):
+    return f'search-update-flush-scheduled:{category}'
+
+
+def mark_dirty(category, object_id):
+    """Queue `object_id` to be reindexed by the next flush of `category`."""
+    from osf.models import PendingSearchUpdate
+
+    PendingSearchUpdate.mark(category, [object_id])
+    window = settings.SEARCH_UPDATE_COALESCE_WINDOW
+    # Only one flush per process per window; the periodic flush covers anything missed
+    if cache.add(_flush_scheduled_key(category), True, timeout=window):
+        enqueue_task(flush_search_updates.si(category).set(countdown=window))
+
+
+def _get_flusher(category):
+    from website.search import elastic_search
+
+    return {
+        NODE: elastic_search.flush_node_updates,
+        PREPRINT: elastic_search.flush_preprint_updates,
+    }[category]
+
+
+@celery_app.task(ignore_results=True)
+def flush_search_updates(category=None, batch_size=FLUSH_BATCH_SIZE):
+    """Reindex every pending search update for `category`, or for all categories if None."""
+    if settings.SEARCH_ENGINE is None:
+        return
+    from osf.models import PendingSearchUpdate
+
+    for category in [category] if category else CATEGORIES:
+        flush = _get_flusher(category)
+        flushed = 0
+        retry_ids = []
+        while True:
+            with transaction.atomic():
+                object_ids = PendingSearchUpdate.claim(category, batch_size)
+            if not object_ids:
+                break
+            try:
+                result = flush(object_ids)
+            except Exception:
+                PendingSearchUpdate.mark(category, object_ids)
+                raise
+            if result:
+                retry_ids.extend(result['failed_object_ids'])
+            flushed += len(object_ids)
+        if retry_ids:
+            # Marked after the loop, so documents that keep failing wait for the next flush
+            PendingSearchUpdate.mark(category, retry_ids)
+            logger.warning(f'Failed to reindex {len(retry_ids)} {category} search documents; queued for the next flush')
+        if flushed:
+            logger.info(f'Flushed {flushed} pending {category} search updates')
@@ -3,6 +3,7 @@ import logging
 from framework.celery_tasks.handlers import enqueue_task
 
 from website import settings
+from website.search import queue as search_queue
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,10 @@ else:
     search_engine = None
     logger.warning('Elastic search is not set to load')
 
+def _should_coalesce(index, bulk):
+    # Updates to an explicit index or for bulk serialization are never coalesced
+    return settings.USE_CELERY and settings.SEARCH_UPDATE_COALESCE_WINDOW and index is None and not bulk
+
 def requires_search(func):
     def wrapped(*args, **kwargs):
         if search_engine is not None:
@@ -36,7 +41,9 @@ def update_node(node, index=None, bulk=False, async_update=True, saved_fields=No
         # For example, when updating a Node's privacy, is_public must be True in the
         # database in order for method that updates the Node's elastic search document
         # to run correctly.
-        if settings.USE_CELERY:
+        if _should_coalesce(index, bulk):
+            search_queue.mark_dirty(search_queue.NODE, node.id)
+        elif settings.USE_CELERY:
             enqueue_task(search_engine.update_node_async.s(node_id=node_id, **kwargs))
         else:
             search_engine.update_node_async(node_id=node_id, **kwargs)
@@ -53,7 +60,9 @@ def update_preprint(preprint, index=None, bulk=False, async_update=True, saved_f
     if async_update:
         preprint_id = preprint._id
         # We need the transaction to be committed before trying to run celery tasks.
-        if settings.USE_CELERY:
+        if _should_coalesce(index, bulk):
+            search_queue.mark_dirty(search_queue.PREPRINT, preprint.id)
+        elif settings.USE_CELERY:
             enqueue_task(search_engine.update_preprint_async.s(preprint_id=preprint_id, **kwargs))
         else:
             search_engine.update_preprint_async(preprint_id=preprint_id, **kwargs)
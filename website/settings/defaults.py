@@ -113,6 +113,8 @@ ELASTIC_URI = '127.0.0.1:9200'
 ELASTIC6_URI = os.environ.get('ELASTIC6_URI', '127.0.0.1:9201')
 ELASTIC_TIMEOUT = 10
 ELASTIC_INDEX = 'website'
+# Seconds to collect node and preprint saves before reindexing them in bulk; 0 indexes each save on its own
+SEARCH_UPDATE_COALESCE_WINDOW = 5
 ELASTIC_KWARGS = {
     # 'use_ssl': False,
     # 'verify_certs': True,
@@ -142,6 +144,9 @@ USE_CDN_FOR_CLIENT_LIBS = True
 
 USE_EMAIL = True
 FROM_EMAIL = 'openscienceframework-noreply@osf.io'
+# Digest emails are built for this many recipients at a time, and handed to this many sending threads
+NOTIFICATION_DIGEST_BATCH_SIZE = 500
+NOTIFICATION_DIGEST_SEND_CONCURRENCY = 8
 
 # support email
 OSF_SUPPORT_EMAIL = 'support@osf.io'
@@ -194,6 +199,11 @@ MAILGUN_API_KEY = None
 # Use Celery for file rendering
 USE_CELERY = True
 
+# Postcommit tasks share one process-wide greenlet pool (one db connection per greenlet)
+POSTCOMMIT_POOL_SIZE = 30
+# Seconds a request waits on its postcommit tasks before reporting the stragglers and moving on
+POSTCOMMIT_DEADLINE = 5.0
+
 # Trashed File Retention
 PURGE_DELTA = timedelta(days=30)
 
@@ -326,6 +336,12 @@ DEFAULT_HMAC_ALGORITHM = hashlib.sha256
 WATERBUTLER_URL = 'http://localhost:7777'
 WATERBUTLER_INTERNAL_URL = WATERBUTLER_URL
 GRAVYVALET_URL = 'http://192.168.168.167:8004'
+# Connections kept open to GravyValet, per process
+GRAVYVALET_POOL_SIZE = 10
+# Threads shared by the process for sending GravyValet requests concurrently (e.g. one per addon type)
+GRAVYVALET_FANOUT_WORKERS = 8
+# Seconds to cache successful GravyValet GET responses in django's cache; 0 to not cache
+GRAVYVALET_CACHE_TIMEOUT = 0
 
 ####################
 #   Identifiers   #
@@ -435,6 +451,7 @@ class CeleryConfig:
         'scripts.populate_new_and_noteworthy_projects',
         'scripts.populate_popular_projects_and_registrations',
         'website.search.elastic_search',
+        'website.search.queue',
         'scripts.generate_sitemap',
         'osf.management.commands.clear_expired_sessions',
         'osf.management.commands.delete_withdrawn_or_failed_registration_files',
@@ -455,6 +472,7 @@ class CeleryConfig:
         'osf.management.commands.daily_reporters_go',
         'osf.management.commands.monthly_reporters_go',
         'osf.management.commands.ingest_cedar_metadata_templates',
+        'osf.management.commands.reconcile_storage_usage',
         'osf.metrics.reporters',
     }
 
@@ -468,6 +486,7 @@ class CeleryConfig:
         'website.identifiers.tasks',
         'website.preprints.tasks',
         'website.project.tasks',
+        'osf.metrics.counted_usage_buffer',
     }
 
     high_pri_modules = {
@@ -522,13 +541,16 @@ class CeleryConfig:
         'framework.email.tasks',
         'osf.external.chronos.tasks',
         'osf.management.commands.data_storage_usage',
+        'osf.management.commands.reconcile_storage_usage',
         'osf.management.commands.registration_schema_metrics',
         'website.mailchimp_utils',
         'website.notifications.tasks',
         'website.archiver.tasks',
         'website.identifiers.tasks',
         'website.search.search',
+        'website.search.queue',
         'website.project.tasks',
+        'osf.metrics.counted_usage_buffer',
         'scripts.populate_new_and_noteworthy_projects',
         'scripts.populate_popular_projects_and_registrations',
         'scripts.refresh_addon_tokens',
@@ -662,6 +684,19 @@ class CeleryConfig:
                 'task': 'management.commands.monthly_reporters_go',
                 'schedule': crontab(minute=30, hour=6, day_of_month=2),     # Second day of month 1:30 a.m.
             },
+            'reconcile_storage_usage': {
+                'task': 'management.commands.reconcile_storage_usage',
+                'schedule': crontab(minute=30, hour=8),  # Daily 3:30 a.m.
+                'kwargs': {'dry_run': False},
+            },
+            'flush_search_updates': {
+                'task': 'website.search.queue.flush_search_updates',
+                'schedule': crontab(minute='*'),  # Every minute, for flushes no save scheduled
+            },
+            'flush_counted_usage': {
+                'task': 'osf.metrics.counted_usage_buffer.flush_counted_usage',
+                'schedule': crontab(minute='*'),  # Every minute, for flushes no usage scheduled
+            },
             # 'data_storage_usage': {
             #   'task': 'management.commands.data_storage_usage',
             #   'schedule': crontab(day_of_month=1, minute=30, hour=4),  # Last of the month at 11:30 p.m.